@@ -0,0 +1,101 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+
+DEFAULT_USER_CACHE_TTL = 60
+DEFAULT_USER_CACHE_MAX_ENTRIES = 10_000
+
+
+class UserCache:
+    """Process-local LRU of user id -> (user, expires_at)."""
+
+    def __init__(self, ttl: float = DEFAULT_USER_CACHE_TTL, max_entries: int = DEFAULT_USER_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        key = str(user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, user_id, user) -> None:
+        key = str(user_id)
+        with self._lock:
+            self._entries[key] = (user, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id) -> None:
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+
+_user_cache = None
+_user_cache_lock = threading.Lock()
+
+
+def get_user_cache():
+    """Return the user cache, or None when `AUTH_USER_CACHE["ENABLED"]` is false."""
+    global _user_cache
+
+    config = getattr(settings, "AUTH_USER_CACHE", {})
+    if not config.get("ENABLED", True):
+        return None
+
+    if _user_cache is None:
+        with _user_cache_lock:
+            if _user_cache is None:
+                _user_cache = UserCache(
+                    config.get("TTL", DEFAULT_USER_CACHE_TTL),
+                    config.get("MAX_ENTRIES", DEFAULT_USER_CACHE_MAX_ENTRIES),
+                )
+    return _user_cache
+
+
+def reset_user_cache() -> None:
+    global _user_cache
+    _user_cache = None
+
+
+def invalidate_user(user_id) -> None:
+    cache = get_user_cache()
+    if cache is not None:
+        cache.invalidate(user_id)
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend whose get_user(), run by AuthenticationMiddleware on every authenticated
+    request, reads the per-process user cache.
+
+    Saves, deletes and logouts in this process invalidate the entry (authentication.signals);
+    changes made by other processes are picked up within `AUTH_USER_CACHE["TTL"]` seconds.
+    """
+
+    def get_user(self, user_id):
+        cache = get_user_cache()
+        if cache is None:
+            return super().get_user(user_id)
+
+        user = cache.get(user_id)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            cache.set(user_id, user)
+        # Each request gets its own instance, so per-request state (permission caches,
+        # last_login updates) never leaks into the shared entry.
+        return copy.copy(user)
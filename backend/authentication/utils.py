@@ -0,0 +1,13 @@
+from asgiref.sync import sync_to_async
+
+
+def _load_user(request):
+    user = request.user
+    # Evaluating the lazy object runs the session and user queries once.
+    user.is_authenticated
+    return user
+
+
+async def aget_user(request):
+    """Async access to request.user; Django 4.2 has no request.auser()."""
+    return await sync_to_async(_load_user)(request)
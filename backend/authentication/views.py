@@ -4,6 +4,14 @@ from django.contrib.auth import authenticate, login, logout
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 
+from config.ratelimit import check_rate, client_ip, too_many_requests
+
+from .utils import aget_user
+
+
+def _serialize_user(user) -> dict:
+    return {"id": user.id, "username": user.username, "is_staff": user.is_staff}
+
 
 @csrf_exempt
 def login_view(request):
@@ -21,12 +29,17 @@ def login_view(request):
     if not username or not password:
         return JsonResponse({"detail": "Username and password are required"}, status=400)
 
+    # Checked before authenticate(), so rejected attempts never pay for password hashing.
+    wait = check_rate("login_ip", client_ip(request)) or check_rate("login_username", username.lower())
+    if wait:
+        return too_many_requests(wait)
+
     user = authenticate(request, username=username, password=password)
     if not user:
         return JsonResponse({"detail": "Invalid credentials"}, status=401)
 
     login(request, user)
-    return JsonResponse({"id": user.id, "username": user.username, "is_staff": user.is_staff})
+    return JsonResponse(_serialize_user(user))
 
 
 @csrf_exempt
@@ -42,5 +55,12 @@ def me_view(request):
     if not request.user.is_authenticated:
         return JsonResponse({"detail": "Not authenticated"}, status=401)
 
-    user = request.user
-    return JsonResponse({"id": user.id, "username": user.username, "is_staff": user.is_staff})
+    return JsonResponse(_serialize_user(request.user))
+
+
+async def me_view_async(request):
+    user = await aget_user(request)
+    if not user.is_authenticated:
+        return JsonResponse({"detail": "Not authenticated"}, status=401)
+
+    return JsonResponse(_serialize_user(user))
@@ -0,0 +1,160 @@
+"""Concurrent load test of the read endpoints: WSGI under gunicorn versus ASGI under uvicorn
+with the sync views and with the async views.
+
+Seeds an on-disk SQLite database, starts one server per mode and drives it with asyncio
+keep-alive connections, reporting requests per second and latency percentiles.
+Requires uvicorn and gunicorn (not project dependencies).
+
+Run from backend/: python -m benchmarks.bench_asgi_load [--concurrency 64] [--requests 2000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_endpoints import _percentile
+from benchmarks.utils import BACKEND_DIR
+
+# Server command and extra environment per mode. Threads match asgiref's default executor.
+MODES = {
+    "wsgi": (["gunicorn", "config.wsgi:application", "--threads", "10", "--bind"], {}),
+    "asgi-sync": (["uvicorn", "config.asgi:application", "--port"], {"DJANGO_ROOT_URLCONF": "config.urls"}),
+    "asgi-async": (["uvicorn", "config.asgi:application", "--port"], {}),
+}
+PATHS = ["/products", "/products/1", "/carts?total=none", "/auth/me"]
+
+
+def _seed(env: dict, products: int, carts: int) -> None:
+    manage = [sys.executable, "manage.py"]
+    subprocess.run(manage + ["migrate", "--verbosity=0"], cwd=BACKEND_DIR, env=env, check=True)
+    subprocess.run(
+        manage + ["seed_products", f"--products={products}", f"--carts={carts}", "--seed=1"],
+        cwd=BACKEND_DIR,
+        env=env,
+        check=True,
+        capture_output=True,
+    )
+    script = (
+        "from django.contrib.auth import get_user_model; "
+        "get_user_model().objects.create_user(username='bench', password='bench-password')"
+    )
+    subprocess.run(manage + ["shell", "-c", script], cwd=BACKEND_DIR, env=env, check=True)
+
+
+async def _request(reader, writer, method: str, path: str, cookie: str = "", body: bytes = b""):
+    headers = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n"
+    if cookie:
+        headers += f"Cookie: {cookie}\r\n"
+    writer.write(headers.encode("ascii") + b"\r\n" + body)
+    await writer.drain()
+
+    status_line = await reader.readline()
+    length, set_cookie = 0, ""
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+        elif name.lower() == "set-cookie" and value.strip().startswith("sessionid="):
+            set_cookie = value.strip().split(";", 1)[0]
+    await reader.readexactly(length)
+    return int(status_line.split()[1]), set_cookie
+
+
+async def _load(port: int, concurrency: int, total: int) -> dict:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    credentials = json.dumps({"username": "bench", "password": "bench-password"}).encode("utf-8")
+    _status, cookie = await _request(reader, writer, "POST", "/auth/login", body=credentials)
+    writer.close()
+
+    latencies, errors = [], 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            for index in remaining:
+                started = time.perf_counter()
+                status, _cookie = await _request(reader, writer, "GET", PATHS[index % len(PATHS)], cookie)
+                latencies.append((time.perf_counter() - started) * 1000)
+                errors += status != 200
+        finally:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _index in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "rps": total / elapsed,
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+        "errors": errors,
+    }
+
+
+def _wait_for_port(port: int, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            asyncio.run(asyncio.wait_for(asyncio.open_connection("127.0.0.1", port), 1))
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"uvicorn did not start on port {port}")
+
+
+def run_mode(mode: str, env: dict, port: int, concurrency: int, total: int) -> dict:
+    command, extra_env = MODES[mode]
+    address = f"127.0.0.1:{port}" if command[0] == "gunicorn" else str(port)
+    server = subprocess.Popen(
+        [sys.executable, "-m", *command, address, "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env={**env, **extra_env},
+    )
+    try:
+        _wait_for_port(port)
+        asyncio.run(_load(port, concurrency, max(concurrency, total // 10)))  # warm up
+        return asyncio.run(_load(port, concurrency, total))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--carts", type=int, default=5000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--modes", default=",".join(MODES), help=f"Comma separated: {', '.join(MODES)}")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as directory:
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "config.settings",
+            "SQLITE_PATH": os.path.join(directory, "bench.sqlite3"),
+            "DATABASE_PROFILE": "production",
+        }
+        env.pop("DJANGO_ROOT_URLCONF", None)
+        _seed(env, args.products, args.carts)
+
+        for mode in args.modes.split(","):
+            row = run_mode(mode.strip(), env, args.port, args.concurrency, args.requests)
+            print(
+                f"{mode:11} {row['rps']:9.1f} req/s  p50 {row['p50_ms']:8.2f} ms  "
+                f"p95 {row['p95_ms']:8.2f} ms  p99 {row['p99_ms']:8.2f} ms  {row['errors']} errors"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Carts per second through POST /cart (one request per cart) versus POST /cart/bulk.
+
+Run from backend/: python -m benchmarks.bench_cart_bulk [--carts N] [--items-per-cart K]
+"""
+import argparse
+import json
+import random
+import time
+
+from benchmarks.utils import benchmark_database, setup_django
+
+
+def run(carts: int, items_per_cart: int, products: int) -> None:
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+
+    from carts.models import Cart
+    from products.models import Product
+
+    Product.objects.bulk_create([Product(name=f"Producto {index}", price=100 + index) for index in range(products)])
+    product_ids = list(Product.objects.values_list("id", flat=True))
+    user = get_user_model().objects.create_user(username="bench", password="bench-password")
+    client = Client()
+    client.force_login(user)
+
+    rng = random.Random(0)
+    payloads = [
+        json.dumps(
+            {
+                "items": [
+                    {"product_id": product_id, "quantity": rng.randint(1, 5)}
+                    for product_id in rng.sample(product_ids, items_per_cart)
+                ]
+            }
+        )
+        for _index in range(carts)
+    ]
+
+    start = time.perf_counter()
+    for payload in payloads:
+        client.post("/cart", data=payload, content_type="application/json")
+    single = carts / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    response = client.post("/cart/bulk", data="\n".join(payloads), content_type="application/x-ndjson")
+    b"".join(response.streaming_content)
+    bulk = carts / (time.perf_counter() - start)
+
+    assert Cart.objects.count() == carts * 2
+    print(f"POST /cart       {single:10.1f} carts/s")
+    print(f"POST /cart/bulk  {bulk:10.1f} carts/s")
+    print(f"speedup          {bulk / single:10.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--carts", type=int, default=2000)
+    parser.add_argument("--items-per-cart", type=int, default=5)
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--in-memory", action="store_true", help="skip the on-disk SQLite database")
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database(on_disk=not args.in_memory):
+        run(args.carts, args.items_per_cart, args.products)
+
+
+if __name__ == "__main__":
+    main()
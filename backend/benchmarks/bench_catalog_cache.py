@@ -0,0 +1,48 @@
+"""Requests per second for the catalog endpoints with and without the catalog cache.
+
+Run from backend/: python -m benchmarks.bench_catalog_cache [--products N]
+"""
+import argparse
+
+from benchmarks.utils import benchmark_database, requests_per_second, setup_django
+
+
+def run(products: int, duration: float) -> None:
+    from django.test import Client
+    from django.test.utils import override_settings
+
+    from products.cache import get_catalog_cache, reset_catalog_cache
+    from products.models import Product
+
+    Product.objects.bulk_create(
+        [Product(name=f"Producto {index:06d}", price=1000 + index) for index in range(products)]
+    )
+    product_id = Product.objects.order_by("id").values_list("id", flat=True).first()
+    client = Client()
+    paths = ["/products", "/products?page_size=200", f"/products/{product_id}"]
+
+    for label, enabled in (("uncached", False), ("cached", True)):
+        with override_settings(CATALOG_CACHE={"ENABLED": enabled, "BACKEND": "lru"}):
+            reset_catalog_cache()
+            for path in paths:
+                rps = requests_per_second(lambda: client.get(path), duration)
+                print(f"{label:10} {path:30} {rps:10.1f} req/s")
+            backend = get_catalog_cache()
+            if backend is not None:
+                print(f"{label:10} stats: {backend.stats()}")
+    reset_catalog_cache()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--duration", type=float, default=2.0)
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database():
+        run(args.products, args.duration)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""In-process benchmark of the API endpoints through the project's WSGI application.
+
+Seeds a fresh SQLite database per scale with seed_products, then reports latency
+percentiles, requests per second, queries per request, response bytes (as negotiated
+with --accept-encoding) and peak traced memory.
+
+Run from backend/:
+    python -m benchmarks.bench_endpoints --scales small,medium --output bench.json
+    python -m benchmarks.bench_endpoints --compare baseline.json bench.json
+"""
+import argparse
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks.utils import benchmark_database, setup_django
+
+SCALES = {
+    "small": {"products": 1_000, "carts": 5_000},
+    "medium": {"products": 10_000, "carts": 50_000},
+    "large": {"products": 100_000, "carts": 1_000_000},
+}
+ITEMS_PER_CART = 3
+DEFAULT_THRESHOLD = 0.15
+
+
+class WSGIClient:
+    """Minimal client that calls the WSGI application directly and keeps cookies."""
+
+    def __init__(self, application, accept_encoding: str = ""):
+        self.application = application
+        self.accept_encoding = accept_encoding
+        self.cookies = {}
+
+    def request(self, method: str, path: str, body: bytes = b"", content_type: str = "application/json"):
+        path, _, query = path.partition("?")
+        environ = {
+            "REQUEST_METHOD": method,
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "SERVER_NAME": "testserver",
+            "SERVER_PORT": "80",
+            "HTTP_HOST": "testserver",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "CONTENT_TYPE": content_type,
+            "CONTENT_LENGTH": str(len(body)),
+            "HTTP_COOKIE": "; ".join(f"{key}={value}" for key, value in self.cookies.items()),
+            "HTTP_ACCEPT_ENCODING": self.accept_encoding,
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.url_scheme": "http",
+            "wsgi.version": (1, 0),
+            "wsgi.multithread": False,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        status_holder = {}
+
+        def start_response(status, headers, exc_info=None):
+            status_holder["status"] = int(status.split(" ", 1)[0])
+            for header, value in headers:
+                if header.lower() == "set-cookie":
+                    name, _, rest = value.partition("=")
+                    self.cookies[name] = rest.split(";", 1)[0]
+
+        result = self.application(environ, start_response)
+        try:
+            content = b"".join(result)
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+        return status_holder["status"], content
+
+
+def _cases(product_id: int, cart_id: int):
+    items = json.dumps({"items": [{"product_id": product_id, "quantity": 2}]}).encode("utf-8")
+    update = json.dumps({"id": cart_id, "items": [{"product_id": product_id, "quantity": 3}]}).encode("utf-8")
+    return [
+        ("products_list", "GET", "/products", b""),
+        ("products_list_all", "GET", "/products?all=1", b""),
+        ("products_detail", "GET", f"/products/{product_id}", b""),
+        ("carts_list", "GET", "/carts", b""),
+        ("carts_list_product_filter", "GET", f"/carts?product_id={product_id}", b""),
+        ("carts_list_date_filter", "GET", "/carts?from=2000-01-01T00:00:00&total=none", b""),
+        ("cart_create", "POST", "/cart", items),
+        ("cart_update", "POST", "/cart/update", update),
+    ]
+
+
+def _percentile(samples, percent: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _measure(client, method: str, path: str, body: bytes, requests: int) -> dict:
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    status, content = client.request(method, path, body)
+
+    with CaptureQueriesContext(connection) as queries:
+        client.request(method, path, body)
+    # Later requests reset connection.queries, so count before moving on.
+    query_count = len(queries)
+
+    tracemalloc.start()
+    client.request(method, path, body)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = []
+    started = time.perf_counter()
+    for _index in range(requests):
+        request_started = time.perf_counter()
+        client.request(method, path, body)
+        latencies.append((time.perf_counter() - request_started) * 1000)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "status": status,
+        "requests": requests,
+        "rps": requests / elapsed,
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+        "mean_ms": statistics.fmean(latencies),
+        "queries": query_count,
+        "response_bytes": len(content),
+        "peak_memory_bytes": peak,
+    }
+
+
+def run_scale(name: str, requests: int, catalog_cache: bool, accept_encoding: str, session_backend: str) -> dict:
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.test.utils import override_settings
+
+    from django.core.wsgi import get_wsgi_application
+
+    from carts.models import Cart
+    from config.settings import SESSION_ENGINES
+    from products.cache import reset_catalog_cache
+    from products.models import Product
+
+    scale = SCALES[name]
+    call_command(
+        "seed_products",
+        products=scale["products"],
+        carts=scale["carts"],
+        items_per_cart=ITEMS_PER_CART,
+        seed=1,
+        stdout=io.StringIO(),
+    )
+    get_user_model().objects.create_user(username="bench", password="bench-password")
+
+    results = {}
+    with override_settings(
+        CATALOG_CACHE={"ENABLED": catalog_cache, "BACKEND": "lru"}, SESSION_ENGINE=SESSION_ENGINES[session_backend]
+    ):
+        # Built inside the override: SessionMiddleware reads SESSION_ENGINE when it is loaded.
+        client = WSGIClient(get_wsgi_application(), accept_encoding)
+        client.request("POST", "/auth/login", json.dumps({"username": "bench", "password": "bench-password"}).encode())
+        product_id = Product.objects.order_by("id").values_list("id", flat=True).first()
+        cart_id = Cart.objects.order_by("id").values_list("id", flat=True).first()
+        reset_catalog_cache()
+        for case, method, path, body in _cases(product_id, cart_id):
+            case_requests = max(1, requests // 10) if case == "products_list_all" else requests
+            results[case] = _measure(client, method, path, body, case_requests)
+            row = results[case]
+            print(
+                f"{name:7} {case:27} {row['rps']:9.1f} req/s  p50 {row['p50_ms']:8.2f} ms  "
+                f"p95 {row['p95_ms']:8.2f} ms  p99 {row['p99_ms']:8.2f} ms  "
+                f"{row['queries']:3} queries  {row['response_bytes'] / 1024:9.1f} KiB body  "
+                f"{row['peak_memory_bytes'] / 1024:9.1f} KiB peak"
+            )
+    reset_catalog_cache()
+    return results
+
+
+def compare(baseline_path: str, current_path: str, threshold: float) -> int:
+    """Print per-endpoint deltas and return the number of regressions."""
+    with open(baseline_path, encoding="utf-8") as handle:
+        baseline = json.load(handle)["results"]
+    with open(current_path, encoding="utf-8") as handle:
+        current = json.load(handle)["results"]
+
+    regressions = 0
+    for scale, cases in current.items():
+        for case, row in cases.items():
+            before = baseline.get(scale, {}).get(case)
+            if not before:
+                continue
+
+            problems = []
+            if row["p95_ms"] > before["p95_ms"] * (1 + threshold):
+                problems.append(f"p95 {before['p95_ms']:.2f} -> {row['p95_ms']:.2f} ms")
+            if row["rps"] < before["rps"] * (1 - threshold):
+                problems.append(f"rps {before['rps']:.1f} -> {row['rps']:.1f}")
+            if row["queries"] > before["queries"]:
+                problems.append(f"queries {before['queries']} -> {row['queries']}")
+            if "response_bytes" in before and row["response_bytes"] > before["response_bytes"] * (1 + threshold):
+                problems.append(f"body {before['response_bytes']} -> {row['response_bytes']} bytes")
+            if row["peak_memory_bytes"] > before["peak_memory_bytes"] * (1 + threshold):
+                problems.append(f"memory {before['peak_memory_bytes']} -> {row['peak_memory_bytes']} bytes")
+
+            regressions += bool(problems)
+            label = "REGRESSION" if problems else "ok"
+            print(f"{label:10} {scale:7} {case:27} {'; '.join(problems)}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="small", help=f"Comma separated: {', '.join(SCALES)}")
+    parser.add_argument("--requests", type=int, default=200, help="Timed requests per endpoint.")
+    parser.add_argument("--output", help="Write results as JSON to this path.")
+    parser.add_argument("--no-catalog-cache", action="store_true")
+    parser.add_argument(
+        "--accept-encoding", default="gzip, br", help="Accept-Encoding sent with every request ('' for identity)."
+    )
+    parser.add_argument(
+        "--session-backend", default="db", choices=("db", "cached_db", "signed_cookies"), help="Session storage."
+    )
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"))
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed relative slowdown.")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.threshold) else 0)
+
+    scales = [scale.strip() for scale in args.scales.split(",") if scale.strip()]
+    unknown = [scale for scale in scales if scale not in SCALES]
+    if unknown:
+        parser.error(f"Unknown scales: {', '.join(unknown)}")
+
+    setup_django()
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "catalog_cache": not args.no_catalog_cache,
+            "accept_encoding": args.accept_encoding,
+            "session_backend": args.session_backend,
+        },
+        "results": {},
+    }
+    for scale in scales:
+        with benchmark_database(on_disk=True):
+            report["results"][scale] = run_scale(
+                scale, args.requests, not args.no_catalog_cache, args.accept_encoding, args.session_backend
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
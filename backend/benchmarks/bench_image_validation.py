@@ -0,0 +1,81 @@
+"""Image URL validation throughput: one new connection per URL against the pooled keep-alive checker.
+
+A local HTTP server stands in for the image host and answers every HEAD after `--latency-ms`.
+
+Run from backend/: python -m benchmarks.bench_image_validation [--urls 500] [--latency-ms 20] [--workers 8]
+"""
+import argparse
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.utils import setup_django
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+    connections = 0
+
+    def setup(self):
+        type(self).connections += 1
+        super().setup()
+
+    def do_HEAD(self):
+        time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def _per_url_connection(urls) -> None:
+    for url in urls:
+        with urllib.request.urlopen(urllib.request.Request(url, method="HEAD"), timeout=5):
+            pass
+
+
+def run(url_count: int, latency_ms: float, workers: int) -> None:
+    from products.images import validate_image_urls
+
+    _Handler.latency = latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_address[1]}/image-{index}.jpg" for index in range(url_count)]
+
+    cases = (
+        ("connection per URL, sequential", lambda: _per_url_connection(urls)),
+        ("keep-alive, 1 worker", lambda: validate_image_urls(urls, workers=1)),
+        (f"keep-alive, {workers} workers", lambda: validate_image_urls(urls, workers=workers)),
+    )
+    try:
+        for label, call in cases:
+            _Handler.connections = 0
+            started = time.perf_counter()
+            call()
+            elapsed = time.perf_counter() - started
+            print(
+                f"{label:32} {elapsed:7.2f}s  {url_count / elapsed:8.0f} URLs/s  {_Handler.connections:5} connections"
+            )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--urls", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    setup_django()
+    run(args.urls, args.latency_ms, args.workers)
+
+
+if __name__ == "__main__":
+    main()
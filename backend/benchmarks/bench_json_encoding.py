@@ -0,0 +1,72 @@
+"""Fetch and encode time for a large product payload: values() dicts + JsonResponse versus
+values_list() tuples + EncodedJsonResponse, per encoder backend and decimal format.
+
+Run from backend/: python -m benchmarks.bench_json_encoding [--rows N] [--repeat R]
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.utils import benchmark_database, setup_django
+
+FIELDS = ("id", "name", "price", "image_url")
+
+
+def _timed(func, repeat: int) -> float:
+    samples = []
+    for _index in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def run(rows: int, repeat: int) -> None:
+    from django.http import JsonResponse
+    from django.test.utils import override_settings
+
+    from config.encoders import EncodedJsonResponse, decimal_column, orjson, rows_as_objects
+    from products.models import Product
+
+    Product.objects.bulk_create([Product(name=f"Producto {index:06d}", price=1000 + index) for index in range(rows)])
+    queryset = Product.objects.order_by("name", "id")
+
+    def dict_rows():
+        rows = queryset.values(*FIELDS)
+        return JsonResponse([{**row, "price": float(row["price"])} for row in rows], safe=False)
+
+    def tuple_rows(decimals):
+        columns = [decimal_column(field, decimals) if field == "price" else field for field in FIELDS]
+        return EncodedJsonResponse(rows_as_objects(FIELDS, queryset.values_list(*columns)), decimals)
+
+    cases = [("values() + JsonResponse", "stdlib", dict_rows)]
+    for backend in ("stdlib", "orjson") if orjson is not None else ("stdlib",):
+        for decimals in ("float", "string"):
+            cases.append(
+                (f"values_list() + {backend} ({decimals})", backend, lambda decimals=decimals: tuple_rows(decimals))
+            )
+
+    baseline = None
+    for label, backend, func in cases:
+        with override_settings(JSON_RESPONSES={"BACKEND": "auto" if backend == "orjson" else "stdlib"}):
+            elapsed = _timed(func, repeat)
+        baseline = baseline or elapsed
+        print(f"{label:36} {elapsed:9.2f} ms  {baseline / elapsed:5.1f}x")
+
+    if orjson is None:
+        print("orjson is not installed; only the stdlib encoder was measured")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database():
+        run(args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
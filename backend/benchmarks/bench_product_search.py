@@ -0,0 +1,52 @@
+"""Latency of GET /products/search against an FTS5 index of a large synthetic catalog.
+
+Run from backend/: python -m benchmarks.bench_product_search [--products 1000000] [--requests 200]
+"""
+import argparse
+import io
+import time
+
+from benchmarks.bench_endpoints import _percentile
+from benchmarks.utils import benchmark_database, setup_django
+
+QUERIES = ("rem", "zapatillas urb", "mochila premium", "campera liviana 00012", "gorra", "pantalon dep 0099")
+
+
+def run(products: int, requests: int) -> None:
+    from django.core.management import call_command
+    from django.test import Client
+    from django.test.utils import override_settings
+
+    started = time.perf_counter()
+    call_command("seed_products", products=products, seed=1, stdout=io.StringIO())
+    print(f"seeded and indexed {products} products in {time.perf_counter() - started:.1f}s")
+
+    client = Client()
+    with override_settings(CATALOG_CACHE={"ENABLED": False}):
+        for query in QUERIES:
+            path = f"/products/search?q={query.replace(' ', '+')}"
+            response = client.get(path)
+            latencies = []
+            for _index in range(requests):
+                request_started = time.perf_counter()
+                client.get(path)
+                latencies.append((time.perf_counter() - request_started) * 1000)
+            print(
+                f"{query:24} {len(response.json()['results']):3} results  "
+                f"p50 {_percentile(latencies, 50):7.2f} ms  p95 {_percentile(latencies, 95):7.2f} ms"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database(on_disk=True):
+        run(args.products, args.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Latency of the staff sales endpoints (served from the rollups) against the raw CartItem scan they replace.
+
+Run from backend/: python -m benchmarks.bench_sales_rollup [--products 10000] [--carts 200000] [--requests 50]
+"""
+import argparse
+import io
+import time
+from datetime import timedelta
+
+from benchmarks.bench_endpoints import _percentile
+from benchmarks.utils import benchmark_database, setup_django
+
+PATHS = (
+    "/sales/top",
+    "/sales/top?from=2000-01-01&order_by=revenue",
+    "/sales/daily",
+    "/sales/daily?from=2000-01-01&interval=month",
+    "/sales/daily?from=2000-01-01&product_id=1",
+)
+
+
+def _timed(call, requests: int):
+    call()
+    latencies = []
+    for _index in range(requests):
+        started = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return f"p50 {_percentile(latencies, 50):8.2f} ms  p95 {_percentile(latencies, 95):8.2f} ms"
+
+
+def run(products: int, carts: int, requests: int) -> None:
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.db.models import Sum
+    from django.test import Client
+    from django.utils import timezone
+
+    from carts.models import CartItem
+
+    out = io.StringIO()
+    call_command("seed_products", products=products, carts=carts, seed=1, stdout=out)
+    print(out.getvalue().strip())
+
+    staff = get_user_model().objects.create_user(username="bench", password="bench-password", is_staff=True)
+    client = Client()
+    client.force_login(staff)
+    for path in PATHS:
+        print(f"{path:46} {_timed(lambda: client.get(path), requests)}")
+
+    week_ago = timezone.now() - timedelta(days=7)
+
+    def raw_top_week():
+        list(
+            CartItem.objects.filter(cart__created_at__gte=week_ago)
+            .values("product_id")
+            .annotate(quantity=Sum("quantity"))
+            .order_by("-quantity")[:10]
+        )
+
+    print(f"{'raw CartItem scan, top week':46} {_timed(raw_top_week, max(1, requests // 10))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--carts", type=int, default=200_000)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database(on_disk=True):
+        run(args.products, args.carts, args.requests)
+
+
+if __name__ == "__main__":
+    main()
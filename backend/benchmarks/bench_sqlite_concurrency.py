@@ -0,0 +1,107 @@
+"""Concurrent POST /cart writers against an on-disk SQLite database, per DATABASE_PROFILE.
+
+Each profile runs in its own interpreter because the profile is read when settings load.
+
+Run from backend/: python -m benchmarks.bench_sqlite_concurrency [--threads N] [--carts-per-thread K]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks.utils import BACKEND_DIR, benchmark_database, setup_django
+
+PROFILES = ("development", "production")
+
+
+def _writer(product_ids, carts: int, counters: dict, lock: threading.Lock, start: threading.Event) -> None:
+    from django.contrib.auth import get_user_model
+    from django.db import OperationalError, connection
+    from django.test import Client
+
+    client = Client()
+    client.force_login(get_user_model().objects.get(username="bench"))
+    payload = json.dumps({"items": [{"product_id": product_id, "quantity": 1} for product_id in product_ids]})
+    start.wait()
+    try:
+        for _index in range(carts):
+            try:
+                response = client.post("/cart", data=payload, content_type="application/json")
+                key = "ok" if response.status_code == 201 else "failed"
+            except OperationalError:
+                key = "locked"
+            with lock:
+                counters[key] += 1
+    finally:
+        connection.close()
+
+
+def run(threads: int, carts_per_thread: int) -> dict:
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+
+    from products.models import Product
+
+    Product.objects.bulk_create([Product(name=f"Producto {index}", price=100 + index) for index in range(50)])
+    product_ids = list(Product.objects.values_list("id", flat=True)[:5])
+    get_user_model().objects.create_user(username="bench", password="bench-password")
+
+    counters = {"ok": 0, "failed": 0, "locked": 0}
+    lock = threading.Lock()
+    start = threading.Event()
+    workers = [
+        threading.Thread(target=_writer, args=(product_ids, carts_per_thread, counters, lock, start))
+        for _index in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    started = time.perf_counter()
+    start.set()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    return {"profile": settings.DATABASE_PROFILE, "writes_per_second": counters["ok"] / elapsed, **counters}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--carts-per-thread", type=int, default=100)
+    parser.add_argument("--profile", choices=PROFILES, help="Run a single profile in this process.")
+    args = parser.parse_args()
+
+    if args.profile:
+        os.environ["DATABASE_PROFILE"] = args.profile
+        setup_django()
+        with benchmark_database(on_disk=True):
+            print(json.dumps(run(args.threads, args.carts_per_thread)))
+        return
+
+    for profile in PROFILES:
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.bench_sqlite_concurrency",
+                f"--profile={profile}",
+                f"--threads={args.threads}",
+                f"--carts-per-thread={args.carts_per_thread}",
+            ],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        row = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{row['profile']:12} {row['writes_per_second']:9.1f} writes/s  "
+            f"{row['ok']:6} ok  {row['locked']:5} locked  {row['failed']:5} failed"
+        )
+
+
+if __name__ == "__main__":
+    main()
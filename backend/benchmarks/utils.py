@@ -0,0 +1,55 @@
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    # Benchmarks replay many writes from one user, which the cart_write limit would reject.
+    os.environ.setdefault("RATE_LIMITS", "0")
+
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def benchmark_database(on_disk: bool = False):
+    """Create a throwaway test database for the duration of a benchmark.
+
+    SQLite test databases live in memory by default; `on_disk` uses a temporary
+    file instead so commits pay the same fsync cost as a real deployment.
+    """
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    directory = tempfile.TemporaryDirectory(prefix="bench-") if on_disk else None
+    if directory:
+        connection.settings_dict.setdefault("TEST", {})["NAME"] = os.path.join(directory.name, "bench.sqlite3")
+
+    setup_test_environment(debug=False)
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+        if directory:
+            directory.cleanup()
+
+
+def requests_per_second(func, duration: float = 2.0) -> float:
+    count = 0
+    start = time.perf_counter()
+    deadline = start + duration
+    while time.perf_counter() < deadline:
+        func()
+        count += 1
+    return count / (time.perf_counter() - start)
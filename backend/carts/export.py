@@ -0,0 +1,121 @@
+import csv
+import json
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Case, Exists, F, OuterRef, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import CartItem
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = ("csv", "ndjson")
+RANGE_LOOKUPS = (
+    ("from", "created_at__gte"),
+    ("to", "created_at__lte"),
+    ("min_total", "total__gte"),
+    ("max_total", "total__lte"),
+)
+CENTS = Decimal("0.01")
+CSV_HEADER = ("cart_id", "created_at", "product_id", "product_name", "price", "quantity")
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for streaming csv.writer output."""
+
+    def write(self, value):
+        return value
+
+
+def parse_cart_filters(product_id=None, from_date=None, to_date=None, min_total=None, max_total=None):
+    """Validate the product, date and total filters, returning (filters, error_detail)."""
+    filters = {"product_id": None, "from": None, "to": None, "min_total": None, "max_total": None}
+    if product_id:
+        # int() alone would accept signs, spaces and non-ASCII decimal digits.
+        if not (product_id.isascii() and product_id.isdigit()) or int(product_id) < 1:
+            return None, "Invalid product_id"
+        filters["product_id"] = int(product_id)
+    for key, value in (("from", from_date), ("to", to_date)):
+        if not value:
+            continue
+        try:
+            moment = datetime.fromisoformat(value)
+        except ValueError:
+            return None, f"Invalid {key} date"
+        filters[key] = timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+
+    for key, value in (("min_total", min_total), ("max_total", max_total)):
+        if not value:
+            continue
+        try:
+            filters[key] = Decimal(value)
+        except InvalidOperation:
+            return None, f"Invalid {key}"
+        if not filters[key].is_finite():
+            return None, f"Invalid {key}"
+    return filters, None
+
+
+def filter_carts(queryset, filters, prefix: str = ""):
+    """Apply parsed filters to a Cart queryset, or to a related queryset through `prefix`."""
+    if filters["product_id"]:
+        matching = CartItem.objects.filter(cart_id=OuterRef(f"{prefix}pk"), product_id=filters["product_id"])
+        queryset = queryset.filter(Exists(matching))
+    for key, lookup in RANGE_LOOKUPS:
+        if filters[key] is not None:
+            queryset = queryset.filter(**{f"{prefix}{lookup}": filters[key]})
+    return queryset
+
+
+def export_rows(filters, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """Yield one flat tuple per cart item, ordered by cart, in constant memory.
+
+    Items without a snapshot (unit_price is NULL) fall back to the product's current name
+    and price, as in carts.sales.stored_sales. The last column is the stored cart total,
+    which NDJSON emits instead of re-adding item prices.
+    """
+    queryset = filter_carts(CartItem.objects.all(), filters, prefix="cart__")
+
+    return (
+        queryset.order_by("cart_id", "id")
+        .values_list(
+            "cart_id",
+            "cart__created_at",
+            "product_id",
+            Case(When(unit_price__isnull=True, then=F("product__name")), default=F("product_name")),
+            Coalesce("unit_price", "product__price"),
+            "quantity",
+            "cart__total",
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def iter_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADER)
+    for cart_id, created_at, product_id, name, price, quantity, _total in rows:
+        # SQLite returns the Coalesce fallback without the column's scale.
+        yield writer.writerow((cart_id, created_at.isoformat(), product_id, name, price.quantize(CENTS), quantity))
+
+
+def iter_ndjson(rows):
+    """Group consecutive item rows into one JSON line per cart."""
+    current = None
+    for cart_id, created_at, product_id, name, price, quantity, total in rows:
+        if current is None or current["id"] != cart_id:
+            if current is not None:
+                yield json.dumps(current) + "\n"
+            current = {"id": cart_id, "created_at": created_at.isoformat(), "items": [], "total": float(total)}
+
+        current["items"].append(
+            {"product_id": product_id, "product_name": name, "price": float(price or 0), "quantity": quantity}
+        )
+
+    if current is not None:
+        yield json.dumps(current) + "\n"
+
+
+def iter_export(export_format: str, rows):
+    return iter_csv(rows) if export_format == "csv" else iter_ndjson(rows)
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from carts.models import CartItem
+
+
+class Command(BaseCommand):
+    help = "Completa nombre y precio historico en items de carrito creados antes del snapshot."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        updated = 0
+        last_id = 0
+
+        while True:
+            items = list(
+                CartItem.objects.filter(id__gt=last_id, unit_price__isnull=True)
+                .select_related("product")
+                .only("id", "product__name", "product__price")
+                .order_by("id")[:chunk_size]
+            )
+            if not items:
+                break
+
+            for item in items:
+                item.product_name = item.product.name
+                item.unit_price = item.product.price
+
+            with transaction.atomic():
+                CartItem.objects.bulk_update(items, ["product_name", "unit_price"])
+
+            updated += len(items)
+            last_id = items[-1].id
+
+        self.stdout.write(self.style.SUCCESS(f"Items actualizados: {updated}"))
@@ -0,0 +1,35 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from carts.export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, export_rows, iter_export, parse_cart_filters
+
+
+class Command(BaseCommand):
+    help = "Exporta carritos e items en CSV o NDJSON sin cargarlos en memoria."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+        parser.add_argument("--product-id")
+        parser.add_argument("--from", dest="from_date")
+        parser.add_argument("--to", dest="to_date")
+        parser.add_argument("--min-total")
+        parser.add_argument("--max-total")
+        parser.add_argument("--output", help="Archivo de salida (por defecto stdout).")
+        parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        filters, detail = parse_cart_filters(
+            options["product_id"], options["from_date"], options["to_date"], options["min_total"], options["max_total"]
+        )
+        if detail:
+            raise CommandError(detail)
+
+        rows = export_rows(filters, chunk_size=options["chunk_size"])
+        output = open(options["output"], "w", encoding="utf-8", newline="") if options["output"] else sys.stdout
+        try:
+            for chunk in iter_export(options["format"], rows):
+                output.write(chunk)
+        finally:
+            if output is not sys.stdout:
+                output.close()
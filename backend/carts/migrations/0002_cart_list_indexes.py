@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("carts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="cart",
+            index=models.Index(fields=["created_at", "id"], name="cart_created_at_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="cartitem",
+            index=models.Index(fields=["product", "cart"], name="cartitem_product_cart_idx"),
+        ),
+    ]
@@ -0,0 +1,61 @@
+from decimal import Decimal
+
+from django.db import migrations, models
+
+BACKFILL_CHUNK_SIZE = 1000
+
+
+def backfill_totals(apps, schema_editor):
+    Cart = apps.get_model("carts", "Cart")
+    CartItem = apps.get_model("carts", "CartItem")
+
+    last_id = 0
+    while True:
+        carts = list(Cart.objects.filter(id__gt=last_id).order_by("id")[:BACKFILL_CHUNK_SIZE])
+        if not carts:
+            break
+
+        by_id = {cart.id: cart for cart in carts}
+        for cart in carts:
+            cart.total = Decimal("0")
+            cart.item_count = 0
+            cart.line_count = 0
+
+        rows = CartItem.objects.filter(cart_id__in=by_id).values_list("cart_id", "quantity", "product__price")
+        for cart_id, quantity, price in rows:
+            cart = by_id[cart_id]
+            cart.total += price * quantity
+            cart.item_count += quantity
+            cart.line_count += 1
+
+        Cart.objects.bulk_update(carts, ["total", "item_count", "line_count"])
+        last_id = carts[-1].id
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("carts", "0002_cart_list_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cart",
+            name="total",
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name="cart",
+            name="item_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="cart",
+            name="line_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="cart",
+            index=models.Index(fields=["total", "id"], name="cart_total_id_idx"),
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+    ]
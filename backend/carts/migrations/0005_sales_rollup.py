@@ -0,0 +1,72 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0006_product_search_index"),
+        ("carts", "0004_cartitem_snapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailySales",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField(unique=True)),
+                ("quantity", models.BigIntegerField(default=0)),
+                ("revenue", models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ProductDailySales",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField()),
+                ("quantity", models.BigIntegerField(default=0)),
+                ("revenue", models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="products.product"
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ProductMonthlySales",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("month", models.DateField()),
+                ("quantity", models.BigIntegerField(default=0)),
+                ("revenue", models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="products.product"
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["month", "product", "quantity", "revenue"], name="sales_month_cover_idx")
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="productmonthlysales",
+            constraint=models.UniqueConstraint(fields=("month", "product"), name="sales_month_product_uniq"),
+        ),
+        migrations.AddIndex(
+            model_name="productdailysales",
+            index=models.Index(fields=["day", "product", "quantity", "revenue"], name="sales_day_cover_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="productdailysales",
+            index=models.Index(fields=["product", "day", "quantity", "revenue"], name="sales_product_cover_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="productdailysales",
+            constraint=models.UniqueConstraint(fields=("day", "product"), name="sales_day_product_uniq"),
+        ),
+    ]
@@ -0,0 +1,17 @@
+from django.db import migrations, models
+
+import carts.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("carts", "0006_cart_version"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="cartitem",
+            name="product",
+            field=models.ForeignKey(null=True, on_delete=carts.models.snapshot_and_set_null, to="products.product"),
+        ),
+    ]
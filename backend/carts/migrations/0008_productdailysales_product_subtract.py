@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+import carts.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("carts", "0007_cartitem_product_set_null"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="productdailysales",
+            name="product",
+            field=models.ForeignKey(
+                on_delete=carts.models.subtract_and_cascade, related_name="+", to="products.product"
+            ),
+        ),
+    ]
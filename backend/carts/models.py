@@ -1,19 +1,118 @@
 from django.db import models
+from django.db.models import OuterRef, Subquery
 
 from products.models import Product
 
 
 class Cart(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
+    total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    item_count = models.PositiveIntegerField(default=0)
+    line_count = models.PositiveIntegerField(default=0)
+    # Incremented by every update; clients send it back for optimistic concurrency.
+    version = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="cart_created_at_id_idx"),
+            models.Index(fields=["total", "id"], name="cart_total_id_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"Cart {self.id}"
 
 
+def snapshot_and_set_null(collector, field, sub_objs, using):
+    """on_delete for CartItem.product: keep the line, with the product's name and price, and clear the link.
+
+    Lines written before the snapshot columns existed copy them from the product first.
+    """
+    products = Product.objects.using(using).filter(id=OuterRef("product_id"))
+    sub_objs.filter(unit_price__isnull=True).update(
+        product_name=Subquery(products.values("name")[:1]), unit_price=Subquery(products.values("price")[:1])
+    )
+    models.SET_NULL(collector, field, sub_objs, using)
+
+
 class CartItem(models.Model):
     cart = models.ForeignKey(Cart, related_name="items", on_delete=models.CASCADE)
-    product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    # Deleting a product keeps historical lines: they carry their own name and price.
+    product = models.ForeignKey(Product, null=True, on_delete=snapshot_and_set_null)
     quantity = models.PositiveIntegerField()
+    # Snapshot of the product at write time, so reads skip the Product join and keep historical prices.
+    product_name = models.CharField(max_length=120, blank=True, default="")
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2, null=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["product", "cart"], name="cartitem_product_cart_idx")]
+
+    def save(self, *args, **kwargs):
+        if self.unit_price is None:
+            self.product_name = self.product.name
+            self.unit_price = self.product.price
+        super().save(*args, **kwargs)
+
+    def __str__(self) -> str:
+        return f"{self.product_name} x {self.quantity}"
+
+
+def subtract_and_cascade(collector, field, sub_objs, using):
+    """on_delete for ProductDailySales.product: take the product's rows out of DailySales, then cascade."""
+    from .sales import subtract_daily_sales  # carts.sales imports these models.
+
+    subtract_daily_sales(sub_objs, using)
+    models.CASCADE(collector, field, sub_objs, using)
+
+
+# The collector calls the handler without first fetching the rows: the per-day sums are the only read.
+subtract_and_cascade.lazy_sub_objs = True
+
+
+class ProductDailySales(models.Model):
+    """Per product and local day rollup of cart items, kept in step with cart writes by carts.sales."""
+
+    day = models.DateField()
+    # Deleting a product drops its rows and their share of DailySales, so both series keep agreeing.
+    product = models.ForeignKey(Product, related_name="+", on_delete=subtract_and_cascade)
+    # Signed, so removing a cart that predates the rollup cannot violate a constraint;
+    # the top-N query skips products whose total is not positive.
+    quantity = models.BigIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["day", "product"], name="sales_day_product_uniq")]
+        # Covering indexes: range aggregations never touch the table rows.
+        indexes = [
+            models.Index(fields=["day", "product", "quantity", "revenue"], name="sales_day_cover_idx"),
+            models.Index(fields=["product", "day", "quantity", "revenue"], name="sales_product_cover_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.day} {self.product_id} x {self.quantity}"
+
+
+class ProductMonthlySales(models.Model):
+    """ProductDailySales summed per month (`month` is its first day), for top-N over long ranges."""
+
+    month = models.DateField()
+    product = models.ForeignKey(Product, related_name="+", on_delete=models.CASCADE)
+    quantity = models.BigIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["month", "product"], name="sales_month_product_uniq")]
+        indexes = [models.Index(fields=["month", "product", "quantity", "revenue"], name="sales_month_cover_idx")]
+
+    def __str__(self) -> str:
+        return f"{self.month:%Y-%m} {self.product_id} x {self.quantity}"
+
+
+class DailySales(models.Model):
+    """Catalog-wide totals per local day, for sales series that are not filtered by product."""
+
+    day = models.DateField(unique=True)
+    quantity = models.BigIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=16, decimal_places=2, default=0)
 
     def __str__(self) -> str:
-        return f"{self.product.name} x {self.quantity}"
+        return f"{self.day} x {self.quantity}"
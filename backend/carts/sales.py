@@ -0,0 +1,229 @@
+"""Sales rollups materialized from cart history.
+
+Three tables: ProductDailySales (product x local day), ProductMonthlySales (product x month)
+and DailySales (catalog x day). Cart writes call `record_sales` inside their transaction, so
+the rollups commit or roll back with the cart; `rebuild_sales` recomputes them from CartItem
+in chunks of carts. Upserts use INSERT ... ON CONFLICT, available on SQLite and PostgreSQL.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import DEFAULT_DB_ALIAS, connections, router
+from django.db.models import DecimalField, ExpressionWrapper, F, Sum
+from django.db.models.functions import Coalesce, TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .models import Cart, CartItem, DailySales, ProductDailySales, ProductMonthlySales
+
+REBUILD_CHUNK_SIZE = 5000
+SALES_ORDERINGS = ("quantity", "revenue")
+SALES_INTERVALS = {"day": None, "week": TruncWeek, "month": TruncMonth}
+CENTS = Decimal("0.01")
+
+
+def sales_day(created_at):
+    """Rollup day of a cart: its creation date in the current time zone."""
+    return timezone.localdate(created_at)
+
+
+def stored_sales(queryset):
+    """(product_id, quantity, unit_price) rows of stored items; unsnapshotted items use the product price."""
+    return queryset.values_list("product_id", "quantity", Coalesce("unit_price", "product__price"))
+
+
+def _add(model, keys, rows, using: str) -> None:
+    """Add (*keys, quantity, revenue) deltas to `model`, creating missing rows, in one statement."""
+    if not rows:
+        return
+
+    connection = connections[using]
+    ops = connection.ops
+    table = ops.quote_name(model._meta.db_table)
+    params = [
+        (
+            *(ops.adapt_datefield_value(value) if isinstance(value, date) else value for value in key),
+            quantity,
+            ops.adapt_decimalfield_value(revenue, 16, 2),
+        )
+        for *key, quantity, revenue in rows
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {table} ({', '.join(keys)}, quantity, revenue) "
+            f"VALUES ({', '.join(['%s'] * (len(keys) + 2))}) "
+            f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET quantity = {table}.quantity + excluded.quantity, "
+            f"revenue = {table}.revenue + excluded.revenue",
+            params,
+        )
+
+
+def record_sales(day, added=(), removed=(), using: str = DEFAULT_DB_ALIAS) -> None:
+    """Apply the (product_id, quantity, unit_price) items added to and removed from carts of `day`.
+
+    Rows that drop to zero are kept: they cost nothing to sum and deleting them would add
+    a statement per table to every cart update. Lines of deleted products (no product_id)
+    are skipped: their sales left the rollups with the product.
+    """
+    deltas = defaultdict(lambda: [0, Decimal("0")])
+    for sign, items in ((1, added), (-1, removed)):
+        for product_id, quantity, unit_price in items:
+            if product_id is None:
+                continue
+            delta = deltas[product_id]
+            delta[0] += sign * quantity
+            delta[1] += sign * quantity * (unit_price or 0)
+
+    changed = [
+        (product_id, quantity, revenue) for product_id, (quantity, revenue) in deltas.items() if quantity or revenue
+    ]
+    if not changed:
+        return
+
+    month = day.replace(day=1)
+    _add(ProductDailySales, ("day", "product_id"), [(day, *row) for row in changed], using)
+    _add(ProductMonthlySales, ("month", "product_id"), [(month, *row) for row in changed], using)
+    _add(DailySales, ("day",), [(day, sum(row[1] for row in changed), sum(row[2] for row in changed))], using)
+
+
+def subtract_daily_sales(queryset, using: str = DEFAULT_DB_ALIAS) -> None:
+    """Remove the ProductDailySales rows of `queryset`, summed per day, from DailySales."""
+    totals = queryset.values("day").annotate(total_quantity=Sum("quantity"), total_revenue=Sum("revenue")).order_by()
+    _add(
+        DailySales,
+        ("day",),
+        [(row["day"], -row["total_quantity"], -row["total_revenue"]) for row in totals],
+        using,
+    )
+
+
+def rebuild_sales(chunk_size: int = REBUILD_CHUNK_SIZE, using: str = DEFAULT_DB_ALIAS) -> int:
+    """Recompute the rollups from every cart item, reading `chunk_size` carts at a time.
+
+    Returns the number of carts read. Run it inside a transaction so readers never see a partial rollup.
+    """
+    for model in (ProductDailySales, ProductMonthlySales, DailySales):
+        model.objects.using(using).all().delete()
+
+    revenue = ExpressionWrapper(
+        F("quantity") * Coalesce("unit_price", "product__price"),
+        output_field=DecimalField(max_digits=14, decimal_places=2),
+    )
+    carts = 0
+    last_id = 0
+    while True:
+        ids = list(
+            Cart.objects.using(using).filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:chunk_size]
+        )
+        if not ids:
+            break
+
+        rows = (
+            CartItem.objects.using(using)
+            .filter(cart_id__gte=ids[0], cart_id__lte=ids[-1], product__isnull=False)
+            .annotate(day=TruncDate("cart__created_at"))
+            .values("day", "product_id")
+            .annotate(total_quantity=Sum("quantity"), total_revenue=Sum(revenue))
+            .values_list("day", "product_id", "total_quantity", "total_revenue")
+            .order_by()
+        )
+        # Days span chunks, so later chunks add to the rows earlier ones created.
+        _add(ProductDailySales, ("day", "product_id"), list(rows), using)
+        carts += len(ids)
+        last_id = ids[-1]
+
+    daily = ProductDailySales.objects.using(using)
+    monthly = (
+        daily.annotate(period=TruncMonth("day"))
+        .values("period", "product_id")
+        .annotate(total_quantity=Sum("quantity"), total_revenue=Sum("revenue"))
+        .values_list("period", "product_id", "total_quantity", "total_revenue")
+        .order_by()
+    )
+    _add(ProductMonthlySales, ("month", "product_id"), list(monthly), using)
+    totals = (
+        daily.values("day")
+        .annotate(total_quantity=Sum("quantity"), total_revenue=Sum("revenue"))
+        .values_list("day", "total_quantity", "total_revenue")
+        .order_by()
+    )
+    _add(DailySales, ("day",), list(totals), using)
+    return carts
+
+
+def parse_sales_range(start=None, end=None, default_days: int = 7):
+    """Inclusive (start, end) dates from ISO strings, defaulting to the last `default_days` days.
+
+    Returns (range, error_detail).
+    """
+    try:
+        end_day = date.fromisoformat(end) if end else timezone.localdate()
+        start_day = date.fromisoformat(start) if start else end_day - timedelta(days=default_days - 1)
+    except ValueError:
+        return None, "Invalid date range"
+    if start_day > end_day:
+        return None, "Invalid date range"
+    return (start_day, end_day), None
+
+
+def _next_month(day):
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def top_products(start, end, order_by: str = "quantity", limit: int = 10, using=None) -> list:
+    """(product_id, product_name, quantity, revenue) of the best selling products between two days.
+
+    Whole months come from ProductMonthlySales and only the days around them from
+    ProductDailySales, so any range reads at most two months of daily rows.
+    """
+    using = using or router.db_for_read(ProductDailySales)
+    ops = connections[using].ops
+    daily = ops.quote_name(ProductDailySales._meta.db_table)
+    monthly = ops.quote_name(ProductMonthlySales._meta.db_table)
+    products = ops.quote_name(ProductDailySales._meta.get_field("product").related_model._meta.db_table)
+
+    # [first_month, after_months) is the run of whole months inside the range, possibly empty.
+    first_month = start if start.day == 1 else _next_month(start)
+    after_months = (end + timedelta(days=1)).replace(day=1)
+    if first_month < after_months:
+        parts = [
+            f"SELECT product_id, quantity, revenue FROM {monthly} WHERE month >= %s AND month < %s",
+            f"SELECT product_id, quantity, revenue FROM {daily} WHERE day >= %s AND day < %s",
+            f"SELECT product_id, quantity, revenue FROM {daily} WHERE day >= %s AND day <= %s",
+        ]
+        params = [first_month, after_months, start, first_month, after_months, end]
+    else:
+        parts = [f"SELECT product_id, quantity, revenue FROM {daily} WHERE day >= %s AND day <= %s"]
+        params = [start, end]
+
+    # `order_by` is one of SALES_ORDERINGS, validated by the caller.
+    sql = (
+        f"SELECT sales.product_id, {products}.name, sales.quantity, sales.revenue FROM ("
+        f"SELECT product_id, SUM(quantity) AS quantity, SUM(revenue) AS revenue "
+        f"FROM ({' UNION ALL '.join(parts)}) AS parts "
+        f"GROUP BY product_id HAVING SUM(quantity) > 0 ORDER BY {order_by} DESC, product_id LIMIT %s"
+        f") AS sales JOIN {products} ON {products}.id = sales.product_id "
+        f"ORDER BY sales.{order_by} DESC, sales.product_id"
+    )
+    with connections[using].cursor() as cursor:
+        cursor.execute(sql, [ops.adapt_datefield_value(value) for value in params] + [limit])
+        return [
+            (product_id, name, quantity, Decimal(str(revenue)).quantize(CENTS))
+            for product_id, name, quantity, revenue in cursor.fetchall()
+        ]
+
+
+def sales_series(start, end, interval: str = "day", product_id=None):
+    """(period, quantity, revenue) per day, week or month between two days, for one product or all."""
+    if product_id is not None:
+        queryset = ProductDailySales.objects.filter(product_id=product_id, day__range=(start, end))
+    else:
+        queryset = DailySales.objects.filter(day__range=(start, end))
+    trunc = SALES_INTERVALS[interval]
+    return (
+        queryset.annotate(period=trunc("day") if trunc is not None else F("day"))
+        .values("period")
+        .annotate(total_quantity=Sum("quantity"), total_revenue=Sum("revenue"))
+        .order_by("period")
+        .values_list("period", "total_quantity", "total_revenue")
+    )
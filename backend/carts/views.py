@@ -1,62 +1,413 @@
+import base64
+import binascii
 import json
 from datetime import datetime
+from decimal import Decimal, InvalidOperation
 
-from django.db import transaction
-from django.http import JsonResponse
+from django.core.cache import cache
+from django.db.models import F, Q
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 
+from authentication.utils import aget_user
+from config.database import afetch, atomic_with_retry
+from config.encoders import EncodedJsonResponse, decimal_column, decimal_format, rows_as_objects
+from config.ratelimit import rate_limited
+from metrics.timing import record_serialization
+from products.lookup import lookup_products
 from products.models import Product
 
+from .export import EXPORT_FORMATS, export_rows, filter_carts, iter_export, parse_cart_filters
 from .models import Cart, CartItem
+from .sales import (
+    SALES_INTERVALS,
+    SALES_ORDERINGS,
+    parse_sales_range,
+    record_sales,
+    sales_day,
+    sales_series,
+    stored_sales,
+    top_products,
+)
+
+BULK_CHUNK_SIZE = 500
+TOTAL_MODES = ("exact", "cached", "none")
+CART_ORDERINGS = ("-created_at", "created_at", "-total", "total")
+TOTAL_CACHE_TIMEOUT = 60
+CART_ROW_FIELDS = ("id", "created_at", "total", "version")
+CART_OPERATIONS = ("add", "remove", "set")
+MAX_CART_LINES = 5000
+SALES_TOP_FIELDS = ("product_id", "product_name", "quantity", "revenue")
+SALES_SERIES_FIELDS = ("period", "quantity", "revenue")
+DEFAULT_SALES_LIMIT = 10
+MAX_SALES_LIMIT = 100
+
+
+def _serialize_item(item: CartItem) -> dict:
+    return {
+        "product_id": item.product_id,
+        "product_name": item.product_name,
+        "price": float(item.unit_price),
+        "quantity": item.quantity,
+    }
+
+
+def _serialize_cart(cart: Cart, items) -> dict:
+    """Payload for a cart just written, from the item snapshots built for it."""
+    return {
+        "id": cart.id,
+        "created_at": cart.created_at.isoformat(),
+        "items": [_serialize_item(item) for item in items],
+        "total": float(cart.total),
+        "version": cart.version,
+    }
+
+
+def _cart_items_query(rows, decimals: str):
+    return (
+        CartItem.objects.filter(cart_id__in=[row[0] for row in rows])
+        .order_by("id")
+        .values_list("cart_id", "product_id", "product_name", decimal_column("unit_price", decimals), "quantity")
+    )
 
 
-def _serialize_cart(cart: Cart) -> dict:
-    items = [
-        {
-            "product_id": item.product_id,
-            "product_name": item.product.name,
-            "price": float(item.product.price),
-            "quantity": item.quantity,
-        }
-        for item in cart.items.all()
-    ]
-    total = sum(item["price"] * item["quantity"] for item in items)
-    return {"id": cart.id, "created_at": cart.created_at.isoformat(), "items": items, "total": total}
+def _legacy_products_query(items, decimals: str):
+    """Products for items written before the snapshot columns existed and not yet backfilled."""
+    legacy_ids = {product_id for _cart_id, product_id, _name, price, _qty in items if price is None}
+    if not legacy_ids:
+        return None
+    return Product.objects.filter(id__in=legacy_ids).values_list("id", "name", decimal_column("price", decimals))
 
 
-def _parse_items(payload):
+def _serialize_cart_rows(rows, items, legacy_products) -> list:
+    """Build cart payloads from (id, created_at, total) tuples and their item tuples."""
+    carts = {
+        cart_id: {"id": cart_id, "created_at": created_at, "items": [], "total": total, "version": version}
+        for cart_id, created_at, total, version in rows
+    }
+    legacy = {product_id: (name, price) for product_id, name, price in legacy_products}
+
+    for cart_id, product_id, name, price, quantity in items:
+        if price is None:
+            name, price = legacy[product_id]
+        carts[cart_id]["items"].append(
+            {"product_id": product_id, "product_name": name, "price": price, "quantity": quantity}
+        )
+    return list(carts.values())
+
+
+def _snapshot_item(product_id, name: str, price, quantity: int) -> CartItem:
+    return CartItem(product_id=product_id, product_name=name, unit_price=price, quantity=quantity)
+
+
+def _item_sales(items) -> list:
+    return [(item.product_id, item.quantity, item.unit_price) for item in items]
+
+
+def _cart_totals(items) -> dict:
+    """Denormalized Cart columns for a list of unsaved CartItem snapshots."""
+    total = Decimal("0")
+    item_count = 0
+    for item in items:
+        total += item.unit_price * item.quantity
+        item_count += item.quantity
+    return {"total": total, "item_count": item_count, "line_count": len(items)}
+
+
+def _product_id(value):
+    """Product id as an int, or None for anything but a positive integer (or its string)."""
+    if isinstance(value, bool):
+        return None
+    try:
+        product_id = int(value)
+    except (TypeError, ValueError):
+        return None
+    return product_id if product_id > 0 and str(product_id) == str(value).strip() else None
+
+
+def _normalize_items(payload):
+    """Validate `items` into (product_id, quantity) pairs, one per product in first-seen order.
+
+    Repeated products are merged by adding their quantities.
+    """
     items = payload.get("items")
     if not isinstance(items, list) or not items:
-        return None, JsonResponse({"detail": "Items are required"}, status=400)
+        return None, "Items are required"
 
-    normalized = []
+    merged = {}
     for item in items:
         if not isinstance(item, dict):
-            return None, JsonResponse({"detail": "Invalid item format"}, status=400)
+            return None, "Invalid item format"
 
         product_id = item.get("product_id")
         quantity = item.get("quantity")
 
         if not product_id:
-            return None, JsonResponse({"detail": "Product id is required"}, status=400)
+            return None, "Product id is required"
+
+        product_id = _product_id(product_id)
+        if product_id is None:
+            return None, "Invalid product id"
 
         try:
             quantity_value = int(quantity)
         except (TypeError, ValueError):
-            return None, JsonResponse({"detail": "Quantity must be a number"}, status=400)
+            return None, "Quantity must be a number"
 
         if quantity_value <= 0:
-            return None, JsonResponse({"detail": "Quantity must be greater than 0"}, status=400)
+            return None, "Quantity must be greater than 0"
 
-        normalized.append((product_id, quantity_value))
+        merged[product_id] = merged.get(product_id, 0) + quantity_value
 
-    product_ids = [product_id for product_id, _qty in normalized]
-    products = {product.id: product for product in Product.objects.filter(id__in=product_ids)}
+    if len(merged) > MAX_CART_LINES:
+        return None, f"A cart can have at most {MAX_CART_LINES} products"
+    return list(merged.items()), None
 
+
+def _parse_items(payload):
+    """Validate the items of a cart write and resolve their products.
+
+    Returns ((normalized, products), error_response), products mapping id -> (name, price).
+    """
+    normalized, detail = _normalize_items(payload)
+    if detail:
+        return None, JsonResponse({"detail": detail}, status=400)
+
+    products, error = _load_products([product_id for product_id, _qty in normalized])
+    if error:
+        return None, error
+    return (normalized, products), None
+
+
+def _load_products(product_ids):
+    """{id: (name, price)} for distinct `product_ids`, or a 404 response when any does not exist."""
+    products = lookup_products(product_ids)
     if len(products) != len(product_ids):
         return None, JsonResponse({"detail": "One or more products not found"}, status=404)
+    return products, None
 
-    return (normalized, products), None
+
+def _normalize_operations(payload):
+    """Validate `operations` into (op, product_id, quantity) tuples, returning (operations, error_detail).
+
+    `add` increases a line (creating it), `set` replaces its quantity (0 removes it) and
+    `remove` drops it.
+    """
+    operations = payload.get("operations")
+    if not isinstance(operations, list) or not operations:
+        return None, "Operations are required"
+
+    normalized = []
+    for operation in operations:
+        if not isinstance(operation, dict) or operation.get("op") not in CART_OPERATIONS:
+            return None, "Invalid operation"
+
+        if not operation.get("product_id"):
+            return None, "Product id is required"
+        product_id = _product_id(operation["product_id"])
+        if product_id is None:
+            return None, "Invalid product id"
+
+        quantity = 0
+        if operation["op"] != "remove":
+            try:
+                quantity = int(operation.get("quantity"))
+            except (TypeError, ValueError):
+                return None, "Quantity must be a number"
+            if quantity < 0 or (quantity == 0 and operation["op"] == "add"):
+                return None, "Quantity must be greater than 0"
+
+        normalized.append((operation["op"], product_id, quantity))
+
+    return normalized, None
+
+
+def _diff_items(existing, target, products, keep_orphans: bool = False):
+    """Reconcile the cart's CartItem rows with `target` (product_id -> quantity, in display order).
+
+    Kept lines keep their price snapshot; lines written before snapshots existed get one
+    when touched. Lines of deleted products (no product_id) are kept first with
+    `keep_orphans`, and deleted otherwise. Returns (items, to_create, to_update, to_delete_ids).
+    """
+    current = {}
+    orphans = []
+    to_delete = []
+    for item in existing:
+        if item.product_id is None:
+            orphans.append(item)
+        elif item.product_id in current:
+            to_delete.append(item.id)
+        else:
+            current[item.product_id] = item
+
+    if not keep_orphans:
+        to_delete.extend(item.id for item in orphans)
+        orphans = []
+    items, to_create, to_update = list(orphans), [], []
+    for product_id, quantity in target.items():
+        item = current.pop(product_id, None)
+        if item is None:
+            item = _snapshot_item(product_id, *products[product_id], quantity)
+            to_create.append(item)
+        elif item.quantity != quantity or item.unit_price is None:
+            if item.unit_price is None:
+                item.product_name, item.unit_price = item.current_name, item.current_price
+            item.quantity = quantity
+            to_update.append(item)
+        items.append(item)
+
+    to_delete.extend(item.id for item in current.values())
+    return items, to_create, to_update, to_delete
+
+
+def _encode_cursor(order_by: str, value, cart_id: int) -> str:
+    raw = json.dumps([order_by, str(value) if order_by.endswith("total") else value.isoformat(), cart_id])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str, order_by: str):
+    try:
+        cursor_order, value, cart_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        value = Decimal(value) if order_by.endswith("total") else datetime.fromisoformat(value)
+    except (ValueError, TypeError, InvalidOperation, binascii.Error):
+        return None
+
+    if cursor_order != order_by or not isinstance(cart_id, int):
+        return None
+    # Decimal accepts NaN and Infinity, which the keyset filter cannot compare.
+    if isinstance(value, Decimal) and not value.is_finite():
+        return None
+    return value, cart_id
+
+
+def _cart_filters(request):
+    params = request.GET
+    return parse_cart_filters(
+        params.get("product_id"), params.get("from"), params.get("to"), params.get("min_total"), params.get("max_total")
+    )
+
+
+def _total_cache_key(filters) -> str:
+    return "carts:total:" + ":".join(str(value) for value in filters.values())
+
+
+def _carts_total(queryset, mode: str, filters):
+    if mode == "none":
+        return None
+    if mode == "cached":
+        return cache.get_or_set(_total_cache_key(filters), queryset.count, TOTAL_CACHE_TIMEOUT)
+    return queryset.count()
+
+
+async def _acarts_total(queryset, mode: str, filters):
+    if mode == "none":
+        return None
+    if mode == "cached":
+        key = _total_cache_key(filters)
+        total = await cache.aget(key)
+        if total is None:
+            total = await queryset.acount()
+            await cache.aset(key, total, TOTAL_CACHE_TIMEOUT)
+        return total
+    return await queryset.acount()
+
+
+def _carts_query(request):
+    """Parse the carts_list parameters, returning (plan, error_response).
+
+    The plan holds the filtered queryset to count and the ordered, sliced row queryset.
+    """
+    try:
+        page = int(request.GET.get("page", 1))
+        page_size = int(request.GET.get("page_size", 10))
+    except ValueError:
+        return None, JsonResponse({"detail": "Invalid pagination values"}, status=400)
+
+    if page < 1 or page_size < 1:
+        return None, JsonResponse({"detail": "Invalid pagination values"}, status=400)
+
+    total_mode = request.GET.get("total", "exact")
+    if total_mode not in TOTAL_MODES:
+        return None, JsonResponse({"detail": "Invalid total mode"}, status=400)
+
+    order_by = request.GET.get("order_by", "-created_at")
+    if order_by not in CART_ORDERINGS:
+        return None, JsonResponse({"detail": "Invalid order"}, status=400)
+
+    decimals = decimal_format(request)
+    if not decimals:
+        return None, JsonResponse({"detail": "Invalid decimals format"}, status=400)
+
+    filters, detail = _cart_filters(request)
+    if detail:
+        return None, JsonResponse({"detail": detail}, status=400)
+
+    queryset = filter_carts(Cart.objects.all(), filters)
+    field = order_by.lstrip("-")
+    descending = order_by.startswith("-")
+    ordered = queryset.order_by(order_by, "-id" if descending else "id").values_list(
+        "id", "created_at", decimal_column("total", decimals), "version"
+    )
+    plan = {
+        "queryset": queryset,
+        "filters": filters,
+        "total_mode": total_mode,
+        "order_by": order_by,
+        "decimals": decimals,
+        "page_size": page_size,
+        "page": None,
+    }
+
+    if "page" in request.GET:
+        offset = (page - 1) * page_size
+        plan.update(page=page, rows=ordered[offset : offset + page_size])
+        return plan, None
+
+    cursor = request.GET.get("cursor")
+    if cursor:
+        position = _decode_cursor(cursor, order_by)
+        if not position:
+            return None, JsonResponse({"detail": "Invalid cursor"}, status=400)
+        value, cart_id = position
+        after = "lt" if descending else "gt"
+        ordered = ordered.filter(
+            Q(**{f"{field}__{after}": value}) | Q(**{field: value, f"id__{after}": cart_id})
+        )
+
+    plan["rows"] = ordered[: page_size + 1]
+    return plan, None
+
+
+def _carts_response(plan, rows, items, legacy_products, total):
+    page_size, decimals = plan["page_size"], plan["decimals"]
+    if plan["page"] is not None:
+        with record_serialization():
+            return EncodedJsonResponse(
+                {
+                    "page": plan["page"],
+                    "page_size": page_size,
+                    "total": total,
+                    "results": _serialize_cart_rows(rows, items, legacy_products),
+                },
+                decimals,
+            )
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = dict(zip(CART_ROW_FIELDS, rows[-1]))
+        next_cursor = _encode_cursor(plan["order_by"], last[plan["order_by"].lstrip("-")], last["id"])
+
+    with record_serialization():
+        return EncodedJsonResponse(
+            {
+                "page_size": page_size,
+                "next_cursor": next_cursor,
+                "total": total,
+                "results": _serialize_cart_rows(rows, items, legacy_products),
+            },
+            decimals,
+        )
 
 
 def carts_list(request):
@@ -66,47 +417,123 @@ def carts_list(request):
     if not request.user.is_authenticated:
         return JsonResponse({"detail": "Not authenticated"}, status=401)
 
-    page = int(request.GET.get("page", 1))
-    page_size = int(request.GET.get("page_size", 10))
-    product_id = request.GET.get("product_id")
-    from_date = request.GET.get("from")
-    to_date = request.GET.get("to")
+    plan, error = _carts_query(request)
+    if error:
+        return error
 
-    if page < 1 or page_size < 1:
-        return JsonResponse({"detail": "Invalid pagination values"}, status=400)
+    total = _carts_total(plan["queryset"], plan["total_mode"], plan["filters"])
+    rows = list(plan["rows"])
+    items = list(_cart_items_query(rows[: plan["page_size"]], plan["decimals"]))
+    legacy_query = _legacy_products_query(items, plan["decimals"])
+    legacy_products = list(legacy_query) if legacy_query is not None else []
+    return _carts_response(plan, rows, items, legacy_products, total)
 
-    queryset = Cart.objects.all().prefetch_related("items__product").order_by("-created_at")
 
-    if product_id:
-        queryset = queryset.filter(items__product_id=product_id).distinct()
+async def carts_list_async(request):
+    if request.method != "GET":
+        return JsonResponse({"detail": "Method not allowed"}, status=405)
 
-    if from_date:
-        try:
-            queryset = queryset.filter(created_at__gte=datetime.fromisoformat(from_date))
-        except ValueError:
-            return JsonResponse({"detail": "Invalid from date"}, status=400)
+    user = await aget_user(request)
+    if not user.is_authenticated:
+        return JsonResponse({"detail": "Not authenticated"}, status=401)
+
+    plan, error = _carts_query(request)
+    if error:
+        return error
+
+    total = await _acarts_total(plan["queryset"], plan["total_mode"], plan["filters"])
+    rows = await afetch(plan["rows"])
+    items = await afetch(_cart_items_query(rows[: plan["page_size"]], plan["decimals"]))
+    legacy_query = _legacy_products_query(items, plan["decimals"])
+    legacy_products = await afetch(legacy_query) if legacy_query is not None else []
+    return _carts_response(plan, rows, items, legacy_products, total)
 
-    if to_date:
-        try:
-            queryset = queryset.filter(created_at__lte=datetime.fromisoformat(to_date))
-        except ValueError:
-            return JsonResponse({"detail": "Invalid to date"}, status=400)
-
-    total = queryset.count()
-    offset = (page - 1) * page_size
-    carts = queryset[offset : offset + page_size]
-
-    return JsonResponse(
-        {
-            "page": page,
-            "page_size": page_size,
-            "total": total,
-            "results": [_serialize_cart(cart) for cart in carts],
-        }
-    )
+
+def carts_export(request):
+    if request.method != "GET":
+        return JsonResponse({"detail": "Method not allowed"}, status=405)
+
+    if not request.user.is_authenticated:
+        return JsonResponse({"detail": "Not authenticated"}, status=401)
+
+    export_format = request.GET.get("format", "csv")
+    if export_format not in EXPORT_FORMATS:
+        return JsonResponse({"detail": "Invalid export format"}, status=400)
+
+    filters, detail = _cart_filters(request)
+    if detail:
+        return JsonResponse({"detail": detail}, status=400)
+
+    content_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    response = StreamingHttpResponse(iter_export(export_format, export_rows(filters)), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="carts.{export_format}"'
+    return response
+
+
+def _sales_request(request, default_days: int):
+    """Shared checks of the staff sales endpoints, returning ((range, decimals), error_response)."""
+    if request.method != "GET":
+        return None, JsonResponse({"detail": "Method not allowed"}, status=405)
+
+    if not request.user.is_authenticated or not request.user.is_staff:
+        return None, JsonResponse({"detail": "Not authorized"}, status=403)
+
+    sales_range, detail = parse_sales_range(request.GET.get("from"), request.GET.get("to"), default_days)
+    if detail:
+        return None, JsonResponse({"detail": detail}, status=400)
+
+    decimals = decimal_format(request)
+    if decimals is None:
+        return None, JsonResponse({"detail": "Invalid decimals format"}, status=400)
+    return (sales_range, decimals), None
+
+
+def sales_top(request):
+    """Best selling products over a day range, read from the daily sales rollup."""
+    parsed, error = _sales_request(request, default_days=7)
+    if error:
+        return error
+    (start, end), decimals = parsed
+
+    order_by = request.GET.get("order_by", "quantity")
+    if order_by not in SALES_ORDERINGS:
+        return JsonResponse({"detail": "Invalid order_by"}, status=400)
+
+    try:
+        limit = int(request.GET.get("limit", DEFAULT_SALES_LIMIT))
+    except ValueError:
+        return JsonResponse({"detail": "Invalid limit"}, status=400)
+    if not 1 <= limit <= MAX_SALES_LIMIT:
+        return JsonResponse({"detail": "Invalid limit"}, status=400)
+
+    results = rows_as_objects(SALES_TOP_FIELDS, top_products(start, end, order_by, limit))
+    return EncodedJsonResponse({"from": start, "to": end, "results": results}, decimals)
+
+
+def sales_daily(request):
+    """Quantity and revenue per day, week or month, for the whole catalog or one product."""
+    parsed, error = _sales_request(request, default_days=30)
+    if error:
+        return error
+    (start, end), decimals = parsed
+
+    interval = request.GET.get("interval", "day")
+    if interval not in SALES_INTERVALS:
+        return JsonResponse({"detail": "Invalid interval"}, status=400)
+
+    product_id = request.GET.get("product_id") or None
+    if product_id is not None:
+        # isdigit() accepts characters such as "²" that int() rejects.
+        if not (product_id.isascii() and product_id.isdigit()):
+            return JsonResponse({"detail": "Invalid product id"}, status=400)
+        product_id = int(product_id)
+
+    results = rows_as_objects(SALES_SERIES_FIELDS, sales_series(start, end, interval, product_id))
+    return EncodedJsonResponse({"from": start, "to": end, "interval": interval, "results": results}, decimals)
 
 
 @csrf_exempt
+@rate_limited("cart_write")
 def cart_create(request):
     if request.method != "POST":
         return JsonResponse({"detail": "Method not allowed"}, status=405)
@@ -124,20 +551,26 @@ def cart_create(request):
         return error
 
     normalized, products = parsed
+    items = [
+        _snapshot_item(product_id, *products[product_id], quantity)
+        for product_id, quantity in normalized
+    ]
 
-    with transaction.atomic():
-        cart = Cart.objects.create()
-        CartItem.objects.bulk_create(
-            [
-                CartItem(cart=cart, product=products[product_id], quantity=quantity)
-                for product_id, quantity in normalized
-            ]
-        )
+    def write():
+        cart = Cart.objects.create(**_cart_totals(items))
+        for item in items:
+            item.cart = cart
+        CartItem.objects.bulk_create(items)
+        record_sales(sales_day(cart.created_at), added=_item_sales(items))
+        return cart
+
+    cart = atomic_with_retry(write)
 
-    return JsonResponse(_serialize_cart(cart), status=201)
+    return JsonResponse(_serialize_cart(cart, items), status=201)
 
 
 @csrf_exempt
+@rate_limited("cart_write")
 def cart_update(request):
     if request.method != "POST":
         return JsonResponse({"detail": "Method not allowed"}, status=405)
@@ -154,30 +587,105 @@ def cart_update(request):
     if not cart_id:
         return JsonResponse({"detail": "Cart id is required"}, status=400)
 
+    version = payload.get("version")
+    if version is not None and (isinstance(version, bool) or not isinstance(version, int)):
+        return JsonResponse({"detail": "Invalid version"}, status=400)
+
     cart = Cart.objects.filter(id=cart_id).first()
     if not cart:
         return JsonResponse({"detail": "Cart not found"}, status=404)
 
-    parsed, error = _parse_items(payload)
-    if error:
-        return error
-
-    normalized, products = parsed
-
-    with transaction.atomic():
-        CartItem.objects.filter(cart=cart).delete()
-        CartItem.objects.bulk_create(
-            [
-                CartItem(cart=cart, product=products[product_id], quantity=quantity)
-                for product_id, quantity in normalized
-            ]
+    if "operations" in payload:
+        operations, detail = _normalize_operations(payload)
+        if detail:
+            return JsonResponse({"detail": detail}, status=400)
+        # Removals, including set to 0, never need the product to exist.
+        added_ids = {product_id for op, product_id, quantity in operations if op != "remove" and quantity}
+        products, error = _load_products(list(added_ids))
+        if error:
+            return error
+        replacement = None
+    else:
+        parsed, error = _parse_items(payload)
+        if error:
+            return error
+        replacement, products = parsed
+
+    # Without an explicit version, the one read above still guards against writes landing in between.
+    expected_version = cart.version if version is None else version
+
+    def write():
+        existing = list(
+            CartItem.objects.filter(cart=cart)
+            .annotate(current_name=F("product__name"), current_price=F("product__price"))
+            .order_by("id")
         )
-
-    cart.refresh_from_db()
-    return JsonResponse(_serialize_cart(cart))
+        previous = [
+            (item.product_id, item.quantity, item.current_price if item.unit_price is None else item.unit_price)
+            for item in existing
+        ]
+        if replacement is not None:
+            target = {}
+            for product_id, quantity in replacement:
+                target[product_id] = target.get(product_id, 0) + quantity
+        else:
+            target = {}
+            for item in existing:
+                if item.product_id is not None:
+                    target[item.product_id] = target.get(item.product_id, 0) + item.quantity
+            for op, product_id, quantity in operations:
+                if op == "add":
+                    target[product_id] = target.get(product_id, 0) + quantity
+                elif op == "set" and quantity:
+                    target[product_id] = quantity
+                else:
+                    target.pop(product_id, None)
+
+        items, to_create, to_update, to_delete = _diff_items(
+            existing, target, products, keep_orphans=replacement is None
+        )
+        if not items:
+            return JsonResponse({"detail": "Items are required"}, status=400)
+
+        totals = _cart_totals(items)
+        if not (to_create or to_update or to_delete):
+            # Nothing changes, so the version is kept and concurrent edits are not turned into conflicts.
+            for field, value in totals.items():
+                setattr(cart, field, value)
+            cart.version = Cart.objects.filter(id=cart.id).values_list("version", flat=True).first()
+            return items
+
+        updated = Cart.objects.filter(id=cart.id, version=expected_version).update(
+            **totals, version=F("version") + 1
+        )
+        if not updated:
+            current = Cart.objects.filter(id=cart.id).values_list("version", flat=True).first()
+            return JsonResponse({"detail": "Cart was modified by another request", "version": current}, status=409)
+
+        if to_delete:
+            CartItem.objects.filter(id__in=to_delete).delete()
+        if to_update:
+            CartItem.objects.bulk_update(to_update, ["quantity", "product_name", "unit_price"])
+        if to_create:
+            for item in to_create:
+                item.cart = cart
+            CartItem.objects.bulk_create(to_create)
+        record_sales(sales_day(cart.created_at), added=_item_sales(items), removed=previous)
+
+        for field, value in totals.items():
+            setattr(cart, field, value)
+        cart.version = expected_version + 1
+        return items
+
+    # write() answers conflicts and emptied carts itself, before touching any item.
+    result = atomic_with_retry(write)
+    if isinstance(result, JsonResponse):
+        return result
+    return JsonResponse(_serialize_cart(cart, result))
 
 
 @csrf_exempt
+@rate_limited("cart_write")
 def cart_delete(request):
     if request.method != "POST":
         return JsonResponse({"detail": "Method not allowed"}, status=405)
@@ -194,8 +702,110 @@ def cart_delete(request):
     if not cart_id:
         return JsonResponse({"detail": "Cart id is required"}, status=400)
 
-    deleted, _ = Cart.objects.filter(id=cart_id).delete()
-    if not deleted:
+    def write():
+        created_at = Cart.objects.filter(id=cart_id).values_list("created_at", flat=True).first()
+        if created_at is None:
+            return False
+        previous = list(stored_sales(CartItem.objects.filter(cart_id=cart_id)))
+        Cart.objects.filter(id=cart_id).delete()
+        record_sales(sales_day(created_at), removed=previous)
+        return True
+
+    if not atomic_with_retry(write):
         return JsonResponse({"detail": "Cart not found"}, status=404)
 
     return JsonResponse({"detail": "Cart deleted"})
+
+
+def _ingest_chunk(chunk):
+    """Store a chunk of (line_number, raw_line) carts and return one result per line."""
+    results = []
+    pending = []
+    for line_number, raw in chunk:
+        try:
+            payload = json.loads(raw)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            payload = None
+
+        if not isinstance(payload, dict):
+            results.append({"line": line_number, "status": 400, "detail": "Invalid JSON payload"})
+            continue
+
+        normalized, detail = _normalize_items(payload)
+        if detail:
+            results.append({"line": line_number, "status": 400, "detail": detail})
+            continue
+
+        result = {"line": line_number, "status": 201}
+        results.append(result)
+        pending.append((result, normalized))
+
+    product_ids = {product_id for _result, normalized in pending for product_id, _qty in normalized}
+    products = lookup_products(list(product_ids))
+
+    valid = []
+    for result, normalized in pending:
+        if all(product_id in products for product_id, _qty in normalized):
+            items = [_snapshot_item(product_id, *products[product_id], quantity) for product_id, quantity in normalized]
+            valid.append((result, items))
+        else:
+            result.update(status=404, detail="One or more products not found")
+
+    def write():
+        carts = Cart.objects.bulk_create([Cart(**_cart_totals(items)) for _result, items in valid])
+        for cart, (result, items) in zip(carts, valid):
+            result["id"] = cart.id
+            for item in items:
+                item.cart_id = cart.id
+        CartItem.objects.bulk_create(
+            [item for _result, items in valid for item in items], batch_size=BULK_CHUNK_SIZE
+        )
+        by_day = {}
+        for cart, (_result, items) in zip(carts, valid):
+            by_day.setdefault(sales_day(cart.created_at), []).extend(_item_sales(items))
+        for day, sold in by_day.items():
+            record_sales(day, added=sold)
+
+    if valid:
+        atomic_with_retry(write)
+
+    return results
+
+
+def _stream_bulk_results(lines, chunk_size):
+    chunk = []
+    for line_number, raw in enumerate(lines, start=1):
+        if not raw.strip():
+            continue
+        chunk.append((line_number, raw))
+        if len(chunk) >= chunk_size:
+            for result in _ingest_chunk(chunk):
+                yield json.dumps(result) + "\n"
+            chunk = []
+
+    if chunk:
+        for result in _ingest_chunk(chunk):
+            yield json.dumps(result) + "\n"
+
+
+@csrf_exempt
+@rate_limited("cart_write")
+def cart_bulk_create(request):
+    """Create carts from an NDJSON body (one cart payload per line), streaming per-line results."""
+    if request.method != "POST":
+        return JsonResponse({"detail": "Method not allowed"}, status=405)
+
+    if not request.user.is_authenticated:
+        return JsonResponse({"detail": "Not authenticated"}, status=401)
+
+    try:
+        chunk_size = min(int(request.GET.get("chunk_size", BULK_CHUNK_SIZE)), BULK_CHUNK_SIZE * 10)
+    except ValueError:
+        return JsonResponse({"detail": "Invalid chunk size"}, status=400)
+
+    if chunk_size < 1:
+        return JsonResponse({"detail": "Invalid chunk size"}, status=400)
+
+    return StreamingHttpResponse(
+        _stream_bulk_results(request, chunk_size), content_type="application/x-ndjson"
+    )
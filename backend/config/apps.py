@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class ProjectConfig(AppConfig):
+    name = "config"
+    verbose_name = "Project"
+
+    def ready(self):
+        from . import database  # noqa: F401
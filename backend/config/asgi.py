@@ -3,5 +3,6 @@
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+os.environ.setdefault("DJANGO_ROOT_URLCONF", "config.urls_asgi")
 
 application = get_asgi_application()
@@ -0,0 +1,147 @@
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # optional dependency, gzip is always available
+    brotli = None
+
+DEFAULT_MIN_BYTES = 1024
+
+
+def _accepted_codings(header: str) -> dict:
+    """Parse Accept-Encoding into {coding: q}."""
+    codings = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding.strip().lower()] = q
+    return codings
+
+
+def negotiate_encoding(header: str, available=("br", "gzip")):
+    """Pick the best coding the client accepts, preferring earlier entries of `available` on ties."""
+    codings = _accepted_codings(header)
+    best, best_q = None, 0.0
+    for coding in available:
+        q = codings.get(coding, codings.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def stream(self, chunks):
+        # wbits=31 writes the gzip header and trailer around the deflate stream.
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+class _Brotli:
+    def __init__(self, quality: int):
+        self.quality = quality
+
+    def compress(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=self.quality)
+
+    def stream(self, chunks):
+        compressor = brotli.Compressor(quality=self.quality)
+        for chunk in chunks:
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Negotiated gzip/Brotli compression for responses above `COMPRESSION["MIN_BYTES"]`.
+
+    Brotli is offered only when the `brotli` package is installed. Streaming responses
+    are compressed chunk by chunk; bodies with a strong ETag keep their compressed form
+    in a small LRU so catalog cache hits are not recompressed on every request.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        config = getattr(settings, "COMPRESSION", {})
+        self.enabled = config.get("ENABLED", True)
+        self.min_bytes = config.get("MIN_BYTES", DEFAULT_MIN_BYTES)
+        self.codecs = {"gzip": _Gzip(config.get("GZIP_LEVEL", 6))}
+        if brotli is not None and config.get("BROTLI", True):
+            self.codecs = {"br": _Brotli(config.get("BROTLI_QUALITY", 4)), **self.codecs}
+        self.cache_entries = config.get("CACHE_ENTRIES", 64)
+        self._compressed = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _compress(self, coding: str, body: bytes, etag: str) -> bytes:
+        if not etag or etag.startswith("W/") or not self.cache_entries:
+            return self.codecs[coding].compress(body)
+
+        key = (coding, etag)
+        with self._lock:
+            compressed = self._compressed.get(key)
+            if compressed is not None:
+                self._compressed.move_to_end(key)
+                return compressed
+
+        compressed = self.codecs[coding].compress(body)
+        with self._lock:
+            self._compressed[key] = compressed
+            while len(self._compressed) > self.cache_entries:
+                self._compressed.popitem(last=False)
+        return compressed
+
+    def process_response(self, request, response):
+        if not self.enabled or response.has_header("Content-Encoding"):
+            return response
+        if response.streaming and response.is_async:
+            return response
+        if not response.streaming and len(response.content) < self.min_bytes:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        coding = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""), tuple(self.codecs))
+        if coding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = self.codecs[coding].stream(response.streaming_content)
+            del response.headers["Content-Length"]
+        else:
+            compressed = self._compress(coding, response.content, response.get("ETag", ""))
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # A strong ETag names the identity body; the encoded body only matches weakly.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = coding
+        return response
@@ -0,0 +1,63 @@
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import OperationalError, connections, transaction
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """Run the configured `SQLITE_PRAGMAS` on every new SQLite connection."""
+    if connection.vendor != "sqlite":
+        return
+
+    pragmas = getattr(settings, "SQLITE_PRAGMAS", {})
+    if not pragmas:
+        return
+
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def _is_locked(error: OperationalError) -> bool:
+    message = str(error).lower()
+    return "database is locked" in message or "database is busy" in message
+
+
+def atomic_with_retry(func, using: str = "default"):
+    """Run `func` in transaction.atomic(), retrying when SQLite reports a lock.
+
+    Inside an outer transaction the write cannot be replayed on its own, so it runs once.
+    """
+    config = getattr(settings, "DATABASE_WRITE_RETRIES", {})
+    attempts = max(1, config.get("ATTEMPTS", 1))
+    backoff = config.get("BACKOFF", 0.05)
+
+    if connections[using].in_atomic_block:
+        with transaction.atomic(using=using):
+            return func()
+
+    for attempt in range(1, attempts + 1):
+        try:
+            with transaction.atomic(using=using):
+                return func()
+        except OperationalError as error:
+            if attempt == attempts or not _is_locked(error):
+                raise
+            logger.warning("Database locked, retrying write (attempt %d/%d)", attempt, attempts)
+            time.sleep(backoff * 2 ** (attempt - 1))
+
+
+async def afetch(queryset) -> list:
+    """Evaluate a queryset from async code in one thread hop.
+
+    Django 4.2's aiterator() runs values_list() queries on the event loop thread and
+    raises SynchronousOnlyOperation, so list views fetch their rows through this.
+    """
+    return await sync_to_async(list)(queryset)
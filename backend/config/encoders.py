@@ -0,0 +1,73 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import repeat
+
+from django.conf import settings
+from django.db.models import FloatField
+from django.db.models.functions import Cast
+from django.http import HttpResponse
+
+try:
+    import orjson
+except ImportError:  # optional dependency, stdlib json is the fallback
+    orjson = None
+
+DECIMAL_FORMATS = ("float", "string")
+
+
+def _config() -> dict:
+    return getattr(settings, "JSON_RESPONSES", {})
+
+
+def decimal_format(request):
+    """Return the `decimals` query parameter or the configured default, or None when invalid."""
+    value = request.GET.get("decimals") or _config().get("DECIMAL_FORMAT", "float")
+    return value if value in DECIMAL_FORMATS else None
+
+
+def _default(decimals: str):
+    convert = str if decimals == "string" else float
+
+    def default(value):
+        if isinstance(value, Decimal):
+            return convert(value)
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    return default
+
+
+def dumps(data, decimals: str = "float") -> bytes:
+    """Encode with orjson when installed (and `JSON_RESPONSES["BACKEND"]` allows it), else stdlib json.
+
+    Decimals become floats, or exact strings with `decimals="string"`.
+    """
+    if orjson is not None and _config().get("BACKEND", "auto") != "stdlib":
+        return orjson.dumps(data, default=_default(decimals))
+    return json.dumps(data, default=_default(decimals), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def decimal_column(field: str, decimals: str):
+    """values_list() column for a DecimalField: with the float format the database returns
+    floats directly, skipping the per-row Decimal conversion."""
+    return Cast(field, FloatField()) if decimals == "float" else field
+
+
+def rows_as_objects(fields, rows) -> list:
+    """One dict per values_list() tuple, keyed by `fields`.
+
+    Responses are JSON objects, so each row needs a mapping for the encoder; map() and zip()
+    build them without a Python-level loop. Columns past `fields` (such as the name and id
+    selected only for the cursor) are left out, because zip() stops at the shorter side.
+    """
+    return list(map(dict, map(zip, repeat(fields), rows)))
+
+
+class EncodedJsonResponse(HttpResponse):
+    """JsonResponse counterpart that encodes through `dumps`."""
+
+    def __init__(self, data, decimals: str = "float", **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=dumps(data, decimals), **kwargs)
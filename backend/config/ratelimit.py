@@ -0,0 +1,134 @@
+"""Token-bucket rate limiting for login attempts and cart writes.
+
+Each rule in `RATE_LIMITS["RULES"]` is a bucket of CAPACITY tokens that refills
+completely every PER_SECONDS; a request takes one token or is rejected with 429 and
+Retry-After. Buckets live in process memory ("local", bounded LRU) or in a Django cache
+alias ("cache", shared across processes; concurrent requests can race between the read
+and the write, so a burst may slightly exceed the limit).
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import JsonResponse
+
+DEFAULT_MAX_KEYS = 100_000
+
+
+class LocalBuckets:
+    """Process-local buckets, evicting the least recently used key beyond `max_keys`."""
+
+    def __init__(self, max_keys: int = DEFAULT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: int, per_seconds: float, now: float) -> float:
+        """Take a token, returning 0 or the seconds until one is available."""
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens, wait = _refill_and_take(tokens, updated, capacity, per_seconds, now)
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+
+class CacheBuckets:
+    """Buckets stored in a Django cache alias, so every process shares them."""
+
+    def __init__(self, alias: str = "default"):
+        self.cache = caches[alias]
+
+    def take(self, key: str, capacity: int, per_seconds: float, now: float) -> float:
+        cache_key = f"ratelimit:{key}"
+        tokens, updated = self.cache.get(cache_key, (capacity, now))
+        tokens, wait = _refill_and_take(tokens, updated, capacity, per_seconds, now)
+        # A bucket idle for PER_SECONDS is full again, so it can expire.
+        self.cache.set(cache_key, (tokens, now), timeout=int(per_seconds) + 1)
+        return wait
+
+
+def _refill_and_take(tokens: float, updated: float, capacity: int, per_seconds: float, now: float):
+    rate = capacity / per_seconds
+    tokens = min(capacity, tokens + (now - updated) * rate)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / rate
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def _config() -> dict:
+    return getattr(settings, "RATE_LIMITS", {})
+
+
+def get_rate_limit_storage():
+    global _storage
+
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                config = _config()
+                if config.get("BACKEND", "local") == "cache":
+                    _storage = CacheBuckets(config.get("ALIAS", "default"))
+                else:
+                    _storage = LocalBuckets(config.get("MAX_KEYS", DEFAULT_MAX_KEYS))
+    return _storage
+
+
+def reset_rate_limits() -> None:
+    global _storage
+    _storage = None
+
+
+def check_rate(rule: str, key: str) -> float:
+    """Take a token from `rule`'s bucket for `key`: 0 when allowed, else seconds to wait.
+
+    Unknown rules and `RATE_LIMITS["ENABLED"] = False` always allow.
+    """
+    config = _config()
+    limit = config.get("RULES", {}).get(rule)
+    if not config.get("ENABLED", True) or limit is None:
+        return 0.0
+    return get_rate_limit_storage().take(f"{rule}:{key}", limit["CAPACITY"], limit["PER_SECONDS"], time.time())
+
+
+def client_ip(request) -> str:
+    # Behind a reverse proxy, REMOTE_ADDR must be set from the proxy header upstream.
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def too_many_requests(wait: float):
+    response = JsonResponse({"detail": "Too many requests"}, status=429)
+    response["Retry-After"] = str(max(1, math.ceil(wait)))
+    return response
+
+
+def _user_or_ip(request) -> str:
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return f"user:{user.pk}"
+    return f"ip:{client_ip(request)}"
+
+
+def rate_limited(rule: str, key=_user_or_ip):
+    """Reject requests with 429 once `key(request)` exhausts `rule`; by default per user, or per IP."""
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            wait = check_rate(rule, key(request))
+            if wait:
+                return too_many_requests(wait)
+            return view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
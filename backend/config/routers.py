@@ -0,0 +1,79 @@
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_pinned = ContextVar("database_pinned_to_primary", default=False)
+
+
+def pin_to_primary() -> None:
+    """Send every later read in the current request to the primary."""
+    _pinned.set(True)
+
+
+def read_replicas() -> list:
+    return list(getattr(settings, "DATABASE_READ_REPLICAS", []))
+
+
+def _primary_only(model) -> bool:
+    return model._meta.app_label in getattr(settings, "DATABASE_PRIMARY_ONLY_APPS", ())
+
+
+class ReadReplicaRouter:
+    """Spread reads across `DATABASE_READ_REPLICAS`; writes and read-after-write use the primary.
+
+    Once a request writes, or while a transaction is open on the primary, its reads
+    stay on the primary so they never observe replication lag. Apps listed in
+    `DATABASE_PRIMARY_ONLY_APPS` always read from the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+
+        replicas = read_replicas()
+        if not replicas or _pinned.get() or _primary_only(model) or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *read_replicas()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+
+class ReadReplicaMiddleware:
+    """Scope the primary pin from ReadReplicaRouter to a single request."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = _pinned.set(False)
+        try:
+            return self.get_response(request)
+        finally:
+            _pinned.reset(token)
+
+    async def __acall__(self, request):
+        token = _pinned.set(False)
+        try:
+            return await self.get_response(request)
+        finally:
+            _pinned.reset(token)
@@ -1,4 +1,5 @@
-﻿from pathlib import Path
+﻿import os
+from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -8,6 +9,8 @@ ALLOWED_HOSTS = []
 
 INSTALLED_APPS = [
     "corsheaders",
+    "config.apps.ProjectConfig",
+    "authentication",
     "carts",
     "products",
     "django.contrib.admin",
@@ -19,7 +22,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "metrics.middleware.PerformanceMiddleware",
+    "metrics.querylog.QueryInspectionMiddleware",
+    "config.routers.ReadReplicaMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "config.compression.CompressionMiddleware",
+    "django.middleware.http.ConditionalGetMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -29,7 +37,8 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
-ROOT_URLCONF = "config.urls"
+# config/asgi.py switches to config.urls_asgi, which serves the async read views.
+ROOT_URLCONF = os.environ.get("DJANGO_ROOT_URLCONF", "config.urls")
 
 TEMPLATES = [
     {
@@ -52,10 +61,49 @@ WSGI_APPLICATION = "config.wsgi.application"
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": os.environ.get("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
     }
 }
 
+# DATABASE_PROFILE=production tunes SQLite for concurrent writers: WAL journal,
+# persistent connections with health checks, a busy timeout and bounded retries
+# for "database is locked" around cart writes.
+DATABASE_PROFILE = os.environ.get("DATABASE_PROFILE", "development")
+SQLITE_PRAGMAS = {}
+DATABASE_WRITE_RETRIES = {"ATTEMPTS": 1, "BACKOFF": 0.05}
+
+if DATABASE_PROFILE == "production":
+    DATABASES["default"].update(
+        {
+            "CONN_MAX_AGE": int(os.environ.get("DATABASE_CONN_MAX_AGE", "600")),
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {"timeout": float(os.environ.get("SQLITE_BUSY_TIMEOUT", "5"))},
+        }
+    )
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": int(float(os.environ.get("SQLITE_BUSY_TIMEOUT", "5")) * 1000),
+        "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+        "cache_size": int(os.environ.get("SQLITE_CACHE_SIZE", "-65536")),
+        "temp_store": "MEMORY",
+    }
+    DATABASE_WRITE_RETRIES = {"ATTEMPTS": 5, "BACKOFF": 0.05}
+
+# DATABASE_REPLICAS is a comma separated list of SQLite files kept in sync with the
+# primary; each becomes a read alias (replica_1, replica_2, ...). Tests mirror them
+# onto the default test database.
+DATABASE_READ_REPLICAS = []
+for index, path in enumerate(filter(None, os.environ.get("DATABASE_REPLICAS", "").split(",")), start=1):
+    alias = f"replica_{index}"
+    DATABASES[alias] = {**DATABASES["default"], "NAME": path.strip(), "TEST": {"MIRROR": "default"}}
+    DATABASE_READ_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["config.routers.ReadReplicaRouter"]
+# A session written at login is read by the very next request, so auth and
+# sessions never read from a possibly lagging replica.
+DATABASE_PRIMARY_ONLY_APPS = ["auth", "sessions"]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -85,3 +133,105 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 CORS_ALLOW_CREDENTIALS = True
+
+# SESSION_BACKEND=cached_db reads sessions from the default cache and falls back to
+# the database; signed_cookies keeps them in the cookie and needs no query at all, but
+# a copied cookie stays valid until it expires. "db" is Django's default.
+SESSION_ENGINES = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}
+SESSION_ENGINE = SESSION_ENGINES[os.environ.get("SESSION_BACKEND", "db")]
+
+# CachedModelBackend serves request.user from a per-process cache (AUTH_USER_CACHE).
+# ModelBackend stays listed so sessions created before it keep working.
+AUTHENTICATION_BACKENDS = [
+    "authentication.backends.CachedModelBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+# Token buckets: CAPACITY requests, refilled over PER_SECONDS. Login checks both the
+# client IP and the username before hashing; cart writes are limited per user.
+# BACKEND "local" keeps buckets per process, "cache" shares them through ALIAS.
+RATE_LIMITS = {
+    "ENABLED": os.environ.get("RATE_LIMITS", "1") == "1",
+    "BACKEND": os.environ.get("RATE_LIMITS_BACKEND", "local"),
+    "ALIAS": "default",
+    "RULES": {
+        "login_ip": {"CAPACITY": 20, "PER_SECONDS": 60},
+        "login_username": {"CAPACITY": 5, "PER_SECONDS": 60},
+        "cart_write": {"CAPACITY": 120, "PER_SECONDS": 60},
+    },
+}
+
+AUTH_USER_CACHE = {
+    "ENABLED": os.environ.get("AUTH_USER_CACHE", "1") == "1",
+    "TTL": 60,
+    "MAX_ENTRIES": 10_000,
+}
+
+# Response cache for GET /products and /products/<id>. BACKEND is "lru" (bodies
+# per process, bounded by MAX_BYTES) or "django" (bodies in the ALIAS cache). The
+# catalog version always lives in ALIAS: writes only reach other processes when it
+# is shared between them (Redis, Memcached, database cache), unlike LocMemCache.
+CATALOG_CACHE = {
+    "ENABLED": True,
+    "BACKEND": "lru",
+    "ALIAS": "default",
+    "MAX_BYTES": 16 * 1024 * 1024,
+    # Cart writes resolve (name, price) through a per-process lookup keyed by catalog version.
+    "LOOKUP_TTL": 30,
+    "LOOKUP_MAX_ENTRIES": 50_000,
+}
+
+# Product image variants, derived from image_url on write and served with ?sizes=1.
+# RESIZE_HOSTS take a ?w= width parameter; other URLs use CDN_URL when set, a template
+# with {width} and {url} or {quoted_url}. `validate_product_images` checks the URLs with
+# WORKERS threads; CHECK_ON_IMPORT also checks them during bulk imports.
+PRODUCT_IMAGES = {
+    "VARIANTS": {"thumb": 160, "card": 480, "detail": 1200},
+    "RESIZE_HOSTS": ["images.unsplash.com"],
+    "CDN_URL": os.environ.get("PRODUCT_IMAGES_CDN_URL", ""),
+    "CHECK_ON_IMPORT": os.environ.get("PRODUCT_IMAGES_CHECK_ON_IMPORT", "") == "1",
+    "WORKERS": 8,
+    "TIMEOUT": 5,
+}
+
+# List endpoints encode with orjson when it is installed. DECIMAL_FORMAT "string"
+# keeps prices exact; clients can also ask per request with ?decimals=string.
+JSON_RESPONSES = {
+    "BACKEND": os.environ.get("JSON_RESPONSES_BACKEND", "auto"),
+    "DECIMAL_FORMAT": "float",
+}
+
+# Negotiated response compression (Brotli when the optional `brotli` package is
+# installed, gzip otherwise) for bodies of at least MIN_BYTES and for streams.
+COMPRESSION = {
+    "ENABLED": os.environ.get("COMPRESSION", "1") == "1",
+    "MIN_BYTES": 1024,
+    "GZIP_LEVEL": 6,
+    "BROTLI_QUALITY": 4,
+    "CACHE_ENTRIES": 64,
+}
+
+# Per-request timing (Server-Timing header and staff-only GET /metrics).
+# Disabled by default; SAMPLE_RATE limits the share of instrumented requests.
+PERFORMANCE_METRICS = {
+    "ENABLED": os.environ.get("PERFORMANCE_METRICS", "") == "1",
+    "SAMPLE_RATE": float(os.environ.get("PERFORMANCE_METRICS_SAMPLE_RATE", "1.0")),
+    "SERVER_TIMING": True,
+}
+
+# Development/test aid: logs slow queries and repeated query templates (N+1) per
+# view. BUDGETS maps URL patterns to a maximum query count; RAISE turns findings
+# into QueryBudgetExceeded errors (enabled for the pytest suite in conftest).
+QUERY_INSPECTION = {
+    "ENABLED": os.environ.get("QUERY_INSPECTION", "") == "1",
+    "SLOW_QUERY_MS": 100,
+    "N_PLUS_ONE_THRESHOLD": 5,
+    "DEFAULT_BUDGET": None,
+    # Route -> query budget. cart/update also reads the replaced items and upserts three sales rollups;
+    # product deletes also snapshot cart lines and take the product's sales out of DailySales.
+    "BUDGETS": {"cart/update": 14, "products/delete": 14, "products/bulk/delete": 14},
+    "RAISE": False,
+}
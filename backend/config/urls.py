@@ -2,8 +2,28 @@
 from django.urls import path
 
 from authentication.views import login_view, logout_view, me_view
-from carts.views import cart_create, cart_delete, cart_update, carts_list
-from products.views import products_create, products_delete, products_detail, products_list, products_update
+from carts.views import (
+    cart_bulk_create,
+    cart_create,
+    cart_delete,
+    cart_update,
+    carts_export,
+    carts_list,
+    sales_daily,
+    sales_top,
+)
+from metrics.views import metrics_view
+from products.views import (
+    products_bulk_create,
+    products_bulk_delete,
+    products_bulk_update,
+    products_create,
+    products_delete,
+    products_detail,
+    products_list,
+    products_search,
+    products_update,
+)
 
 
 urlpatterns = [
@@ -13,11 +33,20 @@ urlpatterns = [
     path("auth/me", me_view),
     path("products", products_list),
     path("products/<int:product_id>", products_detail),
+    path("products/search", products_search),
     path("products/create", products_create),
     path("products/update", products_update),
     path("products/delete", products_delete),
+    path("products/bulk/create", products_bulk_create),
+    path("products/bulk/update", products_bulk_update),
+    path("products/bulk/delete", products_bulk_delete),
     path("carts", carts_list),
+    path("carts/export", carts_export),
     path("cart", cart_create),
+    path("cart/bulk", cart_bulk_create),
     path("cart/update", cart_update),
     path("cart/delete", cart_delete),
+    path("sales/top", sales_top),
+    path("sales/daily", sales_daily),
+    path("metrics", metrics_view),
 ]
@@ -0,0 +1,16 @@
+"""URLconf for config/asgi.py: the read endpoints use their async views, the rest stay shared."""
+from django.urls import path
+
+from authentication.views import me_view_async
+from carts.views import carts_list_async
+from products.views import products_detail_async, products_list_async
+
+from .urls import urlpatterns as sync_urlpatterns
+
+# Resolved before the shared patterns, so these paths take precedence.
+urlpatterns = [
+    path("auth/me", me_view_async),
+    path("products", products_list_async),
+    path("products/<int:product_id>", products_detail_async),
+    path("carts", carts_list_async),
+] + sync_urlpatterns
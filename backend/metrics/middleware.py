@@ -0,0 +1,56 @@
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from .registry import registry
+from .timing import RequestTimings, activate, deactivate
+
+
+class PerformanceMiddleware:
+    """Sample requests and record wall, DB and serialization time per URL pattern.
+
+    Enabled with `PERFORMANCE_METRICS["ENABLED"]`; otherwise Django drops it from the chain.
+    """
+
+    def __init__(self, get_response):
+        config = getattr(settings, "PERFORMANCE_METRICS", {})
+        if not config.get("ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = config.get("SAMPLE_RATE", 1.0)
+        self.server_timing = config.get("SERVER_TIMING", True)
+
+    def __call__(self, request):
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        timings = RequestTimings()
+        token = activate(timings)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings.db_wrapper))
+                response = self.get_response(request)
+        finally:
+            deactivate(token)
+        timings.total = time.perf_counter() - started
+
+        if not response.streaming:
+            timings.response_bytes = len(response.content)
+
+        match = request.resolver_match
+        route = match.route if match else "unmatched"
+        registry.observe(route, request.method, response.status_code, timings)
+
+        if self.server_timing:
+            response["Server-Timing"] = (
+                f'db;dur={timings.db_time * 1000:.2f};desc="{timings.db_queries} queries", '
+                f"serialize;dur={timings.serialize_time * 1000:.2f}, "
+                f"total;dur={timings.total * 1000:.2f}"
+            )
+        return response
@@ -0,0 +1,115 @@
+import logging
+import re
+import time
+import traceback
+from collections import Counter
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger("metrics.queries")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN \((?:[^()]*)\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+_PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+_THIS_FILE = str(Path(__file__).resolve())
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def fingerprint(sql: str) -> str:
+    """Normalize SQL so the same template with different values compares equal."""
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def _caller_location() -> str:
+    for frame in reversed(traceback.extract_stack()[:-2]):
+        if frame.filename.startswith(_PROJECT_ROOT) and frame.filename != _THIS_FILE:
+            return f"{Path(frame.filename).relative_to(_PROJECT_ROOT)}:{frame.lineno} in {frame.name}"
+    return "unknown"
+
+
+class QueryInspector:
+    """execute_wrapper that keeps the fingerprint, duration and caller of each query."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.queries.append((fingerprint(sql), sql, duration, _caller_location()))
+
+    def slow(self, threshold_ms: float):
+        return [query for query in self.queries if query[2] * 1000 >= threshold_ms]
+
+    def repeated(self, threshold: int):
+        """Templates executed at least `threshold` times, with the first caller seen."""
+        counts = Counter(query[0] for query in self.queries)
+        first_location = {}
+        for template, _sql, _duration, location in self.queries:
+            first_location.setdefault(template, location)
+        return [
+            (template, count, first_location[template]) for template, count in counts.items() if count >= threshold
+        ]
+
+
+class QueryInspectionMiddleware:
+    """Development/test aid that logs slow queries and repeated query templates per view.
+
+    With `QUERY_INSPECTION["RAISE"]`, a view that exceeds its query budget or repeats a
+    template `N_PLUS_ONE_THRESHOLD` times raises QueryBudgetExceeded, failing the test.
+    """
+
+    def __init__(self, get_response):
+        config = getattr(settings, "QUERY_INSPECTION", {})
+        if not config.get("ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_query_ms = config.get("SLOW_QUERY_MS", 100)
+        self.n_plus_one_threshold = config.get("N_PLUS_ONE_THRESHOLD", 5)
+        self.budgets = config.get("BUDGETS", {})
+        self.default_budget = config.get("DEFAULT_BUDGET")
+        self.raise_errors = config.get("RAISE", False)
+
+    def __call__(self, request):
+        inspector = QueryInspector()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(inspector))
+            response = self.get_response(request)
+
+        match = request.resolver_match
+        route = match.route if match else request.path
+        view = match.view_name if match else "unmatched"
+
+        for _template, sql, duration, location in inspector.slow(self.slow_query_ms):
+            logger.warning("Slow query (%.1f ms) in %s at %s: %s", duration * 1000, view, location, sql)
+
+        problems = []
+        for template, count, location in inspector.repeated(self.n_plus_one_threshold):
+            logger.warning("Possible N+1 in %s: %d x %s (first at %s)", view, count, template, location)
+            problems.append(f"{count} x {template} (first at {location})")
+
+        budget = self.budgets.get(route, self.default_budget)
+        if budget is not None and len(inspector.queries) > budget:
+            problems.append(f"{len(inspector.queries)} queries, budget is {budget}")
+
+        if problems and self.raise_errors:
+            raise QueryBudgetExceeded(f"{request.method} {request.path} ({view}): " + "; ".join(problems))
+        return response
@@ -0,0 +1,87 @@
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+# Upper bounds in seconds for the request duration histogram.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class _RouteStats:
+    __slots__ = ("count", "buckets", "duration", "db_time", "db_queries", "serialize_time", "response_bytes")
+
+    def __init__(self):
+        self.count = 0
+        self.buckets = [0] * (len(DURATION_BUCKETS) + 1)
+        self.duration = 0.0
+        self.db_time = 0.0
+        self.db_queries = 0
+        self.serialize_time = 0.0
+        self.response_bytes = 0
+
+
+class MetricsRegistry:
+    """Per-route aggregates kept in process memory and rendered in Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = defaultdict(_RouteStats)
+        self._statuses = defaultdict(int)
+
+    def observe(self, route: str, method: str, status: int, timings) -> None:
+        with self._lock:
+            stats = self._routes[(route, method)]
+            stats.count += 1
+            stats.buckets[bisect_left(DURATION_BUCKETS, timings.total)] += 1
+            stats.duration += timings.total
+            stats.db_time += timings.db_time
+            stats.db_queries += timings.db_queries
+            stats.serialize_time += timings.serialize_time
+            stats.response_bytes += timings.response_bytes
+            self._statuses[(route, method, status)] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self._statuses.clear()
+
+    def render(self) -> str:
+        with self._lock:
+            routes = sorted(self._routes.items())
+            statuses = sorted(self._statuses.items())
+
+        lines = [
+            "# HELP http_requests_total Sampled requests by route, method and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (route, method, status), count in statuses:
+            lines.append(f'http_requests_total{{route="{route}",method="{method}",status="{status}"}} {count}')
+
+        lines += [
+            "# HELP http_request_duration_seconds Wall time spent handling sampled requests.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (route, method), stats in routes:
+            labels = f'route="{route}",method="{method}"'
+            cumulative = 0
+            for bound, count in zip(DURATION_BUCKETS + ("+Inf",), stats.buckets):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {stats.duration:.6f}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {stats.count}")
+
+        for name, attribute, kind, help_text in (
+            ("http_request_db_seconds", "db_time", "counter", "Time spent in database queries."),
+            ("http_request_db_queries", "db_queries", "counter", "Database queries executed."),
+            ("http_request_serialize_seconds", "serialize_time", "counter", "Time spent serializing responses."),
+            ("http_response_bytes", "response_bytes", "counter", "Response body bytes sent."),
+        ):
+            lines += [f"# HELP {name}_total {help_text}", f"# TYPE {name}_total {kind}"]
+            for (route, method), stats in routes:
+                value = getattr(stats, attribute)
+                value = f"{value:.6f}" if isinstance(value, float) else value
+                lines.append(f'{name}_total{{route="{route}",method="{method}"}} {value}')
+
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,13 @@
+from django.http import HttpResponse, JsonResponse
+
+from .registry import registry
+
+
+def metrics_view(request):
+    if request.method != "GET":
+        return JsonResponse({"detail": "Method not allowed"}, status=405)
+
+    if not request.user.is_authenticated or not request.user.is_staff:
+        return JsonResponse({"detail": "Not authorized"}, status=403)
+
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
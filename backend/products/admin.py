@@ -1,9 +1,25 @@
 from django.contrib import admin
 
+from .images import image_fields
 from .models import Product
+from .search import filter_by_search
 
 
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
-    list_display = ("name", "price", "created_at")
+    list_display = ("name", "price", "image_status", "created_at")
+    list_filter = ("image_status",)
     search_fields = ("name",)
+    readonly_fields = ("image_variants", "image_status")
+
+    def save_model(self, request, obj, form, change):
+        if "image_url" in form.changed_data:
+            for field, value in image_fields(obj.image_url).items():
+                setattr(obj, field, value)
+        super().save_model(request, obj, form, change)
+
+    def get_search_results(self, request, queryset, search_term):
+        # Served by the FTS5 index instead of an icontains scan over name.
+        if not search_term:
+            return queryset, False
+        return filter_by_search(queryset, search_term), False
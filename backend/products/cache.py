@@ -0,0 +1,251 @@
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date, parse_http_date_safe
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+VERSION_KEY = "catalog:version"
+MODIFIED_KEY = "catalog:modified"
+
+
+class _SharedVersion:
+    """Catalog version and last-change time kept in a Django cache alias, shared by every process."""
+
+    def get_version(self) -> int:
+        version = self.cache.get(VERSION_KEY)
+        if version is None:
+            # A lost counter (eviction, cache clear) restarts from the clock, above every version
+            # issued before it, so bodies cached under an old version are never served again.
+            seed = time.time_ns()
+            self.cache.add(VERSION_KEY, seed, timeout=None)
+            version = self.cache.get(VERSION_KEY, seed)
+        return version
+
+    def get_modified(self) -> int:
+        self.cache.add(MODIFIED_KEY, int(time.time()), timeout=None)
+        return self.cache.get(MODIFIED_KEY)
+
+    def bump_version(self) -> int:
+        self.cache.set(MODIFIED_KEY, int(time.time()), timeout=None)
+        try:
+            return self.cache.incr(VERSION_KEY)
+        except ValueError:
+            version = time.time_ns()
+            self.cache.set(VERSION_KEY, version, timeout=None)
+            return version
+
+
+class LRUCatalogCache(_SharedVersion):
+    """Bodies in a process-local LRU bounded by total size; the version lives in the `alias` cache.
+
+    Processes only see each other's writes when `alias` is shared between them (Redis,
+    Memcached, database cache); a LocMemCache alias keeps the version per process.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, alias: str = "default"):
+        self.max_bytes = max_bytes
+        self.cache = caches[alias]
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._seen_version = None
+        self._lock = threading.Lock()
+
+    def get_version(self) -> int:
+        version = super().get_version()
+        if version != self._seen_version:
+            # Keys embed the version, so bodies of older versions can never be read again.
+            with self._lock:
+                self._seen_version = version
+                self._entries.clear()
+                self._size = 0
+        return version
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: str, body: bytes, etag: str) -> None:
+        size = len(body)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[0])
+            self._entries[key] = (body, etag)
+            self._size += size
+            while self._size > self.max_bytes:
+                _key, (evicted, _etag) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "lru",
+            "version": self._seen_version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "bytes": self._size,
+        }
+
+
+class DjangoCatalogCache(_SharedVersion):
+    """Cache stored in a Django cache alias, bodies included."""
+
+    def __init__(self, alias: str = "default", timeout=None):
+        self.cache = caches[alias]
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        entry = self.cache.get(f"catalog:{key}")
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def set(self, key: str, body: bytes, etag: str) -> None:
+        self.cache.set(f"catalog:{key}", (body, etag), timeout=self.timeout)
+
+    def stats(self) -> dict:
+        return {"backend": "django", "version": self.get_version(), "hits": self.hits, "misses": self.misses}
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_catalog_cache():
+    """Return the configured backend, or None when `CATALOG_CACHE["ENABLED"]` is false."""
+    global _backend
+
+    config = getattr(settings, "CATALOG_CACHE", {})
+    if not config.get("ENABLED", True):
+        return None
+
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if config.get("BACKEND", "lru") == "django":
+                    _backend = DjangoCatalogCache(config.get("ALIAS", "default"), config.get("TIMEOUT"))
+                else:
+                    _backend = LRUCatalogCache(
+                        config.get("MAX_BYTES", DEFAULT_MAX_BYTES), config.get("ALIAS", "default")
+                    )
+    return _backend
+
+
+def reset_catalog_cache() -> None:
+    global _backend
+    _backend = None
+
+
+_deferred = threading.local()
+
+
+def bump_catalog_version() -> None:
+    if getattr(_deferred, "depth", 0):
+        _deferred.pending = True
+        return
+
+    backend = get_catalog_cache()
+    if backend is not None:
+        backend.bump_version()
+
+
+@contextmanager
+def deferred_catalog_invalidation():
+    """Coalesce every version bump inside the block (signals included) into a single bump."""
+    _deferred.depth = getattr(_deferred, "depth", 0) + 1
+    try:
+        yield
+    finally:
+        _deferred.depth -= 1
+        if not _deferred.depth and getattr(_deferred, "pending", False):
+            _deferred.pending = False
+            bump_catalog_version()
+
+
+def _not_modified(request, etag: str, modified: int) -> bool:
+    """If-None-Match (weak comparison) takes precedence; If-Modified-Since is only checked without it."""
+    header = request.headers.get("If-None-Match")
+    if header is not None:
+        # Compressed responses carry the weakened W/"..." form of the same ETag.
+        return header.strip() == "*" or etag in (value.strip().removeprefix("W/") for value in header.split(","))
+
+    since = parse_http_date_safe(request.headers.get("If-Modified-Since", ""))
+    return since is not None and modified <= since
+
+
+def _cached_response(backend, request, body: bytes, etag: str):
+    modified = backend.get_modified()
+    if _not_modified(request, etag, modified):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(modified)
+    return response
+
+
+def _cache_response(backend, key: str, request, response):
+    if response.status_code != 200 or response.streaming:
+        return response
+
+    body = response.content
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    backend.set(key, body, etag)
+    return _cached_response(backend, request, body, etag)
+
+
+def catalog_cached(view):
+    """Serve successful GET responses of a catalog view, sync or async, from the catalog cache."""
+
+    if asyncio.iscoroutinefunction(view):
+
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            backend = get_catalog_cache()
+            if backend is None or request.method != "GET":
+                return await view(request, *args, **kwargs)
+
+            key = f"{backend.get_version()}:{request.get_full_path()}"
+            entry = backend.get(key)
+            if entry is not None:
+                return _cached_response(backend, request, *entry)
+            return _cache_response(backend, key, request, await view(request, *args, **kwargs))
+
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        backend = get_catalog_cache()
+        if backend is None or request.method != "GET":
+            return view(request, *args, **kwargs)
+
+        key = f"{backend.get_version()}:{request.get_full_path()}"
+        entry = backend.get(key)
+        if entry is not None:
+            return _cached_response(backend, request, *entry)
+        return _cache_response(backend, key, request, view(request, *args, **kwargs))
+
+    return wrapper
@@ -0,0 +1,189 @@
+"""Product image variants and image URL validation.
+
+Variant URLs (thumb, card, detail) are derived from `image_url` when a product is written
+and stored in `Product.image_variants`, so responses never rewrite URLs. Hosts listed in
+`PRODUCT_IMAGES["RESIZE_HOSTS"]` resize through a `w` query parameter (imgix-style, as
+Unsplash does); other hosts go through `PRODUCT_IMAGES["CDN_URL"]` when it is set and keep
+the original URL otherwise.
+
+`check_images` asks every distinct URL once whether it serves an image, with HEAD requests
+from a bounded thread pool whose threads keep one connection per origin alive.
+"""
+import http.client
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, quote, urlencode, urljoin, urlsplit, urlunsplit
+
+from django.conf import settings
+
+from .models import ImageStatus
+
+DEFAULT_VARIANTS = {"thumb": 160, "card": 480, "detail": 1200}
+DEFAULT_WORKERS = 8
+DEFAULT_TIMEOUT = 5
+MAX_REDIRECTS = 3
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+
+def _config() -> dict:
+    return getattr(settings, "PRODUCT_IMAGES", {})
+
+
+def _parse_url(url: str):
+    """SplitResult of an absolute http(s) URL, or None."""
+    try:
+        parts = urlsplit(url)
+        parts.port
+    except ValueError:
+        return None
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return None
+    return parts
+
+
+def is_image_url(url: str) -> bool:
+    return _parse_url(url) is not None
+
+
+def image_variants(url: str) -> dict:
+    """{variant: url} for each width in `PRODUCT_IMAGES["VARIANTS"]`, or {} for a non-http(s) URL."""
+    parts = _parse_url(url)
+    if parts is None:
+        return {}
+
+    config = _config()
+    widths = config.get("VARIANTS", DEFAULT_VARIANTS)
+    if parts.hostname in config.get("RESIZE_HOSTS", ()):
+        query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != "w"]
+        return {
+            name: urlunsplit(parts._replace(query=urlencode(query + [("w", width)]))) for name, width in widths.items()
+        }
+
+    cdn_url = config.get("CDN_URL")
+    if cdn_url:
+        return {
+            name: cdn_url.format(width=width, url=url, quoted_url=quote(url, safe="")) for name, width in widths.items()
+        }
+    return {name: url for name in widths}
+
+
+def image_fields(url: str) -> dict:
+    """Model fields derived from `url` at write time; the status stays pending until checked."""
+    if not url:
+        return {"image_variants": {}, "image_status": ImageStatus.MISSING}
+    variants = image_variants(url)
+    return {"image_variants": variants, "image_status": ImageStatus.PENDING if variants else ImageStatus.INVALID}
+
+
+class _ImageChecker:
+    """Checks URLs from pool threads, each keeping one connection per (scheme, host, port)."""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._local = threading.local()
+        self._opened = []
+        self._lock = threading.Lock()
+
+    def _connection(self, parts):
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+        origin = (parts.scheme, parts.hostname, parts.port)
+        connection = connections.get(origin)
+        if connection is None:
+            factory = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            connection = connections[origin] = factory(parts.hostname, parts.port, timeout=self.timeout)
+            with self._lock:
+                self._opened.append(connection)
+        return connection
+
+    def _request(self, parts, method: str):
+        path = urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        connection = self._connection(parts)
+        for attempt in range(2):
+            try:
+                connection.request(method, path, headers={"Range": "bytes=0-0"} if method == "GET" else {})
+                response = connection.getresponse()
+            except (http.client.HTTPException, OSError):
+                # The server may have closed an idle keep-alive connection: retry once on a new one.
+                connection.close()
+                if attempt:
+                    raise
+                continue
+            if method == "GET":
+                # Servers may ignore Range, so the body is not drained: the connection is dropped.
+                connection.close()
+            else:
+                response.read()
+            return response
+
+    def check(self, url: str) -> str:
+        for _redirect in range(MAX_REDIRECTS + 1):
+            parts = _parse_url(url)
+            if parts is None:
+                return ImageStatus.INVALID
+            try:
+                response = self._request(parts, "HEAD")
+                if response.status in (405, 501):
+                    response = self._request(parts, "GET")
+            except (http.client.HTTPException, OSError):
+                return ImageStatus.UNREACHABLE
+
+            location = response.getheader("Location")
+            if response.status in REDIRECT_STATUSES and location:
+                url = urljoin(url, location)
+                continue
+            if 200 <= response.status < 300:
+                content_type = response.getheader("Content-Type", "")
+                return ImageStatus.VALID if content_type.startswith("image/") else ImageStatus.INVALID
+            if response.status == 429 or response.status >= 500:
+                return ImageStatus.UNREACHABLE
+            return ImageStatus.INVALID
+        return ImageStatus.INVALID
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._opened:
+                connection.close()
+            self._opened.clear()
+
+
+def validate_image_urls(urls, workers: int = None, timeout: float = None) -> dict:
+    """{url: ImageStatus} for the distinct `urls`, checked by at most `workers` threads."""
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return {}
+
+    config = _config()
+    workers = workers or config.get("WORKERS", DEFAULT_WORKERS)
+    checker = _ImageChecker(timeout or config.get("TIMEOUT", DEFAULT_TIMEOUT))
+    try:
+        with ThreadPoolExecutor(max_workers=min(workers, len(urls)), thread_name_prefix="image-check") as pool:
+            return dict(zip(urls, pool.map(checker.check, urls)))
+    finally:
+        checker.close()
+
+
+def check_images(products, workers: int = None, timeout: float = None) -> dict:
+    """Re-derive the image fields of `products` and set the status of each checked URL, in place.
+
+    Products without a usable URL are not requested. Returns {url: ImageStatus}.
+    """
+    products = list(products)
+    for product in products:
+        for field, value in image_fields(product.image_url).items():
+            setattr(product, field, value)
+
+    statuses = validate_image_urls(
+        [product.image_url for product in products if product.image_status == ImageStatus.PENDING],
+        workers,
+        timeout,
+    )
+    for product in products:
+        status = statuses.get(product.image_url)
+        if status is None:
+            continue
+        product.image_status = status
+        if status == ImageStatus.INVALID:
+            product.image_variants = {}
+    return statuses
@@ -0,0 +1,101 @@
+"""(name, price) lookups by product id for cart writes.
+
+Entries are valid for one catalog version and at most `CATALOG_CACHE["LOOKUP_TTL"]`
+seconds, which bounds staleness when another process changes the catalog and
+`CATALOG_CACHE["ALIAS"]` is not shared between processes.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from .cache import get_catalog_cache
+from .models import Product
+
+DEFAULT_LOOKUP_TTL = 30
+DEFAULT_LOOKUP_MAX_ENTRIES = 50_000
+
+
+class ProductLookupCache:
+    """Process-local LRU of product id -> (name, price, expires_at) for a single catalog version."""
+
+    def __init__(self, ttl: float = DEFAULT_LOOKUP_TTL, max_entries: int = DEFAULT_LOOKUP_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, version, product_ids):
+        """Return ({id: (name, price)} for fresh entries, [ids to fetch])."""
+        found, missing = {}, []
+        now = time.monotonic()
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                self._entries.clear()
+            for product_id in product_ids:
+                entry = self._entries.get(product_id)
+                if entry is None or entry[2] <= now:
+                    missing.append(product_id)
+                    continue
+                self._entries.move_to_end(product_id)
+                found[product_id] = entry[:2]
+        return found, missing
+
+    def set_many(self, version, rows) -> None:
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            if version != self._version:
+                return
+            for product_id, name, price in rows:
+                self._entries[product_id] = (name, price, expires_at)
+                self._entries.move_to_end(product_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_lookup_cache = None
+_lookup_lock = threading.Lock()
+
+
+def get_lookup_cache():
+    global _lookup_cache
+
+    if _lookup_cache is None:
+        with _lookup_lock:
+            if _lookup_cache is None:
+                config = getattr(settings, "CATALOG_CACHE", {})
+                _lookup_cache = ProductLookupCache(
+                    config.get("LOOKUP_TTL", DEFAULT_LOOKUP_TTL),
+                    config.get("LOOKUP_MAX_ENTRIES", DEFAULT_LOOKUP_MAX_ENTRIES),
+                )
+    return _lookup_cache
+
+
+def reset_lookup_cache() -> None:
+    global _lookup_cache
+    _lookup_cache = None
+
+
+def lookup_products(product_ids) -> dict:
+    """{id: (name, price)} for the existing products among `product_ids`, in at most one query.
+
+    Only id, name and price are read. Without a catalog cache every call queries.
+    """
+    backend = get_catalog_cache()
+    if backend is None:
+        return {
+            product_id: (name, price)
+            for product_id, name, price in Product.objects.filter(id__in=product_ids).values_list("id", "name", "price")
+        }
+
+    cache = get_lookup_cache()
+    version = backend.get_version()
+    found, missing = cache.get_many(version, product_ids)
+    if missing:
+        rows = list(Product.objects.filter(id__in=missing).values_list("id", "name", "price"))
+        cache.set_many(version, rows)
+        found.update((product_id, (name, price)) for product_id, name, price in rows)
+    return found
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from products.cache import bump_catalog_version
+from products.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el indice de busqueda full-text de productos (SQLite FTS5)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        with transaction.atomic(using=options["database"]):
+            indexed = rebuild_index(options["database"])
+        bump_catalog_version()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Productos indexados: {indexed} en {elapsed:.1f}s"))
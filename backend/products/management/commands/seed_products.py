@@ -1,12 +1,130 @@
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
 
+from carts.models import Cart, CartItem
+from carts.sales import rebuild_sales
+from products.cache import bump_catalog_version, deferred_catalog_invalidation
+from products.images import image_fields
 from products.models import Product
+from products.search import index_products
+
+ADJECTIVES = ("basica", "urbana", "compacta", "liviana", "clasica", "deportiva", "premium", "oversize")
+NOUNS = ("Remera", "Zapatillas", "Mochila", "Gorra", "Campera", "Buzo", "Pantalon", "Medias")
 
 
 class Command(BaseCommand):
-    help = "Carga productos de ejemplo con imagenes."
+    help = "Carga productos de ejemplo con imagenes y, opcionalmente, un catalogo e historial sinteticos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=0, help="Productos sinteticos a generar.")
+        parser.add_argument("--carts", type=int, default=0, help="Carritos sinteticos a generar.")
+        parser.add_argument("--items-per-cart", type=int, default=3)
+        parser.add_argument("--days", type=int, default=365, help="Antiguedad maxima de los carritos.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=5000)
 
     def handle(self, *args, **options):
+        samples = self._load_samples()
+        rng = random.Random(options["seed"])
+        batch_size = options["batch_size"]
+
+        if options["products"]:
+            self._generate_products(rng, options["products"], batch_size, [sample["image_url"] for sample in samples])
+
+        if options["carts"]:
+            self._generate_carts(rng, options["carts"], options["items_per_cart"], options["days"], batch_size)
+
+    def _report(self, label: str, rows: int, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        rate = rows / elapsed if elapsed else rows
+        self.stdout.write(self.style.SUCCESS(f"{label}: {rows} filas en {elapsed:.1f}s ({rate:.0f} filas/s)"))
+
+    def _generate_products(self, rng, count: int, batch_size: int, image_urls) -> None:
+        started = time.perf_counter()
+        images = [image_fields(url) for url in image_urls]
+        # Bulk writes skip the save signals: rows are indexed per batch and the catalog
+        # cache is bumped once at the end.
+        with deferred_catalog_invalidation():
+            for start in range(0, count, batch_size):
+                products = [
+                    Product(
+                        name=f"{rng.choice(NOUNS)} {rng.choice(ADJECTIVES)} {index:07d}",
+                        price=Decimal(rng.randint(50000, 9999900)) / 100,
+                        image_url=image_urls[index % len(image_urls)],
+                        **images[index % len(image_urls)],
+                    )
+                    for index in range(start, min(start + batch_size, count))
+                ]
+                with transaction.atomic():
+                    Product.objects.bulk_create(products)
+                    index_products((product.id, product.name) for product in products)
+            bump_catalog_version()
+        self._report("Productos sinteticos", count, started)
+
+    def _generate_carts(self, rng, count: int, items_per_cart: int, days: int, batch_size: int) -> None:
+        catalog = {
+            product_id: (name, price) for product_id, name, price in Product.objects.values_list("id", "name", "price")
+        }
+        product_ids = sorted(catalog)
+        items_per_cart = max(1, min(items_per_cart, len(product_ids)))
+        now = timezone.now()
+        span = max(days, 1) * 86400
+
+        started = time.perf_counter()
+        item_rows = 0
+        for start in range(0, count, batch_size):
+            size = min(batch_size, count - start)
+            lines = [
+                [(product_id, rng.randint(1, 5)) for product_id in rng.sample(product_ids, items_per_cart)]
+                for _index in range(size)
+            ]
+            carts = []
+            for cart_lines in lines:
+                total = sum(catalog[product_id][1] * quantity for product_id, quantity in cart_lines)
+                carts.append(
+                    Cart(
+                        total=total,
+                        item_count=sum(quantity for _product_id, quantity in cart_lines),
+                        line_count=len(cart_lines),
+                    )
+                )
+
+            with transaction.atomic():
+                carts = Cart.objects.bulk_create(carts)
+                # auto_now_add overrides created_at on insert, so spread the history afterwards.
+                for cart in carts:
+                    cart.created_at = now - timedelta(seconds=rng.randint(0, span))
+                Cart.objects.bulk_update(carts, ["created_at"], batch_size=500)
+                items = [
+                    CartItem(
+                        cart_id=cart.id,
+                        product_id=product_id,
+                        product_name=catalog[product_id][0],
+                        unit_price=catalog[product_id][1],
+                        quantity=quantity,
+                    )
+                    for cart, cart_lines in zip(carts, lines)
+                    for product_id, quantity in cart_lines
+                ]
+                CartItem.objects.bulk_create(items)
+            item_rows += len(items)
+
+        self._report("Carritos e items sinteticos", count + item_rows, started)
+
+        # The backdated created_at values only settle after each batch, so the sales
+        # rollup is computed once from the stored history.
+        started = time.perf_counter()
+        with transaction.atomic():
+            carts = rebuild_sales()
+        self._report("Resumen diario de ventas", carts, started)
+
+    def _load_samples(self):
         samples = [
             {
                 "name": "Remera basica",
@@ -42,13 +160,18 @@ class Command(BaseCommand):
                 defaults={
                     "price": sample["price"],
                     "image_url": sample["image_url"],
+                    **image_fields(sample["image_url"]),
                 },
             )
             if was_created:
                 created += 1
             else:
                 product.price = sample["price"]
-                product.image_url = sample["image_url"]
+                if product.image_url != sample["image_url"]:
+                    product.image_url = sample["image_url"]
+                    for field, value in image_fields(sample["image_url"]).items():
+                        setattr(product, field, value)
                 product.save()
 
         self.stdout.write(self.style.SUCCESS(f"Productos cargados/actualizados: {created}"))
+        return samples
@@ -0,0 +1,52 @@
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from products.cache import bump_catalog_version
+from products.images import check_images
+from products.models import ImageStatus, Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Valida las URLs de imagen de los productos y recalcula sus variantes (thumb/card/detail). "
+        "Por defecto solo revisa productos pendientes o inaccesibles."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Revisa tambien productos ya validados.")
+        parser.add_argument("--workers", type=int, default=None, help="Hilos concurrentes (PRODUCT_IMAGES).")
+        parser.add_argument("--timeout", type=float, default=None, help="Timeout por request, en segundos.")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        queryset = Product.objects.only("id", "image_url", "image_variants", "image_status").order_by("id")
+        if not options["all"]:
+            queryset = queryset.filter(image_status__in=[ImageStatus.PENDING, ImageStatus.UNREACHABLE])
+
+        statuses = Counter()
+        checked_urls = 0
+        last_id = 0
+        while True:
+            products = list(queryset.filter(id__gt=last_id)[: options["chunk_size"]])
+            if not products:
+                break
+            checked_urls += len(check_images(products, options["workers"], options["timeout"]))
+            with transaction.atomic():
+                Product.objects.bulk_update(products, ["image_variants", "image_status"])
+            statuses.update(product.image_status for product in products)
+            last_id = products[-1].id
+
+        # bulk_update skips the save signals, so the catalog cache is invalidated once.
+        if statuses:
+            bump_catalog_version()
+        elapsed = time.perf_counter() - started
+        summary = ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items())) or "sin cambios"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Productos revisados: {sum(statuses.values())} ({checked_urls} URLs) en {elapsed:.1f}s - {summary}"
+            )
+        )
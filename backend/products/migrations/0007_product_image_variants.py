@@ -0,0 +1,71 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django.db import migrations, models
+
+# Frozen copy of products.images as of this migration: later changes to the helper or to
+# PRODUCT_IMAGES do not alter it. `validate_product_images --all` re-derives with current settings.
+VARIANTS = {"thumb": 160, "card": 480, "detail": 1200}
+RESIZE_HOSTS = ("images.unsplash.com",)
+
+
+def _image_fields(url):
+    if not url:
+        return {}, "missing"
+    try:
+        parts = urlsplit(url)
+        parts.port
+    except ValueError:
+        return {}, "invalid"
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return {}, "invalid"
+    if parts.hostname not in RESIZE_HOSTS:
+        return {name: url for name in VARIANTS}, "pending"
+
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != "w"]
+    variants = {
+        name: urlunsplit(parts._replace(query=urlencode(query + [("w", width)]))) for name, width in VARIANTS.items()
+    }
+    return variants, "pending"
+
+
+def derive_image_variants(apps, schema_editor):
+    products = apps.get_model("products", "Product").objects.using(schema_editor.connection.alias)
+    last_id = 0
+    while True:
+        chunk = list(products.filter(id__gt=last_id).order_by("id").only("id", "image_url")[:1000])
+        if not chunk:
+            break
+        for product in chunk:
+            product.image_variants, product.image_status = _image_fields(product.image_url)
+        products.bulk_update(chunk, ["image_variants", "image_status"])
+        last_id = chunk[-1].id
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0006_product_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="image_variants",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="image_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("valid", "Valid"),
+                    ("invalid", "Invalid"),
+                    ("unreachable", "Unreachable"),
+                    ("missing", "Missing"),
+                ],
+                default="pending",
+                max_length=12,
+            ),
+        ),
+        migrations.RunPython(derive_image_variants, migrations.RunPython.noop),
+    ]
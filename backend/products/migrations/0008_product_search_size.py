@@ -0,0 +1,55 @@
+import re
+import unicodedata
+
+from django.db import migrations
+
+FTS_TABLE = "products_product_fts"
+# Frozen copy of products.search as of this migration: the word count stored in the `size` column.
+SIZE_TIERS = 10
+CHUNK_SIZE = 10000
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def _size(name):
+    folded = "".join(char for char in unicodedata.normalize("NFKD", name) if not unicodedata.combining(char))
+    return str(min(len(_TERM.findall(folded.lower())), SIZE_TIERS))
+
+
+def _recreate(schema_editor, columns):
+    schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+        f"{', '.join(columns)}, tokenize = 'unicode61 remove_diacritics 2', prefix = '1 2 3 4 5 6 7 8 9 10')"
+    )
+
+
+def add_size_column(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    _recreate(schema_editor, ["name", "size"])
+    with schema_editor.connection.cursor() as cursor, schema_editor.connection.cursor() as products:
+        products.execute("SELECT id, name FROM products_product")
+        while rows := products.fetchmany(CHUNK_SIZE):
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, name, size) VALUES (%s, %s, %s)",
+                [(product_id, name, _size(name)) for product_id, name in rows],
+            )
+
+
+def remove_size_column(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    _recreate(schema_editor, ["name"])
+    schema_editor.execute(f"INSERT INTO {FTS_TABLE} (rowid, name) SELECT id, name FROM products_product")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0007_product_image_variants"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_size_column, remove_size_column),
+    ]
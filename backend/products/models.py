@@ -1,14 +1,29 @@
 from django.db import models
 
 
+class ImageStatus(models.TextChoices):
+    PENDING = "pending"
+    VALID = "valid"
+    INVALID = "invalid"
+    UNREACHABLE = "unreachable"
+    MISSING = "missing"
+
+
 class Product(models.Model):
     name = models.CharField(max_length=120)
     price = models.DecimalField(max_digits=10, decimal_places=2)
     image_url = models.URLField(blank=True, default="")
+    # Derived from image_url on write (see products.images); emptied when validation finds no image.
+    image_variants = models.JSONField(blank=True, default=dict)
+    image_status = models.CharField(max_length=12, choices=ImageStatus.choices, default=ImageStatus.PENDING)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        ordering = ["name"]
+        ordering = ["name", "id"]
+        indexes = [
+            models.Index(fields=["name", "id"], name="product_name_id_idx"),
+            models.Index(fields=["price", "id"], name="product_price_id_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.name} ({self.price})"
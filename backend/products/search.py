@@ -0,0 +1,187 @@
+"""SQLite FTS5 index over Product.name.
+
+The index is a separate FTS5 table keyed by product id (rowid). Single saves and
+deletes keep it in sync through signals; the bulk views and seed_products index
+their rows explicitly, one statement per chunk, with the signals silenced by
+`explicit_indexing`. `rebuild_product_search` recreates it from scratch.
+Other database vendors fall back to a name scan.
+
+Prefix indexes up to 10 characters let FTS5 answer every term as a prefix without
+merging doclists. Ranking does not use bm25: its IDF term reads the full doclist of
+every query term, about 250 ms for a common prefix at a million rows. Matches are
+ranked by `_relevance` instead. When a query matches more than SEARCH_CANDIDATES
+products, the candidates are collected best tier first: whole-word matches before
+prefix matches, each by increasing word count. The word count is indexed as a token
+of the `size` column, so every tier is a doclist intersection that stops at the cap.
+"""
+import re
+import threading
+import unicodedata
+from contextlib import contextmanager
+
+from django.db import connections, router
+from django.db.models.expressions import RawSQL
+
+from .models import Product
+
+FTS_TABLE = "products_product_fts"
+MAX_TERMS = 8
+SEARCH_CANDIDATES = 500
+# Word counts with their own tier; longer names share the last one.
+SIZE_TIERS = 10
+# Ids per DELETE ... IN statement, under SQLite's 999 bound parameters.
+UNINDEX_BATCH_SIZE = 500
+REBUILD_CHUNK_SIZE = 10000
+CREATE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "name, size, tokenize = 'unicode61 remove_diacritics 2', prefix = '1 2 3 4 5 6 7 8 9 10')"
+)
+_TERM = re.compile(r"\w+", re.UNICODE)
+_explicit = threading.local()
+
+
+def _connection(write: bool):
+    alias = router.db_for_write(Product) if write else router.db_for_read(Product)
+    return connections[alias]
+
+
+def _enabled(connection) -> bool:
+    return connection.vendor == "sqlite"
+
+
+def _terms(text: str) -> list:
+    """Lowercase tokens without diacritics, matching the unicode61 tokenizer."""
+    folded = "".join(char for char in unicodedata.normalize("NFKD", text) if not unicodedata.combining(char))
+    return _TERM.findall(folded.lower())
+
+
+def _size(name: str) -> str:
+    """Value of the `size` column: the word count of `name`, capped at SIZE_TIERS."""
+    return str(min(len(_terms(name)), SIZE_TIERS))
+
+
+def _name_expression(terms, prefix: bool = True) -> str:
+    star = "*" if prefix else ""
+    return "name : (" + " ".join(f'"{term}"{star}' for term in terms) + ")"
+
+
+def match_expression(text: str):
+    """FTS5 query matching every term of `text` as a prefix of a name word, or None when there are no terms."""
+    terms = _terms(text)[:MAX_TERMS]
+    if not terms:
+        return None
+    return _name_expression(terms)
+
+
+def _relevance(terms, name: str) -> tuple:
+    """Sort key: more whole-word matches first, then names with fewer and shorter words."""
+    tokens = _terms(name)
+    return (-sum(token in terms for token in tokens), len(tokens), len(name))
+
+
+def index_products(rows) -> None:
+    """Insert or replace (id, name) pairs in the index."""
+    rows = [(product_id, name, _size(name)) for product_id, name in rows]
+    connection = _connection(write=True)
+    if not rows or not _enabled(connection):
+        return
+
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(row[0],) for row in rows])
+        cursor.executemany(f"INSERT INTO {FTS_TABLE} (rowid, name, size) VALUES (%s, %s, %s)", rows)
+
+
+def unindex_products(product_ids) -> None:
+    product_ids = list(product_ids)
+    connection = _connection(write=True)
+    if not product_ids or not _enabled(connection):
+        return
+
+    with connection.cursor() as cursor:
+        for start in range(0, len(product_ids), UNINDEX_BATCH_SIZE):
+            batch = product_ids[start : start + UNINDEX_BATCH_SIZE]
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({', '.join(['%s'] * len(batch))})", batch)
+
+
+@contextmanager
+def explicit_indexing():
+    """Silence the per-row index signals inside the block; the caller indexes its rows itself."""
+    _explicit.depth = getattr(_explicit, "depth", 0) + 1
+    try:
+        yield
+    finally:
+        _explicit.depth -= 1
+
+
+def indexing_explicitly() -> bool:
+    return bool(getattr(_explicit, "depth", 0))
+
+
+def rebuild_index(using: str = "default") -> int:
+    """Recreate the index from the products table, returning the number of indexed rows."""
+    connection = connections[using]
+    if not _enabled(connection):
+        return 0
+
+    with connection.cursor() as cursor, connection.cursor() as products:
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+        cursor.execute(CREATE_SQL)
+        # The word counts are computed here, so names are streamed through Python in chunks.
+        products.execute(f"SELECT id, name FROM {Product._meta.db_table}")
+        while rows := products.fetchmany(REBUILD_CHUNK_SIZE):
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, name, size) VALUES (%s, %s, %s)",
+                [(product_id, name, _size(name)) for product_id, name in rows],
+            )
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+        cursor.execute(f"SELECT count(*) FROM {FTS_TABLE}")
+        return cursor.fetchone()[0]
+
+
+def search_product_ids(text: str, limit: int) -> list:
+    """Ids of the best `limit` matches for `text`, best first.
+
+    A query matching more than SEARCH_CANDIDATES products ranks the candidates of its best tiers.
+    """
+    terms = _terms(text)[:MAX_TERMS]
+    if not terms:
+        return []
+    expression = _name_expression(terms)
+
+    connection = _connection(write=False)
+    if not _enabled(connection):
+        queryset = filter_by_search(Product.objects.using(connection.alias), text)
+        return list(queryset.order_by("name", "id").values_list("id", flat=True)[:limit])
+
+    select = f"SELECT rowid, name FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+    with connection.cursor() as cursor:
+        cursor.execute(f"{select} LIMIT %s", [expression, SEARCH_CANDIDATES + 1])
+        candidates = cursor.fetchall()
+        if len(candidates) > SEARCH_CANDIDATES:
+            # UNION ALL runs the tiers in order and stops reading once the LIMIT is reached.
+            tiers = [
+                f'{_name_expression(terms, prefix)} AND size : "{size}"'
+                for prefix in (False, True)
+                for size in range(1, SIZE_TIERS + 1)
+            ]
+            cursor.execute(" UNION ALL ".join([select] * len(tiers)) + " LIMIT %s", [*tiers, SEARCH_CANDIDATES])
+            # Whole-word matches come back again in the prefix tiers.
+            candidates = list(dict(cursor.fetchall()).items())
+
+    terms = set(terms)
+    candidates.sort(key=lambda row: (*_relevance(terms, row[1]), row[0]))
+    return [product_id for product_id, _name in candidates[:limit]]
+
+
+def filter_by_search(queryset, text: str):
+    """Restrict a Product queryset to the rows matching `text`, for callers that need every match."""
+    expression = match_expression(text)
+    if expression is None:
+        return queryset
+    if not _enabled(connections[queryset.db]):
+        for term in _TERM.findall(text)[:MAX_TERMS]:
+            queryset = queryset.filter(name__icontains=term)
+        return queryset
+    return queryset.filter(
+        id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [expression])
+    )
@@ -0,0 +1,26 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_catalog_version
+from .models import Product
+from .search import index_products, indexing_explicitly, unindex_products
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_catalog_cache(sender, using=None, **kwargs):
+    # After commit, so a concurrent reader cannot cache the old rows under the new version.
+    transaction.on_commit(bump_catalog_version, using=using)
+
+
+@receiver(post_save, sender=Product)
+def index_product(sender, instance, **kwargs):
+    if not indexing_explicitly():
+        index_products([(instance.id, instance.name)])
+
+
+@receiver(post_delete, sender=Product)
+def unindex_product(sender, instance, **kwargs):
+    if not indexing_explicitly():
+        unindex_products([instance.id])
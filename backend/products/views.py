@@ -1,19 +1,38 @@
+import base64
+import binascii
 import json
 from decimal import Decimal, InvalidOperation
 
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 
+from config.database import afetch
+from config.encoders import EncodedJsonResponse, decimal_column, decimal_format, rows_as_objects
+from metrics.timing import record_serialization
+
+from .cache import bump_catalog_version, catalog_cached, deferred_catalog_invalidation
+from .images import check_images, image_fields, is_image_url
 from .models import Product
+from .search import explicit_indexing, index_products, search_product_ids, unindex_products
 
 
-def _serialize_product(product: Product) -> dict:
-    return {
+def _serialize_product(product: Product, sizes: bool = False) -> dict:
+    data = {
         "id": product.id,
         "name": product.name,
         "price": float(product.price),
         "image_url": product.image_url,
     }
+    if sizes:
+        data["image_variants"] = product.image_variants
+    return data
+
+
+def _wants_sizes(request) -> bool:
+    return request.GET.get("sizes") == "1"
 
 
 def _ensure_staff(request):
@@ -22,13 +41,211 @@ def _ensure_staff(request):
     return None
 
 
+def _validate_product_fields(payload: dict, partial: bool = False):
+    """Apply the name/price/image rules, returning (fields, error_detail).
+
+    With `partial`, only the keys present in the payload are validated.
+    """
+    fields = {}
+
+    if not partial or "name" in payload:
+        name = str(payload.get("name", "")).strip()
+        if not name:
+            return None, "Name is required"
+        fields["name"] = name
+
+    if not partial or "price" in payload:
+        try:
+            price_value = Decimal(str(payload.get("price")))
+        except (InvalidOperation, TypeError):
+            return None, "Price must be a number"
+        if not price_value.is_finite():
+            return None, "Price must be a number"
+
+        # Rounded to the column's scale here, so an oversized price is a row error, not a failed write.
+        price_field = Product._meta.get_field("price")
+        try:
+            price_value = price_value.quantize(Decimal(1).scaleb(-price_field.decimal_places))
+        except InvalidOperation:
+            return None, "Price is too large"
+        if price_value <= 0:
+            return None, "Price must be greater than 0"
+        if len(price_value.as_tuple().digits) > price_field.max_digits:
+            return None, "Price is too large"
+        fields["price"] = price_value
+
+    if not partial or "image_url" in payload:
+        image_url = str(payload.get("image_url", "")).strip()
+        if image_url and not is_image_url(image_url):
+            return None, "Image URL must be an http(s) URL"
+        fields["image_url"] = image_url
+        fields.update(image_fields(image_url))
+
+    return fields, None
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+DEFAULT_SEARCH_LIMIT = 20
+PRODUCT_FIELDS = ("id", "name", "price", "image_url")
+SIZES_FIELD = "image_variants"
+BULK_CHUNK_SIZE = 1000
+
+
+def _encode_cursor(name: str, product_id: int) -> str:
+    raw = json.dumps([name, product_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str):
+    try:
+        name, product_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError, binascii.Error):
+        return None
+
+    if not isinstance(name, str) or not isinstance(product_id, int):
+        return None
+    return name, product_id
+
+
+def _columns(fields, decimals: str) -> list:
+    return [decimal_column(field, decimals) if field == "price" else field for field in fields]
+
+
+def _parse_fields(raw):
+    if not raw:
+        return PRODUCT_FIELDS, None
 
+    fields = tuple(dict.fromkeys(field.strip() for field in raw.split(",") if field.strip()))
+    if not fields or any(field not in PRODUCT_FIELDS for field in fields):
+        return None, JsonResponse({"detail": "Invalid fields"}, status=400)
+    return fields, None
 
-def products_list(_request):
-    products = [_serialize_product(product) for product in Product.objects.all()]
-    return JsonResponse(products, safe=False)
 
+def _filter_products(params):
+    queryset = Product.objects.all()
 
+    name_prefix = params.get("name_prefix")
+    if name_prefix:
+        # Range instead of LIKE so SQLite can walk the (name, id) index.
+        queryset = queryset.filter(name__gte=name_prefix, name__lt=name_prefix + "\U0010ffff")
+
+    for param, lookup in (("min_price", "price__gte"), ("max_price", "price__lte")):
+        value = params.get(param)
+        if not value:
+            continue
+        try:
+            bound = Decimal(value)
+        except InvalidOperation:
+            bound = None
+        # NaN and Infinity parse as Decimals but cannot be compared against the column.
+        if bound is None or not bound.is_finite():
+            return None, JsonResponse({"detail": f"Invalid {param}"}, status=400)
+        queryset = queryset.filter(**{lookup: bound})
+
+    return queryset, None
+
+
+def _products_query(request):
+    """Parse the products_list parameters, returning (plan, error_response).
+
+    The plan's queryset is ordered, sliced and limited to the needed columns, so the
+    sync and async views only differ in how they fetch it.
+    """
+    fields, error = _parse_fields(request.GET.get("fields"))
+    if error:
+        return None, error
+    if _wants_sizes(request):
+        fields += (SIZES_FIELD,)
+
+    queryset, error = _filter_products(request.GET)
+    if error:
+        return None, error
+
+    decimals = decimal_format(request)
+    if not decimals:
+        return None, JsonResponse({"detail": "Invalid decimals format"}, status=400)
+
+    plan = {"fields": fields, "query_fields": fields, "decimals": decimals, "page_size": None}
+    if request.GET.get("all") == "1":
+        plan["queryset"] = queryset.order_by("name", "id").values_list(*_columns(fields, decimals))
+        return plan, None
+
+    try:
+        page_size = int(request.GET.get("page_size", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return None, JsonResponse({"detail": "Invalid pagination values"}, status=400)
+
+    if page_size < 1:
+        return None, JsonResponse({"detail": "Invalid pagination values"}, status=400)
+    page_size = min(page_size, MAX_PAGE_SIZE)
+
+    cursor = request.GET.get("cursor")
+    if cursor:
+        position = _decode_cursor(cursor)
+        if not position:
+            return None, JsonResponse({"detail": "Invalid cursor"}, status=400)
+        name, product_id = position
+        queryset = queryset.filter(Q(name__gt=name) | Q(name=name, id__gt=product_id))
+
+    # Requested fields come first; name and id are appended when needed for the cursor.
+    query_fields = tuple(dict.fromkeys(fields + ("name", "id")))
+    plan.update(
+        query_fields=query_fields,
+        page_size=page_size,
+        queryset=queryset.order_by("name", "id").values_list(*_columns(query_fields, decimals))[: page_size + 1],
+    )
+    return plan, None
+
+
+def _products_response(plan, rows):
+    fields, decimals, page_size = plan["fields"], plan["decimals"], plan["page_size"]
+    if page_size is None:
+        with record_serialization():
+            return EncodedJsonResponse(rows_as_objects(fields, rows), decimals)
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = dict(zip(plan["query_fields"], rows[-1]))
+        next_cursor = _encode_cursor(last["name"], last["id"])
+
+    with record_serialization():
+        return EncodedJsonResponse(
+            {
+                "page_size": page_size,
+                "next_cursor": next_cursor,
+                "results": rows_as_objects(fields, rows),
+            },
+            decimals,
+        )
+
+
+@catalog_cached
+def products_list(request):
+    if request.method != "GET":
+        return JsonResponse({"detail": "Method not allowed"}, status=405)
+
+    plan, error = _products_query(request)
+    if error:
+        return error
+
+    return _products_response(plan, list(plan["queryset"]))
+
+
+@catalog_cached
+async def products_list_async(request):
+    if request.method != "GET":
+        return JsonResponse({"detail": "Method not allowed"}, status=405)
+
+    plan, error = _products_query(request)
+    if error:
+        return error
+
+    return _products_response(plan, await afetch(plan["queryset"]))
+
+
+@catalog_cached
 def products_detail(request, product_id: int):
     if request.method != "GET":
         return JsonResponse({"detail": "Method not allowed"}, status=405)
@@ -37,7 +254,61 @@ def products_detail(request, product_id: int):
     if not product:
         return JsonResponse({"detail": "Product not found"}, status=404)
 
-    return JsonResponse(_serialize_product(product))
+    return JsonResponse(_serialize_product(product, _wants_sizes(request)))
+
+
+@catalog_cached
+async def products_detail_async(request, product_id: int):
+    if request.method != "GET":
+        return JsonResponse({"detail": "Method not allowed"}, status=405)
+
+    product = await Product.objects.filter(id=product_id).afirst()
+    if not product:
+        return JsonResponse({"detail": "Product not found"}, status=404)
+
+    return JsonResponse(_serialize_product(product, _wants_sizes(request)))
+
+
+@catalog_cached
+def products_search(request):
+    """Full-text search over product names, best matches first, every term matched as a prefix."""
+    if request.method != "GET":
+        return JsonResponse({"detail": "Method not allowed"}, status=405)
+
+    query = request.GET.get("q", "").strip()
+    if not query:
+        return JsonResponse({"detail": "Search query is required"}, status=400)
+
+    try:
+        limit = int(request.GET.get("limit", DEFAULT_SEARCH_LIMIT))
+    except ValueError:
+        return JsonResponse({"detail": "Invalid limit"}, status=400)
+
+    if limit < 1:
+        return JsonResponse({"detail": "Invalid limit"}, status=400)
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    fields, error = _parse_fields(request.GET.get("fields"))
+    if error:
+        return error
+    if _wants_sizes(request):
+        fields += (SIZES_FIELD,)
+
+    decimals = decimal_format(request)
+    if not decimals:
+        return JsonResponse({"detail": "Invalid decimals format"}, status=400)
+
+    ids = search_product_ids(query, limit)
+    query_fields = tuple(dict.fromkeys(fields + ("id",)))
+    rank = {product_id: position for position, product_id in enumerate(ids)}
+    id_index = query_fields.index("id")
+    rows = sorted(
+        Product.objects.filter(id__in=ids).values_list(*_columns(query_fields, decimals)),
+        key=lambda row: rank[row[id_index]],
+    )
+
+    with record_serialization():
+        return EncodedJsonResponse({"query": query, "results": rows_as_objects(fields, rows)}, decimals)
 
 
 @csrf_exempt
@@ -54,23 +325,12 @@ def products_create(request):
     except json.JSONDecodeError:
         return JsonResponse({"detail": "Invalid JSON payload"}, status=400)
 
-    name = str(payload.get("name", "")).strip()
-    price = payload.get("price")
-    image_url = str(payload.get("image_url", "")).strip()
+    fields, detail = _validate_product_fields(payload)
+    if detail:
+        return JsonResponse({"detail": detail}, status=400)
 
-    if not name:
-        return JsonResponse({"detail": "Name is required"}, status=400)
-
-    try:
-        price_value = Decimal(str(price))
-    except (InvalidOperation, TypeError):
-        return JsonResponse({"detail": "Price must be a number"}, status=400)
-
-    if price_value <= 0:
-        return JsonResponse({"detail": "Price must be greater than 0"}, status=400)
-
-    product = Product.objects.create(name=name, price=price_value, image_url=image_url)
-    return JsonResponse(_serialize_product(product), status=201)
+    product = Product.objects.create(**fields)
+    return JsonResponse(_serialize_product(product, sizes=True), status=201)
 
 
 @csrf_exempt
@@ -95,27 +355,15 @@ def products_update(request):
     if not product:
         return JsonResponse({"detail": "Product not found"}, status=404)
 
-    if "name" in payload:
-        name = str(payload.get("name", "")).strip()
-        if not name:
-            return JsonResponse({"detail": "Name is required"}, status=400)
-        product.name = name
-
-    if "price" in payload:
-        try:
-            price_value = Decimal(str(payload.get("price")))
-        except (InvalidOperation, TypeError):
-            return JsonResponse({"detail": "Price must be a number"}, status=400)
-
-        if price_value <= 0:
-            return JsonResponse({"detail": "Price must be greater than 0"}, status=400)
-        product.price = price_value
+    fields, detail = _validate_product_fields(payload, partial=True)
+    if detail:
+        return JsonResponse({"detail": detail}, status=400)
 
-    if "image_url" in payload:
-        product.image_url = str(payload.get("image_url", "")).strip()
+    for field, value in fields.items():
+        setattr(product, field, value)
 
     product.save()
-    return JsonResponse(_serialize_product(product))
+    return JsonResponse(_serialize_product(product, sizes=True))
 
 
 @csrf_exempt
@@ -136,8 +384,192 @@ def products_delete(request):
     if not product_id:
         return JsonResponse({"detail": "Product id is required"}, status=400)
 
-    deleted, _ = Product.objects.filter(id=product_id).delete()
+    # One transaction, so the cart lines' snapshot and unlinking commit with the delete.
+    with transaction.atomic():
+        deleted, _ = Product.objects.filter(id=product_id).delete()
     if not deleted:
         return JsonResponse({"detail": "Product not found"}, status=404)
 
     return JsonResponse({"detail": "Product deleted"})
+
+
+def _parse_bulk_rows(request):
+    """Read a JSON array or NDJSON body into (row_number, payload) pairs.
+
+    NDJSON lines that fail to parse keep a None payload so they are reported per row.
+    """
+    if request.content_type == "application/x-ndjson":
+        rows = []
+        for row_number, raw in enumerate(request, start=1):
+            if not raw.strip():
+                continue
+            try:
+                rows.append((row_number, json.loads(raw)))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                rows.append((row_number, None))
+        return rows, None
+
+    try:
+        payload = json.loads(request.body.decode("utf-8") or "[]")
+    except json.JSONDecodeError:
+        return None, JsonResponse({"detail": "Invalid JSON payload"}, status=400)
+
+    if not isinstance(payload, list):
+        return None, JsonResponse({"detail": "Expected a list of products"}, status=400)
+    return list(enumerate(payload, start=1)), None
+
+
+def _bulk_row_id(payload):
+    product_id = payload.get("id") if isinstance(payload, dict) else None
+    if not isinstance(product_id, int) or isinstance(product_id, bool):
+        return None
+    return product_id
+
+
+def _validate_bulk_row(payload, partial: bool = False):
+    if not isinstance(payload, dict):
+        return None, "Invalid JSON payload"
+    if partial and _bulk_row_id(payload) is None:
+        return None, "Product id is required"
+    return _validate_product_fields(payload, partial=partial)
+
+
+def _chunks(rows, size: int = BULK_CHUNK_SIZE):
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+def _bulk_request(request):
+    forbidden = _ensure_staff(request)
+    if forbidden:
+        return None, forbidden
+
+    if request.method != "POST":
+        return None, JsonResponse({"detail": "Method not allowed"}, status=405)
+
+    return _parse_bulk_rows(request)
+
+
+def _check_imported_images(products) -> None:
+    # Optional import stage: each chunk's distinct URLs are checked once, concurrently.
+    if getattr(settings, "PRODUCT_IMAGES", {}).get("CHECK_ON_IMPORT"):
+        check_images(products)
+
+
+def _bulk_response(results):
+    errors = sum(1 for result in results if result["status"] >= 400)
+    return JsonResponse({"processed": len(results), "errors": errors, "results": results})
+
+
+@csrf_exempt
+def products_bulk_create(request):
+    rows, error = _bulk_request(request)
+    if error:
+        return error
+
+    results = []
+    with deferred_catalog_invalidation():
+        for chunk in _chunks(rows):
+            pending = []
+            for row_number, payload in chunk:
+                fields, detail = _validate_bulk_row(payload)
+                result = {"row": row_number, "status": 400 if detail else 201}
+                if detail:
+                    result["detail"] = detail
+                else:
+                    pending.append((result, Product(**fields)))
+                results.append(result)
+
+            _check_imported_images([product for _result, product in pending])
+            with transaction.atomic():
+                created = Product.objects.bulk_create([product for _result, product in pending])
+                index_products((product.id, product.name) for product in created)
+            if created:
+                bump_catalog_version()
+            for (result, _product), product in zip(pending, created):
+                result["id"] = product.id
+
+    return _bulk_response(results)
+
+
+@csrf_exempt
+def products_bulk_update(request):
+    rows, error = _bulk_request(request)
+    if error:
+        return error
+
+    results = []
+    with deferred_catalog_invalidation():
+        for chunk in _chunks(rows):
+            products = Product.objects.in_bulk(
+                [payload["id"] for _row, payload in chunk if _bulk_row_id(payload) is not None]
+            )
+            changed = {}
+            fields_to_update = set()
+            new_images = []
+
+            for row_number, payload in chunk:
+                result = {"row": row_number, "status": 200}
+                results.append(result)
+                fields, detail = _validate_bulk_row(payload, partial=True)
+                if detail:
+                    result.update(status=400, detail=detail)
+                    continue
+
+                product = products.get(payload["id"])
+                if not product:
+                    result.update(status=404, detail="Product not found")
+                    continue
+
+                for field, value in fields.items():
+                    setattr(product, field, value)
+                fields_to_update.update(fields)
+                changed[product.id] = product
+                if "image_url" in fields:
+                    new_images.append(product)
+                result["id"] = product.id
+
+            _check_imported_images(new_images)
+            if changed and fields_to_update:
+                with transaction.atomic():
+                    Product.objects.bulk_update(list(changed.values()), fields=sorted(fields_to_update))
+                    if "name" in fields_to_update:
+                        index_products((product.id, product.name) for product in changed.values())
+                bump_catalog_version()
+
+    return _bulk_response(results)
+
+
+@csrf_exempt
+def products_bulk_delete(request):
+    rows, error = _bulk_request(request)
+    if error:
+        return error
+
+    results = []
+    with deferred_catalog_invalidation():
+        for chunk in _chunks(rows):
+            ids = {}
+            for row_number, payload in chunk:
+                product_id = _bulk_row_id(payload if isinstance(payload, dict) else {"id": payload})
+                result = {"row": row_number, "status": 200}
+                results.append(result)
+                if product_id is None:
+                    result.update(status=400, detail="Product id is required")
+                    continue
+                result["id"] = product_id
+                ids.setdefault(product_id, []).append(result)
+
+            with transaction.atomic(), explicit_indexing():
+                existing = set(Product.objects.filter(id__in=ids).values_list("id", flat=True))
+                Product.objects.filter(id__in=existing).delete()
+                unindex_products(existing)
+            if existing:
+                bump_catalog_version()
+
+            for product_id, id_results in ids.items():
+                if product_id not in existing:
+                    for result in id_results:
+                        result.update(status=404, detail="Product not found")
+
+    return _bulk_response(results)
@@ -0,0 +1,41 @@
+import pytest
+from django.core.cache import cache
+
+from authentication.backends import reset_user_cache
+from config.ratelimit import reset_rate_limits
+from products.cache import reset_catalog_cache
+from products.lookup import reset_lookup_cache
+
+
+@pytest.fixture(autouse=True)
+def _query_inspection(settings):
+    # Any request that repeats a query template or exceeds the budget fails its test.
+    settings.QUERY_INSPECTION = {**settings.QUERY_INSPECTION, "ENABLED": True, "RAISE": True, "DEFAULT_BUDGET": 12}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_caches():
+    cache.clear()
+    reset_catalog_cache()
+    reset_lookup_cache()
+    reset_user_cache()
+    reset_rate_limits()
+    yield
+    reset_catalog_cache()
+    reset_lookup_cache()
+    reset_user_cache()
+    reset_rate_limits()
+
+
+@pytest.fixture
+def user_client(client, django_user_model):
+    user = django_user_model.objects.create_user(username="cliente", password="secreto123")
+    client.force_login(user)
+    return client
+
+
+@pytest.fixture
+def staff_client(client, django_user_model):
+    user = django_user_model.objects.create_user(username="admin", password="secreto123", is_staff=True)
+    client.force_login(user)
+    return client
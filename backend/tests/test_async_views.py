@@ -0,0 +1,54 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from carts.models import Cart, CartItem
+from products.models import Product
+
+
+@pytest.fixture
+def catalog(db):
+    products = Product.objects.bulk_create([Product(name=f"Producto {index}", price=100 + index) for index in range(3)])
+    cart = Cart.objects.create(total=201, item_count=2, line_count=2)
+    CartItem.objects.bulk_create(
+        [
+            CartItem(cart=cart, product=products[0], product_name=products[0].name, unit_price=100, quantity=1),
+            # Not snapshotted yet: resolved from the product.
+            CartItem(cart=cart, product=products[1], quantity=1),
+        ]
+    )
+    return products
+
+
+@pytest.mark.parametrize(
+    "path", ["/products", "/products?all=1&decimals=string", "/products?page_size=2", "/carts", "/carts?page=1"]
+)
+def test_async_views_match_sync_views(catalog, user_client, settings, path):
+    settings.CATALOG_CACHE = {**settings.CATALOG_CACHE, "ENABLED": False}
+    expected = json.loads(user_client.get(path).content.decode("utf-8"))
+
+    settings.ROOT_URLCONF = "config.urls_asgi"
+    response = user_client.get(path)
+
+    assert response.status_code == 200
+    assert json.loads(response.content.decode("utf-8")) == expected
+
+
+@pytest.mark.urls("config.urls_asgi")
+def test_async_views_through_asgi_handler(catalog, async_client, django_user_model):
+    user = django_user_model.objects.create_user(username="cliente", password="secreto123")
+
+    @async_to_sync
+    async def get(path):
+        return await async_client.get(path)
+
+    assert get("/carts").status_code == 401
+    assert get("/products/999999").status_code == 404
+
+    async_client.force_login(user)
+    me, carts = get("/auth/me"), get("/carts")
+
+    assert json.loads(me.content.decode("utf-8"))["username"] == "cliente"
+    items = json.loads(carts.content.decode("utf-8"))["results"][0]["items"]
+    assert [item["product_name"] for item in items] == ["Producto 0", "Producto 1"]
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+from django.test import Client
+
+from products.models import Product
+
+
+def _login(client, username="cliente", password="secreto123"):
+    return client.post(
+        "/auth/login", data=json.dumps({"username": username, "password": password}), content_type="application/json"
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("engine", "queries"),
+    [("django.contrib.sessions.backends.db", 1), ("django.contrib.sessions.backends.signed_cookies", 0)],
+)
+def test_me_serves_the_user_from_cache(client, django_user_model, django_assert_num_queries, settings, engine, queries):
+    settings.SESSION_ENGINE = engine
+    django_user_model.objects.create_user(username="cliente", password="secreto123")
+    assert _login(client).status_code == 200
+    client.get("/auth/me")
+
+    with django_assert_num_queries(queries):
+        response = client.get("/auth/me")
+
+    assert response.json()["username"] == "cliente"
+
+
+@pytest.mark.django_db
+def test_user_cache_follows_staff_password_and_logout_changes(client, django_user_model):
+    user = django_user_model.objects.create_user(username="cliente", password="secreto123")
+    _login(client)
+    assert client.get("/auth/me").json()["is_staff"] is False
+
+    user.is_staff = True
+    user.save()
+    assert client.get("/auth/me").json()["is_staff"] is True
+
+    other = Client()
+    _login(other)
+    user.set_password("otra-clave-456")
+    user.save()
+    # The stored session hash no longer matches the new password.
+    assert client.get("/auth/me").status_code == 401
+    assert other.get("/auth/me").status_code == 401
+
+    _login(client, password="otra-clave-456")
+    client.post("/auth/logout")
+    assert client.get("/auth/me").status_code == 401
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("backend", ["local", "cache"])
+def test_login_attempts_are_throttled_before_hashing(client, monkeypatch, settings, backend):
+    settings.RATE_LIMITS = {
+        **settings.RATE_LIMITS,
+        "ENABLED": True,
+        "BACKEND": backend,
+        "RULES": {
+            "login_ip": {"CAPACITY": 5, "PER_SECONDS": 60},
+            "login_username": {"CAPACITY": 2, "PER_SECONDS": 60},
+        },
+    }
+    calls = []
+    monkeypatch.setattr("authentication.views.authenticate", lambda request, **kwargs: calls.append(kwargs))
+
+    statuses = [_login(client, username="Cliente").status_code for _index in range(3)]
+    assert statuses == [401, 401, 429]
+    assert len(calls) == 2
+
+    # Every attempt, even one rejected by its username, spends a token of the IP bucket.
+    statuses = [_login(client, username=f"otro{index}").status_code for index in range(3)]
+    assert statuses == [401, 401, 429]
+    response = _login(client, username="cliente")
+    assert response.status_code == 429
+    assert int(response["Retry-After"]) >= 1
+    assert len(calls) == 4
+
+
+@pytest.mark.django_db
+def test_cart_writes_are_rate_limited_per_user(user_client, settings):
+    settings.RATE_LIMITS = {
+        **settings.RATE_LIMITS,
+        "ENABLED": True,
+        "RULES": {"cart_write": {"CAPACITY": 2, "PER_SECONDS": 60}},
+    }
+    product = Product.objects.create(name="Remera", price=1500)
+    payload = json.dumps({"items": [{"product_id": product.id, "quantity": 1}]})
+
+    responses = [user_client.post("/cart", data=payload, content_type="application/json") for _index in range(3)]
+    assert [response.status_code for response in responses] == [201, 201, 429]
@@ -1,16 +1,25 @@
+import base64
+import csv
+import io
 import json
+from datetime import date
+from decimal import Decimal
 
 import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import Sum
 
-from carts.models import Cart
+from carts.models import Cart, CartItem, DailySales, ProductDailySales
+from carts.sales import record_sales
+from carts.views import _parse_items
 from products.models import Product
 
 
 @pytest.mark.django_db
-def test_cart_create(client):
+def test_cart_create(user_client):
     product = Product.objects.create(name="Remera", price=1500)
 
-    response = client.post(
+    response = user_client.post(
         "/cart",
         data=json.dumps({"items": [{"product_id": product.id, "quantity": 2}]}),
         content_type="application/json",
@@ -21,3 +30,399 @@ def test_cart_create(client):
     assert payload["id"]
     assert payload["items"][0]["product_id"] == product.id
     assert Cart.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_cart_bulk_create_streams_per_line_results(user_client):
+    product = Product.objects.create(name="Remera", price=1500)
+    lines = [
+        json.dumps({"items": [{"product_id": product.id, "quantity": 1}]}),
+        "no es json",
+        "",
+        json.dumps({"items": [{"product_id": product.id + 100, "quantity": 1}]}),
+        json.dumps({"items": [{"product_id": product.id, "quantity": 3}]}),
+    ]
+
+    response = user_client.post(
+        "/cart/bulk?chunk_size=2", data="\n".join(lines), content_type="application/x-ndjson"
+    )
+
+    assert response.status_code == 200
+    results = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+    assert [(result["line"], result["status"]) for result in results] == [(1, 201), (2, 400), (4, 404), (5, 201)]
+    assert Cart.objects.count() == 2
+    assert Cart.objects.get(id=results[3]["id"]).items.get().quantity == 3
+
+
+@pytest.mark.django_db
+def test_carts_export_streams_filtered_rows(user_client):
+    remera = Product.objects.create(name="Remera", price=1500)
+    gorra = Product.objects.create(name="Gorra", price=700)
+    first = Cart.objects.create(total=3700)
+    CartItem.objects.create(cart=first, product=remera, quantity=2)
+    CartItem.objects.create(cart=first, product=gorra, quantity=1)
+    second = Cart.objects.create(total=2800)
+    CartItem.objects.create(cart=second, product=gorra, quantity=4)
+
+    response = user_client.get(f"/carts/export?format=csv&product_id={remera.id}")
+    rows = list(csv.reader(b"".join(response.streaming_content).decode("utf-8").splitlines()))
+    assert rows[0][0] == "cart_id"
+    assert [(int(row[0]), row[3]) for row in rows[1:]] == [(first.id, "Remera"), (first.id, "Gorra")]
+
+    response = user_client.get("/carts/export?format=ndjson")
+    carts = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+    assert [cart["id"] for cart in carts] == [first.id, second.id]
+    assert [cart["total"] for cart in carts] == [3700.0, 2800.0]
+    for query in (
+        "/carts?min_total=nan",
+        "/carts/export?min_total=NaN",
+        "/carts/export?max_total=Infinity",
+        "/carts?product_id=abc",
+        "/carts/export?product_id=0",
+        "/carts/export?product_id=²",
+    ):
+        assert user_client.get(query).status_code == 400
+    with pytest.raises(CommandError, match="Invalid product_id"):
+        call_command("export_carts", product_id="abc", stdout=io.StringIO())
+
+
+@pytest.mark.django_db
+def test_carts_export_falls_back_to_product_for_unsnapshotted_items(user_client):
+    remera = Product.objects.create(name="Remera", price=1500)
+    cart = Cart.objects.create(total=3000)
+    CartItem.objects.bulk_create([CartItem(cart=cart, product=remera, quantity=2)])
+
+    response = user_client.get("/carts/export?format=csv")
+    rows = list(csv.reader(b"".join(response.streaming_content).decode("utf-8").splitlines()))
+    assert rows[1][3:] == ["Remera", "1500.00", "2"]
+
+    response = user_client.get("/carts/export?format=ndjson")
+    (exported,) = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+    assert exported["items"][0]["product_name"] == "Remera"
+    assert exported["items"][0]["price"] == 1500.0
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("path", ["/products/delete", "/products/bulk/delete"])
+def test_deleting_a_product_in_a_cart_keeps_stored_totals_consistent(user_client, staff_client, path):
+    remera = Product.objects.create(name="Remera", price=10)
+    gorra = Product.objects.create(name="Gorra", price=5)
+    items = [{"product_id": remera.id, "quantity": 1}, {"product_id": gorra.id, "quantity": 2}]
+    cart_id = user_client.post("/cart", data=json.dumps({"items": items}), content_type="application/json").json()["id"]
+
+    payload = {"id": gorra.id} if path == "/products/delete" else [gorra.id]
+    assert staff_client.post(path, data=json.dumps(payload), content_type="application/json").status_code == 200
+
+    cart = Cart.objects.get(id=cart_id)
+    lines = list(cart.items.values_list("unit_price", "quantity"))
+    assert (cart.total, cart.item_count, cart.line_count) == (Decimal("20.00"), 3, 2)
+    assert cart.total == sum(price * quantity for price, quantity in lines)
+    listed = user_client.get("/carts?min_total=20").json()["results"]
+    assert [(row["id"], sum(item["price"] * item["quantity"] for item in row["items"])) for row in listed] == [
+        (cart_id, 20.0)
+    ]
+
+
+@pytest.mark.django_db
+def test_carts_list_cursor_pagination(user_client):
+    remera = Product.objects.create(name="Remera", price=1500)
+    gorra = Product.objects.create(name="Gorra", price=700)
+    carts = []
+    for index in range(5):
+        cart = Cart.objects.create()
+        CartItem.objects.create(cart=cart, product=remera if index % 2 else gorra, quantity=1)
+        carts.append(cart)
+
+    seen = []
+    cursor = None
+    while True:
+        url = "/carts?page_size=2&total=none" + (f"&cursor={cursor}" if cursor else "")
+        payload = json.loads(user_client.get(url).content.decode("utf-8"))
+        assert payload["total"] is None
+        seen.extend(cart["id"] for cart in payload["results"])
+        cursor = payload["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == [cart.id for cart in reversed(carts)]
+
+    payload = json.loads(user_client.get(f"/carts?product_id={remera.id}&total=cached").content.decode("utf-8"))
+    assert payload["total"] == 2
+    assert [cart["id"] for cart in payload["results"]] == [carts[3].id, carts[1].id]
+
+
+@pytest.mark.django_db
+def test_carts_list_orders_and_filters_by_stored_total(user_client):
+    remera = Product.objects.create(name="Remera", price="1500.50")
+    cart_ids = []
+    for quantity in (1, 3, 2):
+        response = user_client.post(
+            "/cart",
+            data=json.dumps({"items": [{"product_id": remera.id, "quantity": quantity}]}),
+            content_type="application/json",
+        )
+        cart_ids.append(json.loads(response.content.decode("utf-8"))["id"])
+
+    cart = Cart.objects.get(id=cart_ids[1])
+    assert (cart.total, cart.item_count, cart.line_count) == (Decimal("4501.50"), 3, 1)
+
+    first = json.loads(user_client.get("/carts?order_by=-total&page_size=1&min_total=2000").content.decode("utf-8"))
+    assert [item["id"] for item in first["results"]] == [cart_ids[1]]
+    second = json.loads(
+        user_client.get(f"/carts?order_by=-total&page_size=1&min_total=2000&cursor={first['next_cursor']}").content
+    )
+    assert [item["id"] for item in second["results"]] == [cart_ids[2]]
+    assert second["next_cursor"] is None
+    assert second["results"][0]["total"] == 3001.0
+    for value in ("NaN", "Infinity", "sNaN"):
+        cursor = base64.urlsafe_b64encode(json.dumps(["total", value, 1]).encode()).decode()
+        assert user_client.get(f"/carts?order_by=total&cursor={cursor}").status_code == 400
+
+
+@pytest.mark.django_db
+def test_cart_items_keep_price_snapshot(user_client):
+    remera = Product.objects.create(name="Remera", price=1500)
+    user_client.post(
+        "/cart",
+        data=json.dumps({"items": [{"product_id": remera.id, "quantity": 2}]}),
+        content_type="application/json",
+    )
+
+    remera.name = "Remera nueva"
+    remera.price = 9999
+    remera.save()
+
+    payload = json.loads(user_client.get("/carts").content.decode("utf-8"))
+    item = payload["results"][0]["items"][0]
+    assert (item["product_name"], item["price"]) == ("Remera", 1500.0)
+    assert payload["results"][0]["total"] == 3000.0
+
+
+@pytest.mark.django_db
+def test_carts_list_resolves_unsnapshotted_items_in_one_query(user_client):
+    products = Product.objects.bulk_create([Product(name=f"Producto {index}", price="10.25") for index in range(6)])
+    cart = Cart.objects.create()
+    CartItem.objects.bulk_create([CartItem(cart=cart, product=product, quantity=1) for product in products])
+
+    payload = json.loads(user_client.get("/carts?decimals=string").content.decode("utf-8"))
+
+    items = payload["results"][0]["items"]
+    assert [item["product_name"] for item in items] == [product.name for product in products]
+    assert {item["price"] for item in items} == {"10.25"}
+
+
+@pytest.mark.django_db
+def test_cart_items_merge_duplicates_and_reuse_product_lookups(
+    user_client, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    remera = Product.objects.create(name="Remera", price=1500)
+    items = [{"product_id": remera.id, "quantity": 1}, {"product_id": str(remera.id), "quantity": 2}]
+
+    response = user_client.post("/cart", data=json.dumps({"items": items}), content_type="application/json")
+    assert response.status_code == 201
+    assert [(item["product_id"], item["quantity"]) for item in response.json()["items"]] == [(remera.id, 3)]
+
+    # session, savepoint, cart insert, items insert, 3 sales upserts, release: user and products are cached.
+    with django_assert_num_queries(8):
+        user_client.post("/cart", data=json.dumps({"items": items}), content_type="application/json")
+
+    remera.price = 1800
+    with django_capture_on_commit_callbacks(execute=True):
+        remera.save()
+    response = user_client.post("/cart", data=json.dumps({"items": items}), content_type="application/json")
+    assert response.json()["total"] == 1800 * 3
+
+
+@pytest.mark.django_db
+def test_parse_items_resolves_thousands_of_lines_in_one_query(django_assert_num_queries):
+    products = Product.objects.bulk_create([Product(name=f"Producto {index}", price=10) for index in range(3000)])
+    payload = {"items": [{"product_id": product.id, "quantity": 1} for product in products] * 2}
+
+    with django_assert_num_queries(1):
+        (normalized, resolved), error = _parse_items(payload)
+
+    assert error is None
+    assert len(normalized) == len(resolved) == 3000
+    assert {quantity for _product_id, quantity in normalized} == {2}
+    missing, error = _parse_items({"items": [{"product_id": products[-1].id + 1, "quantity": 1}]})
+    assert error.status_code == 404
+
+
+@pytest.mark.django_db
+def test_cart_update_diffs_items_applies_operations_and_checks_version(user_client):
+    remera = Product.objects.create(name="Remera", price=1500)
+    gorra = Product.objects.create(name="Gorra", price=700)
+    medias = Product.objects.create(name="Medias", price=300)
+
+    def update(payload):
+        response = user_client.post("/cart/update", data=json.dumps(payload), content_type="application/json")
+        return response.status_code, json.loads(response.content.decode("utf-8"))
+
+    created = user_client.post(
+        "/cart",
+        data=json.dumps({"items": [{"product_id": remera.id, "quantity": 1}, {"product_id": gorra.id, "quantity": 2}]}),
+        content_type="application/json",
+    ).json()
+    assert created["version"] == 1
+    remera_row = CartItem.objects.get(cart_id=created["id"], product=remera).id
+    remera.price = 2000
+    remera.save()
+
+    items = [{"product_id": remera.id, "quantity": 3}, {"product_id": medias.id, "quantity": 1}]
+    status, payload = update({"id": created["id"], "version": 1, "items": items})
+    assert status == 200
+    assert payload["version"] == 2
+    # The kept line is updated in place and keeps its price snapshot.
+    assert CartItem.objects.get(product=remera).id == remera_row
+    assert payload["total"] == 1500 * 3 + 300
+    assert not CartItem.objects.filter(product=gorra).exists()
+
+    status, payload = update(
+        {
+            "id": created["id"],
+            "version": 2,
+            "operations": [
+                {"op": "add", "product_id": remera.id, "quantity": 1},
+                {"op": "remove", "product_id": medias.id},
+                {"op": "set", "product_id": gorra.id, "quantity": 5},
+            ],
+        }
+    )
+    assert status == 200
+    assert [(item["product_name"], item["quantity"], item["price"]) for item in payload["items"]] == [
+        ("Remera", 4, 1500.0),
+        ("Gorra", 5, 700.0),
+    ]
+    assert Cart.objects.get(id=created["id"]).total == Decimal("9500")
+
+    remove_remera = {"op": "remove", "product_id": remera.id}
+    status, payload = update({"id": created["id"], "version": 2, "operations": [remove_remera]})
+    assert (status, payload["version"]) == (409, 3)
+    assert CartItem.objects.filter(cart_id=created["id"]).count() == 2
+
+    # Operations that change nothing keep the version, even against a stale one, and skip the rollups.
+    sales = list(ProductDailySales.objects.values_list("product_id", "quantity"))
+    no_op = [{"op": "remove", "product_id": medias.id}, {"op": "set", "product_id": 999999, "quantity": 0}]
+    status, payload = update({"id": created["id"], "version": 1, "operations": no_op})
+    assert (status, payload["version"], payload["total"]) == (200, 3, 9500.0)
+    assert list(ProductDailySales.objects.values_list("product_id", "quantity")) == sales
+
+    clear_gorra = {"op": "set", "product_id": gorra.id, "quantity": 0}
+    status, payload = update({"id": created["id"], "operations": [remove_remera, clear_gorra]})
+    assert (status, payload["detail"]) == (400, "Items are required")
+
+
+@pytest.mark.django_db
+def test_deleting_a_product_keeps_its_cart_lines_from_the_snapshot(user_client, staff_client):
+    remera = Product.objects.create(name="Remera", price=10)
+    gorra = Product.objects.create(name="Gorra", price=5)
+    items = [{"product_id": remera.id, "quantity": 1}, {"product_id": gorra.id, "quantity": 2}]
+    cart = user_client.post("/cart", data=json.dumps({"items": items}), content_type="application/json").json()
+    # A line written before snapshots existed takes one from the product on delete.
+    legacy = Cart.objects.create(total=10, item_count=2, line_count=1)
+    CartItem.objects.bulk_create([CartItem(cart=legacy, product=gorra, quantity=2)])
+
+    staff_client.post("/products/delete", data=json.dumps({"id": gorra.id}), content_type="application/json")
+
+    lines = CartItem.objects.filter(product__isnull=True).order_by("id")
+    assert list(lines.values_list("cart_id", "product_name", "unit_price", "quantity")) == [
+        (cart["id"], "Gorra", Decimal("5.00"), 2),
+        (legacy.id, "Gorra", Decimal("5.00"), 2),
+    ]
+    add = {"op": "add", "product_id": remera.id, "quantity": 1}
+    response = user_client.post(
+        "/cart/update", data=json.dumps({"id": cart["id"], "operations": [add]}), content_type="application/json"
+    )
+    payload = response.json()
+    assert [(item["product_id"], item["quantity"]) for item in payload["items"]] == [(None, 2), (remera.id, 2)]
+    assert payload["total"] == 30.0
+    response = user_client.post("/cart/delete", data=json.dumps({"id": cart["id"]}), content_type="application/json")
+    assert response.status_code == 200
+
+
+def _sales_rows():
+    return sorted(ProductDailySales.objects.filter(quantity__gt=0).values_list("product_id", "quantity", "revenue"))
+
+
+@pytest.mark.django_db
+def test_sales_rollup_follows_cart_writes_and_matches_rebuild(user_client):
+    remera = Product.objects.create(name="Remera", price=1500)
+    gorra = Product.objects.create(name="Gorra", price=700)
+
+    def post(path, payload):
+        response = user_client.post(path, data=json.dumps(payload), content_type="application/json")
+        assert response.status_code in (200, 201)
+        return json.loads(response.content.decode("utf-8"))
+
+    first = post(
+        "/cart", {"items": [{"product_id": remera.id, "quantity": 2}, {"product_id": gorra.id, "quantity": 1}]}
+    )
+    second = post("/cart", {"items": [{"product_id": remera.id, "quantity": 1}]})
+    assert _sales_rows() == [(remera.id, 3, Decimal("4500")), (gorra.id, 1, Decimal("700"))]
+
+    post("/cart/update", {"id": first["id"], "items": [{"product_id": remera.id, "quantity": 5}]})
+    assert _sales_rows() == [(remera.id, 6, Decimal("9000"))]
+
+    post("/cart/delete", {"id": second["id"]})
+    incremental = _sales_rows()
+    assert incremental == [(remera.id, 5, Decimal("7500"))]
+
+    out = io.StringIO()
+    call_command("rebuild_sales_rollup", chunk_size=1, stdout=out)
+    assert "Carritos procesados: 1" in out.getvalue()
+    assert _sales_rows() == incremental
+
+
+@pytest.mark.django_db
+def test_sales_endpoints_serve_top_products_and_series(user_client, django_user_model):
+    remera = Product.objects.create(name="Remera", price=1500)
+    gorra = Product.objects.create(name="Gorra", price=700)
+    record_sales(date(2024, 3, 4), added=[(remera.id, 2, Decimal("1500"))])
+    record_sales(date(2024, 3, 5), added=[(remera.id, 1, Decimal("1500")), (gorra.id, 5, Decimal("700"))])
+    record_sales(date(2024, 2, 1), added=[(gorra.id, 50, Decimal("700"))])
+    assert user_client.get("/sales/top").status_code == 403
+
+    staff = django_user_model.objects.create_user(username="admin", password="secreto123", is_staff=True)
+    user_client.force_login(staff)
+
+    top = user_client.get("/sales/top", {"from": "2024-03-01", "to": "2024-03-07", "order_by": "revenue"}).json()
+    assert [(row["product_name"], row["quantity"], row["revenue"]) for row in top["results"]] == [
+        ("Remera", 3, 4500.0),
+        ("Gorra", 5, 3500.0),
+    ]
+
+    series = user_client.get(
+        "/sales/daily", {"from": "2024-03-01", "to": "2024-03-07", "product_id": remera.id, "decimals": "string"}
+    ).json()
+    assert [(row["period"], row["quantity"], Decimal(row["revenue"])) for row in series["results"]] == [
+        ("2024-03-04", 2, Decimal("3000")),
+        ("2024-03-05", 1, Decimal("1500")),
+    ]
+    monthly = user_client.get("/sales/daily", {"from": "2024-02-01", "to": "2024-03-31", "interval": "month"}).json()
+    assert [row["quantity"] for row in monthly["results"]] == [50, 8]
+    year = user_client.get("/sales/top", {"from": "2024-01-15", "to": "2024-03-05"}).json()
+    assert [(row["product_name"], row["quantity"]) for row in year["results"]] == [("Gorra", 55), ("Remera", 3)]
+    assert user_client.get("/sales/top", {"from": "2024-03-07", "to": "2024-03-01"}).status_code == 400
+    for product_id in ("abc", "²", "-1"):
+        assert user_client.get("/sales/daily", {"product_id": product_id}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_deleting_a_product_takes_its_sales_out_of_the_daily_totals():
+    remera = Product.objects.create(name="Remera", price=1500)
+    gorra = Product.objects.create(name="Gorra", price=700)
+    record_sales(date(2024, 3, 4), added=[(remera.id, 2, Decimal("1500"))])
+    record_sales(date(2024, 3, 5), added=[(remera.id, 1, Decimal("1500")), (gorra.id, 5, Decimal("700"))])
+
+    remera.delete()
+
+    per_product = (
+        ProductDailySales.objects.values("day").annotate(quantity=Sum("quantity"), revenue=Sum("revenue")).order_by("day")
+    )
+    assert [(row["day"], row["quantity"], row["revenue"]) for row in per_product] == [
+        (date(2024, 3, 5), 5, Decimal("3500")),
+    ]
+    assert list(DailySales.objects.order_by("day").values_list("day", "quantity", "revenue")) == [
+        (date(2024, 3, 4), 0, Decimal("0")),
+        (date(2024, 3, 5), 5, Decimal("3500")),
+    ]
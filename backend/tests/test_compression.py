@@ -0,0 +1,63 @@
+import gzip
+import json
+
+import pytest
+
+from config.compression import negotiate_encoding
+from products.models import Product
+
+
+@pytest.fixture
+def catalog(db):
+    return Product.objects.bulk_create(
+        [
+            Product(name=f"Producto {index}", price=100, image_url=f"https://cdn.example.com/{index}.jpg")
+            for index in range(50)
+        ]
+    )
+
+
+def test_negotiate_encoding_honours_quality_values():
+    assert negotiate_encoding("gzip, deflate, br") == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+    assert negotiate_encoding("br;q=0, *") == "gzip"
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip, br", available=("gzip",)) == "gzip"
+
+
+def test_large_json_is_gzipped_and_revalidates(client, catalog):
+    response = client.get("/products?all=1", HTTP_ACCEPT_ENCODING="gzip")
+
+    assert response["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response["Vary"]
+    assert len(json.loads(gzip.decompress(response.content))) == 50
+
+    # The compressed body carries a weak ETag, which still matches on revalidation.
+    assert response["ETag"].startswith('W/"')
+    revalidated = client.get("/products?all=1", HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=response["ETag"])
+    assert revalidated.status_code == 304
+
+
+def test_small_responses_are_not_compressed(client, catalog):
+    response = client.get(f"/products/{catalog[0].id}", HTTP_ACCEPT_ENCODING="gzip")
+
+    assert not response.has_header("Content-Encoding")
+
+
+def test_streaming_export_is_gzipped(user_client, catalog):
+    payload = {"items": [{"product_id": product.id, "quantity": 1} for product in catalog[:3]]}
+    user_client.post("/cart", data=json.dumps(payload), content_type="application/json")
+
+    response = user_client.get("/carts/export?format=ndjson", HTTP_ACCEPT_ENCODING="gzip")
+
+    assert response["Content-Encoding"] == "gzip"
+    lines = gzip.decompress(b"".join(response.streaming_content)).decode("utf-8").splitlines()
+    assert len(json.loads(lines[0])["items"]) == 3
+
+
+def test_catalog_last_modified_and_if_modified_since(client, catalog):
+    first = client.get("/products")
+    last_modified = first["Last-Modified"]
+
+    assert client.get("/products", HTTP_IF_MODIFIED_SINCE=last_modified).status_code == 304
+    assert client.get("/products", HTTP_IF_MODIFIED_SINCE="Mon, 01 Jan 2001 00:00:00 GMT").status_code == 200
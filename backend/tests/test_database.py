@@ -0,0 +1,87 @@
+import pytest
+from django.core.management import call_command
+from django.db import OperationalError, connection, connections
+from django.test.utils import override_settings
+
+from config.database import apply_sqlite_pragmas, atomic_with_retry
+from config.routers import ReadReplicaMiddleware
+from products.models import Product
+
+
+@pytest.mark.django_db
+def test_sqlite_pragmas_applied_to_connection():
+    with override_settings(SQLITE_PRAGMAS={"cache_size": -4321}):
+        apply_sqlite_pragmas(sender=None, connection=connection)
+
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA cache_size")
+        assert cursor.fetchone()[0] == -4321
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(DATABASE_WRITE_RETRIES={"ATTEMPTS": 3, "BACKOFF": 0})
+def test_atomic_with_retry_retries_locked_writes():
+    calls = []
+
+    def write():
+        calls.append(1)
+        if len(calls) < 3:
+            raise OperationalError("database is locked")
+        return "done"
+
+    assert atomic_with_retry(write) == "done"
+    assert len(calls) == 3
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(DATABASE_WRITE_RETRIES={"ATTEMPTS": 3, "BACKOFF": 0})
+def test_atomic_with_retry_does_not_retry_other_errors():
+    calls = []
+
+    def write():
+        calls.append(1)
+        raise OperationalError("no such table: missing")
+
+    with pytest.raises(OperationalError):
+        atomic_with_retry(write)
+    assert len(calls) == 1
+
+
+@pytest.fixture
+def sqlite_replicas(tmp_path, settings):
+    """Register two migrated SQLite files as read aliases standing in for replicas."""
+    aliases = ["test_replica_a", "test_replica_b"]
+    for alias in aliases:
+        connections.settings[alias] = {**connection.settings_dict, "NAME": str(tmp_path / f"{alias}.sqlite3")}
+        call_command("migrate", database=alias, verbosity=0)
+    settings.DATABASE_READ_REPLICAS = aliases
+    yield aliases
+    for alias in aliases:
+        connections[alias].close()
+        del connections[alias]
+        del connections.settings[alias]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_reads_go_to_replicas(sqlite_replicas, client, settings):
+    settings.CATALOG_CACHE = {**settings.CATALOG_CACHE, "ENABLED": False}
+    for alias in sqlite_replicas:
+        Product.objects.using(alias).create(name=f"Solo en {alias}", price=10)
+
+    names = {client.get("/products/1").json()["name"] for _index in range(20)}
+
+    assert names == {"Solo en test_replica_a", "Solo en test_replica_b"}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_reads_after_write_stay_on_primary(sqlite_replicas):
+    for alias in sqlite_replicas:
+        Product.objects.using(alias).create(name="Replica", price=10)
+
+    def view(request):
+        before = Product.objects.filter(name="Replica").exists()
+        Product.objects.create(name="Primario", price=25)
+        after = Product.objects.filter(name="Primario").exists()
+        return before, after, Product.objects.filter(name="Replica").exists()
+
+    assert ReadReplicaMiddleware(view)(None) == (True, True, False)
@@ -0,0 +1,53 @@
+import pytest
+from django.test import override_settings
+
+from metrics.querylog import QueryBudgetExceeded, QueryInspector, fingerprint
+from metrics.registry import registry
+from products.models import Product
+
+
+@pytest.mark.django_db
+@override_settings(PERFORMANCE_METRICS={"ENABLED": True, "SAMPLE_RATE": 1.0, "SERVER_TIMING": True})
+def test_performance_middleware_records_server_timing_and_metrics(staff_client):
+    registry.reset()
+    Product.objects.create(name="Remera", price=1000)
+
+    response = staff_client.get("/products?all=1")
+
+    assert response.status_code == 200
+    assert 'db;dur=' in response["Server-Timing"]
+    assert "total;dur=" in response["Server-Timing"]
+
+    metrics = staff_client.get("/metrics").content.decode("utf-8")
+    assert 'http_requests_total{route="products",method="GET",status="200"} 1' in metrics
+    assert 'http_request_duration_seconds_count{route="products",method="GET"} 1' in metrics
+    assert 'http_request_db_queries_total{route="products",method="GET"}' in metrics
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_requires_staff(user_client):
+    assert user_client.get("/metrics").status_code == 403
+
+
+def test_fingerprint_normalizes_literals_and_in_lists():
+    first = fingerprint("SELECT * FROM t WHERE id IN (1, 2, 3) AND name = 'a'")
+    second = fingerprint("SELECT  *  FROM t WHERE id IN (%s, %s) AND name = %s")
+
+    assert first == second == "SELECT * FROM t WHERE id IN (...) AND name = ?"
+
+
+def test_query_inspector_reports_repeated_templates():
+    inspector = QueryInspector()
+    for product_id in range(6):
+        inspector(lambda *args: None, f"SELECT * FROM products_product WHERE id = {product_id}", None, False, {})
+
+    [(template, count, _location)] = inspector.repeated(5)
+    assert (template, count) == ("SELECT * FROM products_product WHERE id = ?", 6)
+
+
+@pytest.mark.django_db
+def test_query_inspection_enforces_route_budget(user_client, settings):
+    settings.QUERY_INSPECTION = {**settings.QUERY_INSPECTION, "BUDGETS": {"carts": 1}}
+
+    with pytest.raises(QueryBudgetExceeded, match="carts_list"):
+        user_client.get("/carts")
@@ -1,8 +1,20 @@
+import io
 import json
+import threading
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
+from django.contrib.admin.sites import site
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
-from products.models import Product
+from carts.models import Cart, CartItem
+from products.admin import ProductAdmin
+from products.cache import VERSION_KEY, DjangoCatalogCache, LRUCatalogCache, get_catalog_cache
+from products.models import ImageStatus, Product
+from products.search import FTS_TABLE, SEARCH_CANDIDATES, index_products
 
 
 @pytest.mark.django_db
@@ -10,9 +22,333 @@ def test_products_list(client):
     Product.objects.create(name="Remera", price=1000)
     Product.objects.create(name="Zapatillas", price=2000)
 
-    response = client.get("/products")
+    response = client.get("/products?all=1")
 
     assert response.status_code == 200
     payload = json.loads(response.content.decode("utf-8"))
     assert len(payload) == 2
     assert payload[0]["name"] in {"Remera", "Zapatillas"}
+
+
+@pytest.mark.django_db
+def test_products_list_cursor_pagination(client):
+    for index in range(5):
+        Product.objects.create(name=f"Producto {index}", price=1000 + index)
+    Product.objects.create(name="Producto 0", price=999)
+
+    seen = []
+    cursor = None
+    while True:
+        url = "/products?page_size=2" + (f"&cursor={cursor}" if cursor else "")
+        payload = json.loads(client.get(url).content.decode("utf-8"))
+        seen.extend((product["name"], product["id"]) for product in payload["results"])
+        cursor = payload["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(seen) == 6
+    assert seen == sorted(seen)
+
+
+@pytest.mark.django_db
+def test_products_list_filters_and_fields(client):
+    Product.objects.create(name="Remera", price=1000)
+    Product.objects.create(name="Remera larga", price=3000)
+    Product.objects.create(name="Zapatillas", price=2000)
+
+    response = client.get("/products?name_prefix=Rem&max_price=2000&fields=name,price")
+
+    payload = json.loads(response.content.decode("utf-8"))
+    assert payload["results"] == [{"name": "Remera", "price": 1000.0}]
+    assert payload["next_cursor"] is None
+    assert client.get("/products?cursor=invalido").status_code == 400
+    assert client.get("/products?fields=secret").status_code == 400
+    for value in ("NaN", "Infinity", "-inf", "abc"):
+        assert client.get(f"/products?min_price={value}").status_code == 400
+        assert client.get(f"/products?max_price={value}").status_code == 400
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("backend", ["auto", "stdlib"])
+def test_products_list_decimal_strings_match_across_encoders(client, settings, backend):
+    settings.JSON_RESPONSES = {**settings.JSON_RESPONSES, "BACKEND": backend}
+    Product.objects.create(name="Ñandú", price="1500.10")
+
+    response = client.get("/products?all=1&decimals=string")
+
+    assert response.content == '[{"id":%d,"name":"Ñandú","price":"1500.10","image_url":""}]'.encode("utf-8") % (
+        Product.objects.get().id
+    )
+    assert client.get("/products?decimals=binario").status_code == 400
+
+
+@pytest.mark.django_db
+def test_products_detail_etag_and_invalidation(client, django_capture_on_commit_callbacks):
+    product = Product.objects.create(name="Remera", price=1000)
+
+    first = client.get(f"/products/{product.id}")
+    etag = first["ETag"]
+    assert first.status_code == 200
+
+    cached = client.get(f"/products/{product.id}", HTTP_IF_NONE_MATCH=etag)
+    assert cached.status_code == 304
+
+    product.price = 1200
+    with django_capture_on_commit_callbacks() as callbacks:
+        product.save()
+    # The version only moves once the write commits.
+    assert client.get(f"/products/{product.id}", HTTP_IF_NONE_MATCH=etag).status_code == 304
+    callbacks[0]()
+
+    updated = client.get(f"/products/{product.id}", HTTP_IF_NONE_MATCH=etag)
+    assert updated.status_code == 200
+    assert updated["ETag"] != etag
+    assert json.loads(updated.content.decode("utf-8"))["price"] == 1200.0
+
+
+def test_lru_catalog_cache_evicts_by_size():
+    cache = LRUCatalogCache(max_bytes=10)
+    cache.set("a", b"12345", '"a"')
+    cache.set("b", b"12345", '"b"')
+    cache.get("a")
+    cache.set("c", b"12345", '"c"')
+
+    assert cache.get("b") is None
+    assert cache.get("a") == (b"12345", '"a"')
+    assert cache.stats()["bytes"] == 10
+
+
+@pytest.mark.django_db
+def test_products_bulk_create_reports_invalid_prices_per_row(staff_client):
+    prices = [5, "NaN", "Infinity", "1e20", "99999999.99", 0.001, "12.345"]
+    response = staff_client.post(
+        "/products/bulk/create",
+        data=json.dumps([{"name": f"Producto {index}", "price": price} for index, price in enumerate(prices)]),
+        content_type="application/json",
+    )
+
+    results = json.loads(response.content.decode("utf-8"))["results"]
+    assert [result["status"] for result in results] == [201, 400, 400, 400, 201, 400, 201]
+    assert sorted(Product.objects.values_list("price", flat=True)) == [
+        Decimal("5.00"),
+        Decimal("12.34"),
+        Decimal("99999999.99"),
+    ]
+
+
+def test_lru_catalog_caches_share_the_version():
+    first, second = LRUCatalogCache(), LRUCatalogCache()
+    key = f"{second.get_version()}:/products"
+    second.set(key, b"[]", '"v1"')
+
+    first.bump_version()
+
+    assert second.get_version() == first.get_version() > int(key.split(":")[0])
+    assert second.get(key) is None
+    assert second.get_modified() == first.get_modified()
+
+
+def test_catalog_version_never_restarts_below_a_lost_counter():
+    backend = DjangoCatalogCache()
+    backend.bump_version()
+    version = backend.get_version()
+    backend.set(f"{version}:/products", b"[]", '"v1"')
+
+    backend.cache.delete(VERSION_KEY)
+    restarted = backend.get_version()
+    assert restarted > version
+    assert backend.get(f"{restarted}:/products") is None
+
+    backend.cache.clear()
+    assert backend.bump_version() > restarted
+
+
+@pytest.mark.django_db
+def test_products_bulk_endpoints_report_row_errors(staff_client):
+    cache = get_catalog_cache()
+    version = cache.get_version()
+
+    response = staff_client.post(
+        "/products/bulk/create",
+        data=json.dumps([{"name": "Remera", "price": 1000}, {"name": "", "price": 10}, {"name": "Gorra", "price": 500}]),
+        content_type="application/json",
+    )
+    payload = json.loads(response.content.decode("utf-8"))
+    assert (payload["processed"], payload["errors"]) == (3, 1)
+    assert payload["results"][1] == {"row": 2, "status": 400, "detail": "Name is required"}
+    remera_id, gorra_id = payload["results"][0]["id"], payload["results"][2]["id"]
+    assert cache.get_version() == version + 1
+
+    lines = [json.dumps({"id": remera_id, "price": 1100}), "{roto", json.dumps({"id": 999999, "price": 1})]
+    response = staff_client.post(
+        "/products/bulk/update", data="\n".join(lines), content_type="application/x-ndjson"
+    )
+    statuses = [result["status"] for result in json.loads(response.content.decode("utf-8"))["results"]]
+    assert statuses == [200, 400, 404]
+    assert Product.objects.get(id=remera_id).price == 1100
+
+    response = staff_client.post(
+        "/products/bulk/delete", data=json.dumps([remera_id, {"id": gorra_id}, 999999]), content_type="application/json"
+    )
+    statuses = [result["status"] for result in json.loads(response.content.decode("utf-8"))["results"]]
+    assert statuses == [200, 200, 404]
+    assert not Product.objects.exists()
+    assert cache.get_version() == version + 3
+
+
+@pytest.mark.django_db
+def test_seed_products_generates_deterministic_history():
+    call_command("seed_products", products=30, carts=12, items_per_cart=3, seed=7, batch_size=5, stdout=io.StringIO())
+    names = list(Product.objects.order_by("id").values_list("name", flat=True))
+
+    assert Product.objects.count() == 35
+    assert Cart.objects.count() == 12
+    assert CartItem.objects.count() == 36
+    cart = Cart.objects.prefetch_related("items").first()
+    assert cart.total == sum(item.unit_price * item.quantity for item in cart.items.all())
+
+    Product.objects.exclude(name__in=names[:5]).delete()
+    call_command("seed_products", products=30, seed=7, stdout=io.StringIO())
+    assert list(Product.objects.order_by("id").values_list("name", flat=True))[5:] == names[5:]
+
+
+def _search(client, query):
+    payload = json.loads(client.get("/products/search", {"q": query, "fields": "name"}).content.decode("utf-8"))
+    return [row["name"] for row in payload["results"]]
+
+
+@pytest.mark.django_db
+def test_products_search_ranks_prefix_matches_and_stays_in_sync(client, staff_client):
+    Product.objects.create(name="Remera básica", price=1000)
+    larga = Product.objects.create(name="Remera larga", price=2000)
+    Product.objects.create(name="Remeras", price=1500)
+    gorra = Product.objects.create(name="Gorra", price=500)
+
+    assert _search(client, "remera") == ["Remera larga", "Remera básica", "Remeras"]
+    assert _search(client, "rem basi") == ["Remera básica"]
+    assert client.get("/products/search").status_code == 400
+
+    larga.name = "Pantalon"
+    larga.save()
+    gorra.delete()
+    staff_client.post(
+        "/products/bulk/create", data=json.dumps([{"name": "Gorra plana", "price": 600}]), content_type="application/json"
+    )
+
+    assert _search(client, "remera") == ["Remera básica", "Remeras"]
+    assert _search(client, "gorra") == ["Gorra plana"]
+
+
+@pytest.mark.django_db
+def test_products_search_ranks_the_best_matches_beyond_the_candidate_cap(client):
+    products = [Product(name=f"Remera modelo {index}", price=100) for index in range(SEARCH_CANDIDATES + 100)]
+    products += [Product(name="Remeras lisas", price=100), Product(name="Remera", price=100)]
+    index_products((product.id, product.name) for product in Product.objects.bulk_create(products))
+
+    assert _search(client, "remera")[:2] == ["Remera", "Remera modelo 0"]
+    assert _search(client, "rem")[:1] == ["Remera"]
+    assert _search(client, "remeras") == ["Remeras lisas"]
+
+
+@pytest.mark.django_db
+def test_rebuild_product_search_indexes_bulk_rows(client):
+    # bulk_create outside the bulk endpoints skips the signals, so these start unindexed.
+    Product.objects.bulk_create([Product(name=f"Zapatillas {index}", price=100) for index in range(3)])
+    assert _search(client, "zapa") == []
+
+    out = io.StringIO()
+    call_command("rebuild_product_search", stdout=out)
+
+    assert "Productos indexados: 3" in out.getvalue()
+    assert len(_search(client, "zapa")) == 3
+    results, _distinct = ProductAdmin(Product, site).get_search_results(None, Product.objects.all(), "zapatillas 2")
+    assert [product.name for product in results] == ["Zapatillas 2"]
+
+
+@pytest.mark.django_db
+def test_products_bulk_delete_unindexes_each_chunk_in_one_statement(client, staff_client):
+    products = Product.objects.bulk_create([Product(name=f"Gorra {index}", price=100) for index in range(20)])
+    index_products((product.id, product.name) for product in products)
+
+    with CaptureQueriesContext(connection) as queries:
+        ids = json.dumps([product.id for product in products])
+        staff_client.post("/products/bulk/delete", data=ids, content_type="application/json")
+
+    assert sum(FTS_TABLE in query["sql"] for query in queries.captured_queries) == 1
+    assert _search(client, "gorra") == []
+
+
+@pytest.mark.django_db
+def test_products_store_image_variants_served_with_sizes(client, staff_client):
+    url = "https://images.unsplash.com/photo-1?auto=format&fit=crop&w=800&q=80"
+    payload = {"name": "Remera", "price": 100, "image_url": url}
+    response = staff_client.post("/products/create", data=json.dumps(payload), content_type="application/json")
+    product = json.loads(response.content.decode("utf-8"))
+
+    assert product["image_variants"]["thumb"] == "https://images.unsplash.com/photo-1?auto=format&fit=crop&q=80&w=160"
+    assert set(product["image_variants"]) == {"thumb", "card", "detail"}
+    assert Product.objects.get().image_status == ImageStatus.PENDING
+    assert "image_variants" not in json.loads(client.get(f"/products/{product['id']}").content.decode("utf-8"))
+    detail = json.loads(client.get(f"/products/{product['id']}?sizes=1").content.decode("utf-8"))
+    assert detail["image_variants"] == product["image_variants"]
+    rows = json.loads(client.get("/products?all=1&fields=id&sizes=1").content.decode("utf-8"))
+    assert rows == [{"id": product["id"], "image_variants": product["image_variants"]}]
+
+    payload = {"name": "Gorra", "price": 100, "image_url": "ftp://example.com/gorra.png"}
+    invalid = staff_client.post("/products/create", data=json.dumps(payload), content_type="application/json")
+    assert invalid.status_code == 400
+
+
+class _ImageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    requests = []
+
+    def setup(self):
+        type(self).connections += 1
+        super().setup()
+
+    def do_HEAD(self):
+        self.requests.append(self.path)
+        known = {"/ok.png": (200, "image/png"), "/page": (200, "text/html")}
+        status, content_type = known.get(self.path.split("?")[0], (404, "text/plain"))
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def image_server():
+    _ImageHandler.connections = 0
+    _ImageHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ImageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.django_db
+def test_validate_product_images_checks_distinct_urls_over_reused_connections(image_server):
+    urls = [f"{image_server}/ok.png", f"{image_server}/missing.png", f"{image_server}/page"]
+    urls += [f"{image_server}/ok.png?v={index}" for index in range(20)]
+    for index, url in enumerate(urls * 2):
+        Product.objects.create(name=f"Producto {index}", price=100, image_url=url, image_status=ImageStatus.PENDING)
+    Product.objects.create(name="Sin imagen", price=100)
+
+    call_command("validate_product_images", workers=2, stdout=io.StringIO())
+
+    statuses = dict(Product.objects.values_list("image_url", "image_status"))
+    assert statuses[f"{image_server}/ok.png"] == ImageStatus.VALID
+    assert statuses[f"{image_server}/missing.png"] == ImageStatus.INVALID
+    assert statuses[f"{image_server}/page"] == ImageStatus.INVALID
+    assert statuses[""] == ImageStatus.MISSING
+    assert Product.objects.get(image_url=f"{image_server}/ok.png?v=3", name="Producto 6").image_variants["card"]
+    assert Product.objects.filter(image_url=f"{image_server}/missing.png").first().image_variants == {}
+    assert len(_ImageHandler.requests) == len(urls)
+    assert _ImageHandler.connections <= 2
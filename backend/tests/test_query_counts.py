@@ -0,0 +1,93 @@
+import json
+
+import pytest
+from django.db import connection
+
+from carts.models import Cart, CartItem
+from products.models import Product
+
+CART_SIZES = [1, 20, 200]
+# Parameters bound per CartItem row by bulk_create (cart, product, quantity, name, price) and by
+# bulk_update (pk twice plus quantity, name and price).
+ITEM_WRITE_PARAMS = 5
+
+
+def _extra_batches(size: int) -> int:
+    """Statements beyond the first that one bulk write of `size` items needs.
+
+    SQLite binds at most 999 parameters per statement, so Django splits writes of more than
+    199 items; the count grows with the backend's parameter limit, not per item.
+    """
+    batch_size = connection.ops.bulk_batch_size(["param"] * ITEM_WRITE_PARAMS, [None] * size)
+    return -(-size // batch_size) - 1
+
+
+def _items(products):
+    return [{"product_id": product.id, "quantity": 2} for product in products]
+
+
+def _make_cart(products):
+    cart = Cart.objects.create()
+    CartItem.objects.bulk_create(
+        [
+            CartItem(cart=cart, product=product, product_name=product.name, unit_price=product.price, quantity=1)
+            for product in products
+        ]
+    )
+    return cart
+
+
+@pytest.fixture
+def make_products(db):
+    def factory(size):
+        return Product.objects.bulk_create(
+            [Product(name=f"Producto {index}", price=100 + index) for index in range(size)]
+        )
+
+    return factory
+
+
+@pytest.mark.parametrize("size", CART_SIZES)
+def test_cart_create_query_count(user_client, make_products, django_assert_num_queries, size):
+    products = make_products(size)
+
+    # session, user, products, savepoint, cart insert, items insert, 3 sales upserts, release
+    with django_assert_num_queries(10 + _extra_batches(size)):
+        response = user_client.post(
+            "/cart", data=json.dumps({"items": _items(products)}), content_type="application/json"
+        )
+
+    assert response.status_code == 201
+    assert len(json.loads(response.content.decode("utf-8"))["items"]) == size
+
+
+@pytest.mark.parametrize("size", CART_SIZES)
+def test_cart_update_query_count(user_client, make_products, django_assert_num_queries, size):
+    products = make_products(size)
+    cart = _make_cart(products)
+
+    # session, user, cart, products, savepoint, current items, versioned cart update, changed items update,
+    # 3 sales upserts, release
+    with django_assert_num_queries(12 + _extra_batches(size)):
+        response = user_client.post(
+            "/cart/update",
+            data=json.dumps({"id": cart.id, "items": _items(products)}),
+            content_type="application/json",
+        )
+
+    assert response.status_code == 200
+    assert len(json.loads(response.content.decode("utf-8"))["items"]) == size
+
+
+@pytest.mark.parametrize("size", CART_SIZES)
+def test_carts_list_query_count(user_client, make_products, django_assert_num_queries, size):
+    products = make_products(size)
+    for _index in range(3):
+        _make_cart(products)
+
+    # session, user, count, carts, items
+    with django_assert_num_queries(5):
+        response = user_client.get("/carts")
+
+    assert response.status_code == 200
+    assert json.loads(response.content.decode("utf-8"))["total"] == 3
@@ -8,9 +8,9 @@ export type ProductPayload = {
   image_url?: string;
 };
 
-export const getProducts = () => apiFetch<Product[]>("/products");
+export const getProducts = () => apiFetch<Product[]>("/products?all=1&sizes=1");
 
-export const getProduct = (id: number) => apiFetch<Product>(`/products/${id}`);
+export const getProduct = (id: number) => apiFetch<Product>(`/products/${id}?sizes=1`);
 
 export const createProduct = (payload: ProductPayload) =>
   apiFetch<Product>("/products/create", {
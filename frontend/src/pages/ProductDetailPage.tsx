@@ -85,11 +85,13 @@ const ProductDetailPage = () => {
     );
   }
 
+  const imageSrc = product.image_variants ? product.image_variants.detail : product.image_url;
+
   return (
     <section className="product-detail">
       <div className="product-detail__media">
-        {product.image_url ? (
-          <img src={product.image_url} alt={product.name} />
+        {imageSrc ? (
+          <img src={imageSrc} alt={product.name} />
         ) : (
           <div className="product-detail__placeholder">{product.name.slice(0, 1).toUpperCase()}</div>
         )}
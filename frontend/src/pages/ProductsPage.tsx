@@ -177,7 +177,7 @@ const ProductsPage = () => {
         <div className="product-grid">
           {filteredProducts.map((product) => {
             const initial = product.name.trim().charAt(0).toUpperCase();
-            const imageSrc = product.image_url;
+            const imageSrc = product.image_variants ? product.image_variants.card : product.image_url;
             return (
               <article key={product.id} className="product-card">
                 <Link to={`/products/${product.id}`} className="product-card__media">
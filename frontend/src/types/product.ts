@@ -3,4 +3,6 @@
   name: string;
   price: number;
   image_url?: string;
+  // Sent with ?sizes=1; empty when the image URL failed validation.
+  image_variants?: Partial<Record<"thumb" | "card" | "detail", string>>;
 };